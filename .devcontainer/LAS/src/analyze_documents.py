@@ -1,195 +1,86 @@
 """
 Analysiert alle PDFs und DOCX im data/ Ordner und erstellt eine CSV mit Statistiken.
+
+Die Statistiken entstehen als Nebenprodukt jeder Ingestion: LicenseVectorStore
+schreibt sie in eine nicht versionierte Tabelle (data/ingest_stats/, siehe
+document_stats.py) und liest data/document_stats.csv nur. Dieses Skript pflegt
+die versionierte Tabelle: es ergänzt Dateien, die dort noch fehlen (--refresh:
+alle), und nutzt dafür dieselbe Extraktion inkl. Page-Cache statt eines eigenen
+PyPDF2-Durchlaufs. Manuelle Chunk-Empfehlungen (recommendation_source=manual)
+bleiben erhalten.
 """
 
-import os
-import PyPDF2
-import csv
+import argparse
 from pathlib import Path
 import logging
 
-# ===== NEU: DOCX-Support =====
-try:
-    import docx2txt
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    logging.warning("⚠️  docx2txt nicht installiert - DOCX werden übersprungen")
+from file_discovery import FileDiscovery, DOCUMENT_EXTENSIONS
+from document_extraction import extract_document, EXTRACTOR_VERSION
+from document_stats import DocumentStatsTable, compute_document_stats
+from page_cache import PageTextCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def analyze_pdf(pdf_path):
+def analyze_file(file_path, cache=None):
     """
-    Analysiert ein PDF und extrahiert Statistiken.
+    Analysiert ein PDF/DOCX und extrahiert Statistiken.
     
     Returns:
         dict mit Metriken oder None bei Fehler
     """
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            
-            # Text extrahieren
-            full_text = ""
-            for page in reader.pages:
-                try:
-                    full_text += page.extract_text() + "\n"
-                except Exception as e:
-                    logger.warning(f"Fehler bei Seite in {pdf_path}: {e}")
-                    continue
-            
-            # Statistiken berechnen
-            words = full_text.split()
-            word_count = len(words)
-            char_count = len(full_text)
-            
-            # Absätze (durch doppelte Zeilenumbrüche getrennt)
-            paragraphs = [p for p in full_text.split('\n\n') if p.strip()]
-            paragraph_count = len(paragraphs)
-            
-            # Sätze (grobe Schätzung via Punkte)
-            sentence_count = full_text.count('.') + full_text.count('!') + full_text.count('?')
-            
-            # Seiten
-            page_count = len(reader.pages)
-            
-            # Dateigröße
-            file_size_bytes = os.path.getsize(pdf_path)
-            file_size_kb = file_size_bytes / 1024
-            
-            # Durchschnittswerte
-            words_per_page = word_count / page_count if page_count > 0 else 0
-            chars_per_word = char_count / word_count if word_count > 0 else 0
-            words_per_paragraph = word_count / paragraph_count if paragraph_count > 0 else 0
-            
-            return {
-                'filename': os.path.basename(pdf_path),
-                'file_type': 'pdf',
-                'file_size_kb': round(file_size_kb, 1),
-                'pages': page_count,
-                'words': word_count,
-                'characters': char_count,
-                'paragraphs': paragraph_count,
-                'sentences': sentence_count,
-                'words_per_page': round(words_per_page, 1),
-                'chars_per_word': round(chars_per_word, 1),
-                'words_per_paragraph': round(words_per_paragraph, 1),
-            }
-    
+        extracted = extract_document(Path(file_path), cache=cache)
+        return compute_document_stats(Path(file_path), extracted)
     except Exception as e:
-        logger.error(f"❌ Fehler bei {pdf_path}: {e}")
+        logger.error(f"❌ Fehler bei {file_path}: {e}")
         return None
 
 
-# ===== NEU: DOCX-Analyse =====
-def analyze_docx(docx_path):
+def analyze_all_documents(data_dir, table=None, refresh=False, cache=None):
     """
-    Analysiert ein DOCX und extrahiert Statistiken.
-    
-    Returns:
-        dict mit Metriken oder None bei Fehler
-    """
-    try:
-        # Text extrahieren
-        full_text = docx2txt.process(str(docx_path))
-        
-        # Statistiken berechnen
-        words = full_text.split()
-        word_count = len(words)
-        char_count = len(full_text)
-        
-        # Absätze
-        paragraphs = [p for p in full_text.split('\n\n') if p.strip()]
-        paragraph_count = len(paragraphs)
-        
-        # Sätze
-        sentence_count = full_text.count('.') + full_text.count('!') + full_text.count('?')
-        
-        # Dateigröße
-        file_size_bytes = os.path.getsize(docx_path)
-        file_size_kb = file_size_bytes / 1024
-        
-        # DOCX hat keine echten "Seiten" - schätze basierend auf Wörtern
-        # ~250 Wörter pro Seite (grobe Schätzung)
-        estimated_pages = max(1, word_count // 250)
-        
-        # Durchschnittswerte
-        words_per_page = word_count / estimated_pages if estimated_pages > 0 else 0
-        chars_per_word = char_count / word_count if word_count > 0 else 0
-        words_per_paragraph = word_count / paragraph_count if paragraph_count > 0 else 0
-        
-        return {
-            'filename': os.path.basename(docx_path),
-            'file_type': 'docx',
-            'file_size_kb': round(file_size_kb, 1),
-            'pages': estimated_pages,  # Geschätzt!
-            'words': word_count,
-            'characters': char_count,
-            'paragraphs': paragraph_count,
-            'sentences': sentence_count,
-            'words_per_page': round(words_per_page, 1),
-            'chars_per_word': round(chars_per_word, 1),
-            'words_per_paragraph': round(words_per_paragraph, 1),
-        }
-    
-    except Exception as e:
-        logger.error(f"❌ Fehler bei {docx_path}: {e}")
-        return None
-
+    Statistiken aller PDFs und DOCX unterhalb eines Verzeichnisses.
 
-def analyze_all_documents(data_dir):
-    """Analysiert alle PDFs und DOCX in einem Verzeichnis."""
-    
-    # Sammle alle Dateien
-    pdf_files = list(Path(data_dir).glob('*.pdf'))
-    pdf_files_upper = list(Path(data_dir).glob('*.PDF'))  # Auch Großbuchstaben
-    docx_files = list(Path(data_dir).glob('*.docx'))
-    docx_files_upper = list(Path(data_dir).glob('*.DOCX'))
+    Args:
+        data_dir: Wurzelverzeichnis (rekursiv)
+        table: Vorhandene DocumentStatsTable; bekannte Dateien werden übernommen
+        refresh: True = alle Dateien neu analysieren
+        cache: Optionaler PageTextCache
+    """
     
-    all_pdfs = pdf_files + pdf_files_upper
-    all_docx = docx_files + docx_files_upper
+    # Sammle alle Dateien (ein Scan, Endungen case-insensitiv)
+    discovery = FileDiscovery(Path(data_dir), DOCUMENT_EXTENSIONS, recursive=True)
+    all_pdfs = discovery.paths([".pdf"])
+    all_docx = discovery.paths([".docx"])
     
     logger.info(f"📊 Gefunden: {len(all_pdfs)} PDFs + {len(all_docx)} DOCX = {len(all_pdfs) + len(all_docx)} Dokumente")
     
     results = []
-    
-    # PDFs analysieren
-    for pdf_path in sorted(all_pdfs):
-        logger.info(f"📄 {pdf_path.name}...")
-        stats = analyze_pdf(pdf_path)
+    known = {} if table is None or refresh else {r["filename"]: r for r in table.results()}
+    
+    for file_path in all_pdfs + all_docx:
+        if file_path.name in known:
+            results.append(known[file_path.name])
+            continue
+        logger.info(f"📄 {file_path.name}...")
+        stats = analyze_file(file_path, cache=cache)
         if stats:
             results.append(stats)
     
-    # DOCX analysieren (falls verfügbar)
-    if DOCX_AVAILABLE and all_docx:
-        for docx_path in sorted(all_docx):
-            logger.info(f"📄 {docx_path.name} (DOCX)...")
-            stats = analyze_docx(docx_path)
-            if stats:
-                results.append(stats)
-    elif all_docx and not DOCX_AVAILABLE:
-        logger.warning(f"⚠️  {len(all_docx)} DOCX-Dateien gefunden, aber docx2txt fehlt!")
-        logger.warning("   Installiere mit: pip install docx2txt")
-    
     return results
 
 
 def save_to_csv(results, output_path):
-    """Speichert Ergebnisse als CSV."""
+    """Speichert Ergebnisse in der Statistik-Tabelle (vorhandene Zeilen bleiben erhalten)."""
     
     if not results:
         logger.error("Keine Ergebnisse zum Speichern!")
         return
     
-    # Spalten aus erstem Ergebnis
-    fieldnames = results[0].keys()
-    
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(results)
+    table = DocumentStatsTable(Path(output_path))
+    table.update(results)
+    table.save()
     
     logger.info(f"✅ Gespeichert: {output_path}")
 
@@ -236,9 +127,16 @@ if __name__ == "__main__":
     # Pfade
     DATA_DIR = Path(__file__).parent.parent / "data"
     OUTPUT_CSV = DATA_DIR / "document_stats.csv"
+    CACHE_DIR = DATA_DIR / "page_cache"
+    
+    parser = argparse.ArgumentParser(description="Dokument-Statistiken (data/document_stats.csv)")
+    parser.add_argument("--refresh", action="store_true", help="Alle Dateien neu analysieren")
+    args = parser.parse_args()
     
-    # Analysieren
-    results = analyze_all_documents(DATA_DIR)
+    # Analysieren (nur Dateien, die die Ingestion noch nicht erfasst hat)
+    table = DocumentStatsTable(OUTPUT_CSV)
+    cache = PageTextCache(str(CACHE_DIR), EXTRACTOR_VERSION)
+    results = analyze_all_documents(DATA_DIR, table=table, refresh=args.refresh, cache=cache)
     
     # Zusammenfassung ausgeben
     print_summary(results)
@@ -247,4 +145,4 @@ if __name__ == "__main__":
     save_to_csv(results, OUTPUT_CSV)
     
     print(f"\n✅ Fertig! CSV gespeichert: {OUTPUT_CSV}")
-    print(f"   Öffnen mit: cat {OUTPUT_CSV}")
\ No newline at end of file
+    print(f"   Öffnen mit: cat {OUTPUT_CSV}")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FastRecursiveSplitter (chunking.py) vs. LangChain RecursiveCharacterTextSplitter
+
+Prüft auf dem data/ibm Korpus, dass beide Splitter für alle Chunk-Stufen
+(Fixed 400/100 + adaptive Stufen aus resolve_chunk_params) identische
+Chunks inkl. Metadaten liefern, und misst die Laufzeit.
+
+Verwendung:
+    python benchmark_chunking.py                 # data/ibm, 3 Wiederholungen
+    python benchmark_chunking.py --repeat 5 --data-dir ../data/microsoft
+
+Exit-Code 1, falls sich die Ausgaben unterscheiden.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from chunking import FastRecursiveSplitter, CHUNK_SEPARATORS
+from document_extraction import extract_document, EXTRACTOR_VERSION
+from page_cache import PageTextCache
+
+logging.basicConfig(level=logging.WARNING)
+
+# Fixed-Baseline + adaptive Stufen (siehe resolve_chunk_params)
+CHUNK_CONFIGS = [(400, 100), (500, 125), (450, 110), (350, 90), (300, 75), (250, 60)]
+
+
+def _load_pages(data_dir: Path, cache_dir: Path) -> list:
+    """Extrahiert alle Seiten (über den Page-Cache, damit nur das Splitting gemessen wird)."""
+    cache = PageTextCache(str(cache_dir), EXTRACTOR_VERSION)
+    files = sorted(
+        p for p in data_dir.iterdir()
+        if p.is_file() and p.suffix.lower() in (".pdf", ".docx")
+    )
+    docs = []
+    for path in files:
+        try:
+            docs.append(extract_document(path, cache=cache))
+        except Exception as e:
+            print(f"⚠️  Übersprungen: {path.name}: {e}")
+    return docs
+
+
+def _time_split(splitter, docs: list, repeat: int) -> tuple:
+    """Splittet alle Dokumente repeat-mal; liefert (beste Zeit, Chunks des letzten Laufs)."""
+    best = float("inf")
+    chunks = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        chunks = []
+        for extracted in docs:
+            chunks.extend(splitter.split_documents(extracted["pages"]))
+        best = min(best, time.perf_counter() - t0)
+    return best, chunks
+
+
+def main() -> int:
+    default_data_dir = Path(__file__).parent.parent / "data" / "ibm"
+    default_cache_dir = Path(__file__).parent.parent / "data" / "page_cache"
+
+    parser = argparse.ArgumentParser(description="Chunking-Benchmark: Fast vs. LangChain")
+    parser.add_argument("--data-dir", type=Path, default=default_data_dir)
+    parser.add_argument("--cache-dir", type=Path, default=default_cache_dir)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("✂️  CHUNKING BENCHMARK")
+    print("=" * 70)
+    docs = _load_pages(args.data_dir, args.cache_dir)
+    total_chars = sum(len(p.page_content) for d in docs for p in d["pages"])
+    print(f"Korpus: {args.data_dir} | {len(docs)} Dokumente | {total_chars:,} Zeichen")
+    print("-" * 70)
+    print(f"{'Config':<10} | {'Chunks':>7} | {'LangChain':>10} | {'Fast':>10} | {'Speedup':>7} | Identisch")
+    print("-" * 70)
+
+    all_identical = True
+    for chunk_size, overlap in CHUNK_CONFIGS:
+        reference = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=overlap,
+            length_function=len,
+            separators=list(CHUNK_SEPARATORS),
+        )
+        fast = FastRecursiveSplitter(chunk_size, overlap, CHUNK_SEPARATORS)
+
+        t_ref, ref_chunks = _time_split(reference, docs, args.repeat)
+        t_fast, fast_chunks = _time_split(fast, docs, args.repeat)
+
+        identical = len(ref_chunks) == len(fast_chunks) and all(
+            r.page_content == f.page_content and r.metadata == f.metadata
+            for r, f in zip(ref_chunks, fast_chunks)
+        )
+        all_identical &= identical
+        speedup = t_ref / t_fast if t_fast > 0 else 0.0
+        print(
+            f"{chunk_size}/{overlap:<6} | {len(ref_chunks):>7} | {t_ref:>9.3f}s | {t_fast:>9.3f}s | "
+            f"{speedup:>6.1f}x | {'✅' if identical else '❌'}"
+        )
+
+    print("=" * 70)
+    print("✅ Ausgaben identisch" if all_identical else "❌ Ausgaben unterscheiden sich!")
+    return 0 if all_identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
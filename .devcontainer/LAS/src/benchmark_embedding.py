@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Embedding-Durchsatz auf echten Chunks (data/ibm)
+
+Vergleicht das bisherige Batching (batch_size=32, Korpus-Reihenfolge) mit dem
+Token-Budget-Batching aus embedding_batching.py und prüft, dass die Vektoren
+übereinstimmen (Padding ändert das Ergebnis nur numerisch minimal).
+Mit --processes N zusätzlich das Multi-Prozess-Encoding (embedding_pool.py).
+
+Die Chunks stammen aus dem Page-Cache und werden mit den Fixed- und adaptiven
+Chunk-Stufen erzeugt, damit die Längenverteilung der realen Collections
+abgebildet ist.
+
+Verwendung:
+    python benchmark_embedding.py                    # 1024 Chunks, torch
+    python benchmark_embedding.py --limit 4096 --token-budget 24576
+    python benchmark_embedding.py --backend torch-int8
+    python benchmark_embedding.py --processes auto
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from chunking import get_splitter, CHUNK_SEPARATORS
+from document_extraction import extract_document, EXTRACTOR_VERSION
+from embedding_backend import EMBEDDING_BACKENDS, load_embedding_model
+from embedding_batching import encode_bucketed, DEFAULT_TOKEN_BUDGET
+from embedding_pool import EncodePool, resolve_encode_processes
+from model_precision import MODEL_DTYPES
+from page_cache import PageTextCache
+
+logging.basicConfig(level=logging.WARNING)
+
+# Fixed-Baseline + adaptive Stufen (siehe document_stats.recommend_chunk_params)
+CHUNK_CONFIGS = [(400, 100), (500, 125), (450, 110), (350, 90), (300, 75), (250, 60)]
+
+
+def load_chunk_texts(data_dir: Path, cache_dir: Path, limit: int, seed: int = 42) -> list:
+    """Chunk-Texte aller Stufen; zufällige Stichprobe in gemischter Reihenfolge."""
+    cache = PageTextCache(str(cache_dir), EXTRACTOR_VERSION)
+    files = sorted(
+        p for p in data_dir.iterdir()
+        if p.is_file() and p.suffix.lower() in (".pdf", ".docx")
+    )
+    texts = []
+    for path in files:
+        try:
+            extracted = extract_document(path, cache=cache)
+        except Exception as e:
+            print(f"⚠️  Übersprungen: {path.name}: {e}")
+            continue
+        for chunk_size, overlap in CHUNK_CONFIGS:
+            splitter = get_splitter(chunk_size, overlap, CHUNK_SEPARATORS)
+            texts.extend(chunk.page_content for chunk in splitter.split_documents(extracted["pages"]))
+
+    random.Random(seed).shuffle(texts)
+    return texts[:limit]
+
+
+def _timed(fn, repeat: int) -> tuple:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> int:
+    default_data_dir = Path(__file__).parent.parent / "data" / "ibm"
+    default_cache_dir = Path(__file__).parent.parent / "data" / "page_cache"
+
+    parser = argparse.ArgumentParser(description="Embedding-Benchmark: Batching-Strategien")
+    parser.add_argument("--data-dir", type=Path, default=default_data_dir)
+    parser.add_argument("--cache-dir", type=Path, default=default_cache_dir)
+    parser.add_argument("--model", default="BAAI/bge-large-en-v1.5")
+    parser.add_argument("--backend", default="torch", choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--dtype", default="float32", choices=MODEL_DTYPES)
+    parser.add_argument("--limit", type=int, default=1024)
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--processes", default="1", help="Worker-Prozesse (N|auto), 1 = nicht messen")
+    args = parser.parse_args()
+
+    texts = load_chunk_texts(args.data_dir, args.cache_dir, args.limit)
+    model = load_embedding_model(args.model, args.backend, dtype=args.dtype)
+    model.encode(texts[:8], batch_size=8)  # Warm-up
+
+    print("=" * 70)
+    print("🧮 EMBEDDING BENCHMARK")
+    print("=" * 70)
+    print(f"Modell: {args.model} ({args.backend}, {model.las_model_dtype}) | {len(texts)} Chunks | Ø {np.mean([len(t) for t in texts]):.0f} Zeichen")
+    print("-" * 70)
+
+    t_fixed, ref = _timed(
+        lambda: model.encode(texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False),
+        args.repeat,
+    )
+    t_bucketed, out = _timed(
+        lambda: encode_bucketed(model, texts, token_budget=args.token_budget),
+        args.repeat,
+    )
+
+    max_diff = float(np.max(np.abs(ref - out))) if len(texts) else 0.0
+
+    processes = resolve_encode_processes(args.processes)
+    t_pool = None
+    if processes > 1:
+        pool = EncodePool(model, processes)
+        pool.encode(texts[:8])  # Worker starten + Warm-up
+        t_pool, pooled = _timed(lambda: pool.encode(texts, token_budget=args.token_budget), args.repeat)
+        pool.close()
+        if len(texts):
+            max_diff = max(max_diff, float(np.max(np.abs(ref - pooled))))
+
+    print(f"{'Modus':<28} | {'Zeit':>8} | {'Chunks/s':>9}")
+    print("-" * 70)
+    print(f"{'fixed (batch_size=32)':<28} | {t_fixed:>7.2f}s | {len(texts) / t_fixed:>9.1f}")
+    print(f"{f'bucketed (Budget {args.token_budget})':<28} | {t_bucketed:>7.2f}s | {len(texts) / t_bucketed:>9.1f}")
+    if t_pool is not None:
+        label = f"{processes} Prozesse × {pool.threads_per_process} Threads (bucketed)"
+        print(f"{label:<28} | {t_pool:>7.2f}s | {len(texts) / t_pool:>9.1f}")
+    print("-" * 70)
+    print(f"Speedup: {t_fixed / t_bucketed:.2f}x | max. Abweichung der Vektoren: {max_diff:.2e}")
+    if t_pool is not None:
+        print(f"Speedup Multi-Prozess: {t_fixed / t_pool:.2f}x")
+    print("=" * 70)
+
+    ok = max_diff < 1e-3
+    print("✅ Vektoren übereinstimmend" if ok else "❌ Vektoren weichen ab!")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
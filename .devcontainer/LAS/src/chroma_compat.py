@@ -0,0 +1,22 @@
+"""
+Kompatibilität mit verschiedenen chromadb-Versionen (requirements: >=0.4.24,<0.6).
+"""
+
+import chromadb
+import numpy as np
+
+
+# chromadb ≥ 0.5 nimmt NumPy-Arrays in add()/query() direkt an (ältere nur Listen)
+_CHROMA_ACCEPTS_NUMPY = hasattr(chromadb.api.types, "normalize_embeddings")
+
+
+def to_chroma_embeddings(matrix: np.ndarray):
+    """
+    Embedding-Matrix [n, dim] für ChromaDB.
+
+    Neuere chromadb-Versionen erhalten das Array unverändert (Zeilen-Views,
+    keine Python-Floats); nur ältere Versionen bekommen Listen.
+    """
+    if _CHROMA_ACCEPTS_NUMPY:
+        return matrix
+    return np.asarray(matrix, dtype=np.float32).tolist()
@@ -0,0 +1,191 @@
+"""
+Chunking-Engine für Lizenztexte.
+
+- get_splitter(): Splitter werden pro (chunk_size, overlap, separators)
+  einmal erzeugt und wiederverwendet statt pro Dokument neu gebaut.
+- FastRecursiveSplitter: liefert exakt dieselben Chunks wie LangChains
+  RecursiveCharacterTextSplitter (keep_separator=True, length_function=len,
+  strip_whitespace=True), arbeitet aber auf Offsets statt auf Teilstrings.
+  Die Separator-Positionen werden pro Text einmal berechnet; Rekursion und
+  Merge verschieben nur (start, end)-Paare. Ein String entsteht erst für den
+  fertigen Chunk.
+
+Gleichheit mit LangChain prüft benchmark_chunking.py auf dem data/ibm Korpus.
+"""
+
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+import copy
+import re
+
+from langchain.schema import Document
+
+
+# Separatoren für das Chunking der Lizenztexte (LicenseVectorStore)
+CHUNK_SEPARATORS = ("\n\n", "\n", ".", "!", "?", ",", " ", "")
+
+# Metadaten-Werte, die beim Kopieren nicht tief kopiert werden müssen
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class _SeparatorIndex:
+    """
+    Match-Positionen aller Separatoren in einem Text (lazy, einmal pro Separator).
+
+    Einzelzeichen-Separatoren werden über die globalen Positionen (bisect)
+    beantwortet. Mehrzeichen-Separatoren können sich an Bereichsgrenzen anders
+    verhalten als im Gesamttext; für Teilbereiche wird dort mit pos/endpos
+    gesucht (ohne Slicing), was re.split auf dem Teilstring entspricht.
+    """
+
+    def __init__(self, text: str, patterns: Sequence[Optional["re.Pattern"]]):
+        self._text = text
+        self._patterns = patterns
+        self._positions: dict = {}
+
+    def _global(self, i: int) -> List[int]:
+        positions = self._positions.get(i)
+        if positions is None:
+            positions = [m.start() for m in self._patterns[i].finditer(self._text)]
+            self._positions[i] = positions
+        return positions
+
+    def _use_global(self, i: int, start: int, end: int, single_char: bool) -> bool:
+        return single_char or (start == 0 and end == len(self._text))
+
+    def contains(self, i: int, start: int, end: int, single_char: bool) -> bool:
+        if self._use_global(i, start, end, single_char):
+            positions = self._global(i)
+            idx = bisect_left(positions, start)
+            return idx < len(positions) and positions[idx] < end
+        return self._patterns[i].search(self._text, start, end) is not None
+
+    def positions(self, i: int, start: int, end: int, single_char: bool) -> List[int]:
+        if self._use_global(i, start, end, single_char):
+            positions = self._global(i)
+            return positions[bisect_left(positions, start):bisect_left(positions, end)]
+        return [m.start() for m in self._patterns[i].finditer(self._text, start, end)]
+
+
+class FastRecursiveSplitter:
+    """Offset-basierter Ersatz für RecursiveCharacterTextSplitter (identische Ausgabe)."""
+
+    def __init__(self, chunk_size: int, chunk_overlap: int, separators: Sequence[str]):
+        """
+        Args:
+            chunk_size: Maximale Chunk-Größe in Zeichen
+            chunk_overlap: Überlappung zwischen Chunks in Zeichen
+            separators: Separatoren in absteigender Priorität (wörtlich, kein Regex)
+        """
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                f"({chunk_size}), should be smaller."
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+        self._patterns = [re.compile(re.escape(s)) if s else None for s in self.separators]
+        self._single_char = [len(s) == 1 for s in self.separators]
+
+    def split_text(self, text: str) -> List[str]:
+        """Splittet einen Text in Chunks."""
+        chunks: List[str] = []
+        index = _SeparatorIndex(text, self._patterns)
+        self._split_range(text, 0, len(text), 0, index, chunks)
+        return chunks
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        """Splittet Documents; jeder Chunk erhält eine Kopie der Metadaten."""
+        out = []
+        for doc in documents:
+            metadata = doc.metadata
+            # Flache Metadaten (str/int/float/bool/None) → flache Kopie genügt
+            flat = all(isinstance(v, _SCALAR_TYPES) for v in metadata.values())
+            for chunk in self.split_text(doc.page_content):
+                chunk_metadata = dict(metadata) if flat else copy.deepcopy(metadata)
+                out.append(Document(page_content=chunk, metadata=chunk_metadata))
+        return out
+
+    def _split_range(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        first_sep: int,
+        index: _SeparatorIndex,
+        out: List[str],
+    ) -> None:
+        # Separator wählen: erster aus separators[first_sep:], der im Bereich vorkommt
+        separators = self.separators
+        chosen = len(separators) - 1
+        has_next = False
+        for i in range(first_sep, len(separators)):
+            if separators[i] == "":
+                chosen = i
+                break
+            if index.contains(i, start, end, self._single_char[i]):
+                chosen = i
+                has_next = i + 1 < len(separators)
+                break
+
+        # Bereich in Stücke teilen; jedes Stück beginnt mit seinem Separator (keep_separator)
+        if separators[chosen] == "":
+            pieces = [(p, p + 1) for p in range(start, end)]
+        else:
+            bounds = [start]
+            bounds.extend(index.positions(chosen, start, end, self._single_char[chosen]))
+            bounds.append(end)
+            pieces = [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+        good: List[Tuple[int, int]] = []
+        for a, b in pieces:
+            if b - a < self.chunk_size:
+                good.append((a, b))
+                continue
+            if good:
+                self._merge(text, good, out)
+                good = []
+            if not has_next:
+                out.append(text[a:b])
+            else:
+                self._split_range(text, a, b, chosen + 1, index, out)
+        if good:
+            self._merge(text, good, out)
+
+    def _merge(self, text: str, splits: List[Tuple[int, int]], out: List[str]) -> None:
+        # Aufeinanderfolgende Stücke sind lückenlos → Chunk = text[erstes.start:letztes.end]
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        current: deque = deque()
+        total = 0
+        for a, b in splits:
+            length = b - a
+            if total + length > chunk_size and current:
+                chunk = text[current[0][0]:current[-1][1]].strip()
+                if chunk:
+                    out.append(chunk)
+                while total > chunk_overlap or (total + length > chunk_size and total > 0):
+                    first_a, first_b = current.popleft()
+                    total -= first_b - first_a
+            current.append((a, b))
+            total += length
+        if current:
+            chunk = text[current[0][0]:current[-1][1]].strip()
+            if chunk:
+                out.append(chunk)
+
+
+@lru_cache(maxsize=64)
+def get_splitter(chunk_size: int, chunk_overlap: int, separators: Tuple[str, ...]) -> FastRecursiveSplitter:
+    """
+    Liefert einen (gecachten) Splitter für die Parameter-Kombination.
+
+    Args:
+        chunk_size: Maximale Chunk-Größe in Zeichen
+        chunk_overlap: Überlappung in Zeichen
+        separators: Separatoren als Tupel (hashbar für den Cache)
+    """
+    return FastRecursiveSplitter(chunk_size, chunk_overlap, separators)
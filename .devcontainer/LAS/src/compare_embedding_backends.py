@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Parity-Check: Embedding-Backends (embedding_backend.py) und Gewichts-
+Datentypen (model_precision.py) auf den Experten-Fragen.
+
+Vergleicht einen Kandidaten (Default: torch-int8, float32) mit der float32-
+Referenz (torch):
+
+1. Encoding-Durchsatz und Kosinus-Ähnlichkeit auf einer Stichprobe von
+   Chunks aus der Collection, Speicherbedarf der Gewichte
+2. Retrieval auf ibm_expert_questions.json: Top-k-Überlappung, Top-1-
+   Übereinstimmung und Trefferquote des erwarteten Dokuments
+
+Standardmäßig kodiert nur die Query mit dem Kandidaten (dieselbe float32-
+Collection). Mit --candidate-collection wird eine komplett mit dem Kandidaten
+gebaute Collection verglichen (Build z.B. mit LAS_EMBEDDING_BACKEND=torch-int8
+und eigenem Collection-Namen).
+
+Verwendung:
+    python compare_embedding_backends.py
+    python compare_embedding_backends.py --backend torch-int8 --k 5 --sample-chunks 512
+    python compare_embedding_backends.py --candidate-collection ibm_licenses_fixed_int8
+    python compare_embedding_backends.py --backend torch --dtype bfloat16
+"""
+
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from vectorstore_IBM_Mapping import LicenseVectorStore
+from collection_names import IBM_FIXED
+from embedding_backend import EMBEDDING_BACKENDS
+from model_precision import MODEL_DTYPES
+import model_registry
+from test_expert_questions_fixed import load_questions_from_json, expand_query, DEFAULT_QUESTIONS_FILE
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def _doc_name(result: dict) -> str:
+    source = result["metadata"].get("source", "")
+    return Path(source).name if source else "UNKNOWN"
+
+
+def _result_key(result: dict) -> tuple:
+    # Chunk-IDs sind pro Collection zufällig → Vergleich über Dokument + Text
+    return (_doc_name(result), result.get("text", ""))
+
+
+def _hit_rank(results: list, valid_docs: list) -> int:
+    for i, result in enumerate(results, 1):
+        if _doc_name(result) in valid_docs:
+            return i
+    return 0
+
+
+def _encode_benchmark(reference: LicenseVectorStore, candidate: LicenseVectorStore, n: int) -> dict:
+    """Kodiert dieselbe Chunk-Stichprobe mit beiden Modellen (ohne Embedding-Cache)."""
+    texts = reference.collection.get(limit=n, include=["documents"])["documents"]
+    if not texts:
+        return {}
+
+    timings = {}
+    vectors = {}
+    for name, store in (("reference", reference), ("candidate", candidate)):
+        store.embedding_model.encode(texts[:8], batch_size=32)  # Warm-up
+        t0 = time.perf_counter()
+        vectors[name] = store.embedding_model.encode(
+            texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False
+        )
+        timings[name] = time.perf_counter() - t0
+
+    a, b = vectors["reference"], vectors["candidate"]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return {
+        "chunks": len(texts),
+        "reference_s": round(timings["reference"], 2),
+        "candidate_s": round(timings["candidate"], 2),
+        "speedup": round(timings["reference"] / timings["candidate"], 2) if timings["candidate"] > 0 else 0.0,
+        "cosine_mean": round(float(cosine.mean()), 4),
+        "cosine_min": round(float(cosine.min()), 4),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parity-Check der Embedding-Backends")
+    parser.add_argument("--backend", default="torch-int8", choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--reference-backend", default="torch", choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--dtype", default="float32", choices=MODEL_DTYPES, help="Gewichte des Kandidaten")
+    parser.add_argument("--reference-dtype", default="float32", choices=MODEL_DTYPES)
+    parser.add_argument("--collection", default=IBM_FIXED)
+    parser.add_argument("--candidate-collection", default=None)
+    parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--vendor", default="IBM", help="IBM|Microsoft|All")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--sample-chunks", type=int, default=256)
+    args = parser.parse_args()
+
+    # Embedding-Cache aus: beide Seiten sollen wirklich kodieren; lokal laden (kein Daemon)
+    os.environ["LAS_EMBED_CACHE"] = "0"
+    os.environ["LAS_EMBED_DAEMON"] = "0"
+
+    reference = LicenseVectorStore(
+        collection_name=args.collection,
+        embedding_model="BAAI/bge-large-en-v1.5",
+        use_adaptive_chunking=False,
+        embedding_backend=args.reference_backend,
+        model_dtype=args.reference_dtype,
+    )
+    candidate = LicenseVectorStore(
+        collection_name=args.candidate_collection or args.collection,
+        embedding_model="BAAI/bge-large-en-v1.5",
+        use_adaptive_chunking=False,
+        embedding_backend=args.backend,
+        model_dtype=args.dtype,
+    )
+    reference_label = f"{args.reference_backend}/{reference.embedding_model.las_model_dtype}"
+    candidate_label = f"{args.backend}/{candidate.embedding_model.las_model_dtype}"
+
+    print("=" * 70)
+    print(f"⚖️  EMBEDDING-BACKENDS: {reference_label} vs. {candidate_label}")
+    print(f"   Collection: {args.collection} → {args.candidate_collection or args.collection}")
+    print("=" * 70)
+
+    encode = _encode_benchmark(reference, candidate, args.sample_chunks)
+    if encode:
+        print(
+            f"Encoding ({encode['chunks']} Chunks): {encode['reference_s']:.2f}s → {encode['candidate_s']:.2f}s "
+            f"({encode['speedup']:.2f}x) | Kosinus Ø {encode['cosine_mean']:.4f}, min {encode['cosine_min']:.4f}"
+        )
+    sizes = {
+        row["variant"]: row["size_mb"]
+        for row in model_registry.memory_report() if row["kind"] == "embedding"
+    }
+    reference_mb = sizes.get(model_registry.model_variant(args.reference_backend, args.reference_dtype))
+    candidate_mb = sizes.get(model_registry.model_variant(args.backend, args.dtype))
+    if reference_mb is not None and candidate_mb is not None:
+        print(f"Gewichte: {reference_mb:.0f} MB → {candidate_mb:.0f} MB")
+    print("-" * 70)
+
+    questions = load_questions_from_json(args.questions)
+    if args.vendor != "All":
+        questions = {k: v for k, v in questions.items() if v["vendor"] == args.vendor}
+
+    overlap_sum = 0.0
+    top1_same = 0
+    hits = {"reference": 0, "candidate": 0}
+    query_s = {"reference": 0.0, "candidate": 0.0}
+    differing = []
+
+    for q_id, q_data in questions.items():
+        query = expand_query(q_data["question"])
+        valid_docs = [q_data["primary_doc"]] + q_data.get("alternative_docs", [])
+
+        results = {}
+        for name, store in (("reference", reference), ("candidate", candidate)):
+            t0 = time.perf_counter()
+            results[name] = store.search(query, k=args.k)
+            query_s[name] += time.perf_counter() - t0
+            if _hit_rank(results[name], valid_docs):
+                hits[name] += 1
+
+        ref_keys = [_result_key(r) for r in results["reference"]]
+        cand_keys = [_result_key(r) for r in results["candidate"]]
+        overlap = len(set(ref_keys) & set(cand_keys)) / max(1, len(ref_keys))
+        overlap_sum += overlap
+        if ref_keys[:1] == cand_keys[:1]:
+            top1_same += 1
+        if overlap < 1.0:
+            differing.append((q_id, overlap, [_doc_name(r) for r in results["reference"]],
+                              [_doc_name(r) for r in results["candidate"]]))
+
+    n = len(questions)
+    print(f"Fragen: {n} | Top-{args.k} Überlappung Ø {overlap_sum / max(1, n):.1%} | Top-1 gleich: {top1_same}/{n}")
+    print(
+        f"Erwartetes Dokument in Top-{args.k}: {reference_label} {hits['reference']}/{n} | "
+        f"{candidate_label} {hits['candidate']}/{n}"
+    )
+    print(
+        f"Query-Latenz Ø: {reference_label} {query_s['reference'] / max(1, n) * 1000:.0f} ms | "
+        f"{candidate_label} {query_s['candidate'] / max(1, n) * 1000:.0f} ms"
+    )
+
+    if differing:
+        print("-" * 70)
+        print("Abweichende Fragen:")
+        for q_id, overlap, ref_docs, cand_docs in differing:
+            print(f"  {q_id}: Überlappung {overlap:.0%}")
+            print(f"     {reference_label:18s}: {ref_docs}")
+            print(f"     {candidate_label:18s}: {cand_docs}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Recall-Vergleich: dichtes Retrieval (BGE-large) vs. zweistufig
+(Kandidaten mit kleinem Modell + BGE-large-Rescoring, two_stage_retrieval.py).
+
+Pro Kandidaten-Pool-Größe (--candidate-k) auf ibm_expert_questions.json:
+
+- Stufe-1-Recall: Anteil der dichten Top-n (LAS_INTERNAL_K) im Kandidaten-Pool
+- Top-k-Überlappung und Top-1-Übereinstimmung mit dem dichten Pfad
+- Trefferquote des erwarteten Dokuments in den Top-k
+- Ø Query-Latenz
+
+Fehlt der Kandidaten-Index, wird er vorher aus der Collection aufgebaut.
+
+Verwendung:
+    python compare_retrieval_modes.py
+    python compare_retrieval_modes.py --candidate-model BAAI/bge-small-en-v1.5 --candidate-k 50 100 200 400
+    python compare_retrieval_modes.py --log      # Ergebnis im ExperimentTracker ablegen
+"""
+
+import argparse
+import logging
+import os
+import time
+from pathlib import Path
+
+from vectorstore_IBM_Mapping import LicenseVectorStore
+from collection_names import IBM_FIXED
+from test_expert_questions_fixed import load_questions_from_json, expand_query, DEFAULT_QUESTIONS_FILE
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def _doc_name(result: dict) -> str:
+    source = result["metadata"].get("source", "")
+    return Path(source).name if source else "UNKNOWN"
+
+
+def _hit_rank(results: list, valid_docs: list) -> int:
+    for i, result in enumerate(results, 1):
+        if _doc_name(result) in valid_docs:
+            return i
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recall-Vergleich dense vs. two_stage Retrieval")
+    parser.add_argument("--collection", default=IBM_FIXED)
+    parser.add_argument("--candidate-model", default="BAAI/bge-small-en-v1.5")
+    parser.add_argument("--candidate-k", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--vendor", default="IBM", help="IBM|Microsoft|All")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--log", action="store_true", help="Ergebnis im ExperimentTracker speichern")
+    args = parser.parse_args()
+
+    vs = LicenseVectorStore(
+        collection_name=args.collection,
+        embedding_model="BAAI/bge-large-en-v1.5",
+        use_adaptive_chunking=False,
+        candidate_model=args.candidate_model,
+    )
+    t0 = time.perf_counter()
+    synced = vs.candidate_index.sync(vs.collection)
+    if synced["added"]:
+        print(f"🪜 Kandidaten-Index aufgebaut: {synced['added']} Chunks in {time.perf_counter() - t0:.1f}s")
+
+    questions = load_questions_from_json(args.questions)
+    if args.vendor != "All":
+        questions = {k: v for k, v in questions.items() if v["vendor"] == args.vendor}
+    n = len(questions)
+    internal_k = int(os.environ.get("LAS_INTERNAL_K", "50"))
+
+    print("=" * 70)
+    print(f"🪜 RETRIEVAL: dense vs. two_stage ({args.candidate_model})")
+    print(f"   Collection: {args.collection} | {vs.collection.count()} Chunks | {n} Fragen | k={args.k}")
+    print("=" * 70)
+
+    # Dichte Referenz: Ergebnisse, Roh-Kandidaten (Top internal_k) und Latenz
+    dense = {}
+    dense_raw = {}
+    dense_s = 0.0
+    dense_hits = 0
+    for q_id, q_data in questions.items():
+        query = expand_query(q_data["question"])
+        valid_docs = [q_data["primary_doc"]] + q_data.get("alternative_docs", [])
+        t0 = time.perf_counter()
+        dense[q_id] = vs.search(query, k=args.k, retrieval="dense")
+        dense_s += time.perf_counter() - t0
+        dense_raw[q_id] = {r["id"] for r in vs._retrieve_dense(query, internal_k, None)}
+        if _hit_rank(dense[q_id], valid_docs):
+            dense_hits += 1
+
+    print(f"{'Modus':<22} | {'Stufe-1-Recall':>14} | {'Überlappung':>11} | {'Top-1':>6} | {'Treffer':>8} | {'Latenz':>8}")
+    print("-" * 70)
+    print(f"{'dense':<22} | {'-':>14} | {'-':>11} | {'-':>6} | {dense_hits:>3}/{n:<4} | {dense_s / max(1, n) * 1000:>5.0f} ms")
+
+    rows = []
+    for candidate_k in args.candidate_k:
+        os.environ["LAS_CANDIDATE_K"] = str(candidate_k)
+        recall_sum = overlap_sum = 0.0
+        top1_same = hits = 0
+        query_s = 0.0
+        for q_id, q_data in questions.items():
+            query = expand_query(q_data["question"])
+            valid_docs = [q_data["primary_doc"]] + q_data.get("alternative_docs", [])
+
+            pool = set(vs.candidate_index.query_ids(query, candidate_k))
+            recall_sum += len(dense_raw[q_id] & pool) / max(1, len(dense_raw[q_id]))
+
+            t0 = time.perf_counter()
+            results = vs.search(query, k=args.k, retrieval="two_stage")
+            query_s += time.perf_counter() - t0
+
+            dense_ids = [r["id"] for r in dense[q_id]]
+            ids = [r["id"] for r in results]
+            overlap_sum += len(set(dense_ids) & set(ids)) / max(1, len(dense_ids))
+            top1_same += int(dense_ids[:1] == ids[:1])
+            hits += int(bool(_hit_rank(results, valid_docs)))
+
+        row = {
+            "candidate_k": candidate_k,
+            "stage1_recall": round(recall_sum / max(1, n), 4),
+            "overlap": round(overlap_sum / max(1, n), 4),
+            "top1_same": top1_same,
+            "hits": hits,
+            "latency_ms": round(query_s / max(1, n) * 1000, 1),
+        }
+        rows.append(row)
+        label = f"two_stage (K={candidate_k})"
+        print(
+            f"{label:<22} | {row['stage1_recall']:>14.1%} | {row['overlap']:>11.1%} | "
+            f"{top1_same:>2}/{n:<3} | {hits:>3}/{n:<4} | {row['latency_ms']:>5.0f} ms"
+        )
+    print("=" * 70)
+
+    if args.log:
+        from experiment_tracker import ExperimentTracker
+
+        ExperimentTracker().log_experiment(
+            experiment_name="two_stage_retrieval",
+            config={
+                "collection": args.collection,
+                "candidate_model": args.candidate_model,
+                "k": args.k,
+                "internal_k": internal_k,
+                "vendor": args.vendor,
+            },
+            results={
+                "questions": n,
+                "dense_hits": dense_hits,
+                "dense_latency_ms": round(dense_s / max(1, n) * 1000, 1),
+                "two_stage": rows,
+            },
+            notes="Recall-Vergleich dense vs. two_stage (compare_retrieval_modes.py)",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
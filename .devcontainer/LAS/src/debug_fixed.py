@@ -5,6 +5,7 @@ Testet ob Suche funktioniert und zeigt Metadata
 """
 
 import chromadb
+import model_registry
 from vectorstore_IBM_Mapping import LicenseVectorStore
 from collection_names import IBM_FIXED, IBM_ADAPTIVE
 
@@ -144,6 +145,18 @@ if sample_f['metadatas']:
         print(f"  - {key}: {meta[key]}")
 
 
+# ======================================================================
+# TEST 5: Geladene Modelle (alle Instanzen teilen ein Embedding-Modell)
+# ======================================================================
+print("\n" + "=" * 70)
+print("TEST 5: MODEL-REGISTRY")
+print("=" * 70)
+
+for row in model_registry.memory_report():
+    print(f"  - {row['kind']}: {row['name']} ({row['variant']}, {row['device']}) "
+          f"{row['size_mb']:.0f} MB, {row['shared_hits']}× geteilt")
+
+
 print("\n" + "=" * 70)
 print("✅ DEBUG ABGESCHLOSSEN")
 print("=" * 70)
\ No newline at end of file
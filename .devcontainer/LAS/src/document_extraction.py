@@ -0,0 +1,254 @@
+"""
+Text-Extraktion für Lizenzdokumente (PDF + DOCX) in EINEM Durchlauf.
+
+Jede Datei wird genau einmal geparst. Das Ergebnis enthält die Seiten-Texte
+als LangChain-Documents (PDF: identische Metadaten wie PyPDFLoader),
+die Wortanzahl für _get_chunk_params und die Seitenanzahl für Statistiken.
+
+DOCX werden gestreamt gelesen (iter_docx_paragraphs): word/document.xml wird
+inkrementell geparst, statt die komplette XML samt DOM im Speicher zu halten.
+Überschriften teilen das Dokument in Abschnitte, die wie Seiten an den
+Chunker gehen (Chunks überspannen keine Abschnittsgrenzen).
+
+Verwendung:
+    from document_extraction import extract_document
+
+    extracted = extract_document(Path("data/ibm/L-CHSG-4QYF8X_en.pdf"))
+    extracted["word_count"], extracted["page_count"], extracted["pages"]
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import hashlib
+import logging
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+
+from langchain.schema import Document
+
+from page_cache import PageTextCache
+
+logger = logging.getLogger(__name__)
+
+
+# Version der Extraktions-Logik. Bei jeder Änderung an den Seiten-Texten
+# erhöhen, damit der Page-Cache (page_cache.py) nicht veraltete Texte liefert.
+EXTRACTOR_VERSION = 2
+
+# Unterstützte Dateitypen (Suffix in Kleinbuchstaben)
+PDF_SUFFIXES = (".pdf",)
+DOCX_SUFFIXES = (".docx",)
+
+# WordprocessingML-Namespace
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Überschriften bis zu dieser Ebene beginnen einen neuen DOCX-Abschnitt
+DOCX_SECTION_LEVEL = 3
+
+_HEADING_STYLE = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+
+
+def compute_file_hash(file_path: Path, block_size: int = 1 << 20) -> str:
+    """SHA-256 des Dateiinhalts (blockweise gelesen, auch für große DOCX)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_pdf_pages(file_path: Path) -> List[Document]:
+    """Liest alle PDF-Seiten mit pypdf (gleiche Engine wie PyPDFLoader)."""
+    import pypdf
+
+    pages = []
+    with open(file_path, "rb") as f:
+        reader = pypdf.PdfReader(f)
+        for page_number, page in enumerate(reader.pages):
+            pages.append(
+                Document(
+                    page_content=page.extract_text(),
+                    metadata={"source": str(file_path), "page": page_number},
+                )
+            )
+    return pages
+
+
+def _docx_heading_levels(archive: zipfile.ZipFile) -> Dict[str, int]:
+    """styleId → Überschriften-Ebene (1-basiert) aus word/styles.xml."""
+    levels: Dict[str, int] = {}
+    try:
+        root = ET.fromstring(archive.read("word/styles.xml"))
+    except KeyError:
+        return levels
+
+    for style in root.iter(f"{_W}style"):
+        style_id = style.get(f"{_W}styleId")
+        if not style_id:
+            continue
+        outline = style.find(f"{_W}pPr/{_W}outlineLvl")
+        if outline is not None and outline.get(f"{_W}val", "").isdigit():
+            levels[style_id] = int(outline.get(f"{_W}val")) + 1
+            continue
+        name = style.find(f"{_W}name")
+        match = _HEADING_STYLE.match(name.get(f"{_W}val", "") if name is not None else "")
+        if match:
+            levels[style_id] = int(match.group(1))
+    return levels
+
+
+def iter_docx_paragraphs(file_path: Path) -> Iterator[Tuple[str, Optional[int]]]:
+    """
+    Streamt die Absätze von word/document.xml.
+
+    Verarbeitete Elemente werden sofort aus dem Baum entfernt; der Speicher
+    bleibt unabhängig von der Dokumentgröße klein.
+
+    Yields:
+        (Absatz-Text, Überschriften-Ebene oder None)
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        heading_levels = _docx_heading_levels(archive)
+        with archive.open("word/document.xml") as xml_stream:
+            stack: List[ET.Element] = []
+            buffers: List[List[str]] = []
+            levels: List[Optional[int]] = []
+
+            for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    stack.append(elem)
+                    if tag == f"{_W}p":
+                        buffers.append([])
+                        levels.append(None)
+                    continue
+
+                stack.pop()
+                if tag == f"{_W}t":
+                    if buffers and elem.text:
+                        buffers[-1].append(elem.text)
+                elif tag == f"{_W}tab":
+                    if buffers:
+                        buffers[-1].append("\t")
+                elif tag in (f"{_W}br", f"{_W}cr"):
+                    if buffers:
+                        buffers[-1].append("\n")
+                elif tag == f"{_W}pStyle":
+                    if levels:
+                        levels[-1] = heading_levels.get(elem.get(f"{_W}val"), levels[-1])
+                elif tag == f"{_W}outlineLvl":
+                    val = elem.get(f"{_W}val", "")
+                    # Ebene 9 = "Body Text" (keine Überschrift)
+                    if levels and val.isdigit() and int(val) < 9:
+                        levels[-1] = int(val) + 1
+                elif tag == f"{_W}p":
+                    text = "".join(buffers.pop())
+                    level = levels.pop()
+                    if buffers:
+                        # Verschachtelter Absatz (Textfeld): an den äußeren anhängen
+                        buffers[-1].append(text)
+                    else:
+                        yield text, level
+
+                # Fertige Elemente direkt unter <w:body> (Absätze, Tabellen) freigeben
+                if stack and stack[-1].tag == f"{_W}body":
+                    stack[-1].remove(elem)
+
+
+def _extract_docx_pages(file_path: Path) -> List[Document]:
+    """
+    Liest ein DOCX gestreamt und teilt es an Überschriften in Abschnitte.
+
+    Absätze werden wie bei docx2txt mit Leerzeilen verbunden. Jeder Abschnitt
+    beginnt mit seiner Überschrift (bis Ebene DOCX_SECTION_LEVEL); Kopf- und
+    Fußzeilen werden nicht übernommen.
+    """
+    sections: List[Document] = []
+    paragraphs: List[str] = []
+    heading = ""
+    has_body = False
+
+    def _flush() -> None:
+        text = "\n\n".join(paragraphs)
+        if text.strip():
+            sections.append(
+                Document(
+                    page_content=text,
+                    metadata={"source": str(file_path), "section": len(sections), "heading": heading},
+                )
+            )
+
+    for text, level in iter_docx_paragraphs(file_path):
+        if not text.strip():
+            continue
+        is_heading = level is not None and level <= DOCX_SECTION_LEVEL
+        # Aufeinanderfolgende Überschriften bleiben im selben Abschnitt
+        if is_heading and has_body:
+            _flush()
+            paragraphs = []
+            has_body = False
+        if is_heading:
+            heading = text.strip()
+        else:
+            has_body = True
+        paragraphs.append(text)
+    _flush()
+    return sections
+
+
+def extract_document(
+    file_path: Path,
+    cache: Optional[PageTextCache] = None,
+    file_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Extrahiert Text und Seiten-Metadaten eines Dokuments in einem Durchlauf.
+
+    Args:
+        file_path: Pfad zur PDF- oder DOCX-Datei
+        cache: Optionaler PageTextCache; bei Treffer wird nicht geparst
+        file_hash: SHA-256 der Datei (wird bei Bedarf berechnet)
+
+    Returns:
+        Dict mit file_name, file_type, pages (List[Document]),
+        word_count und page_count
+
+    Raises:
+        ValueError: bei nicht unterstütztem Dateityp
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+
+    if cache is not None:
+        if file_hash is None:
+            file_hash = compute_file_hash(file_path)
+        cached = cache.get(file_hash, file_path)
+        if cached is not None:
+            logger.debug(f"📦 Page-Cache Treffer: {file_path.name}")
+            return cached
+
+    if suffix in PDF_SUFFIXES:
+        file_type = "pdf"
+        pages = _extract_pdf_pages(file_path)
+    elif suffix in DOCX_SUFFIXES:
+        file_type = "docx"
+        pages = _extract_docx_pages(file_path)
+    else:
+        raise ValueError(f"Nicht unterstützter Dateityp: {file_path.suffix}")
+
+    # Wortanzahl wie bisher über den zusammengefügten Text aller Seiten
+    word_count = len("".join(page.page_content for page in pages).split())
+
+    extracted = {
+        "file_name": file_path.name,
+        "file_type": file_type,
+        "pages": pages,
+        "word_count": word_count,
+        "page_count": len(pages),
+    }
+
+    if cache is not None:
+        cache.put(file_hash, extracted)
+
+    return extracted
@@ -0,0 +1,243 @@
+"""
+Dokument-Statistiken als Nebenprodukt der Extraktion.
+
+Die Ingestion (process_document_file) berechnet pro Datei aus dem ohnehin
+extrahierten Text Seiten, Wörter, Absätze, Sätze und die empfohlenen
+Chunk-Parameter. Die Werte landen in einer nach Dateiname geschlüsselten
+Tabelle (gleiche Spalten wie bisher in analyze_documents.py plus
+recommended_chunk_size/recommended_overlap/recommendation_source).
+
+recommendation_source:
+    auto    Empfehlung aus der Wortanzahl (recommend_chunk_params), wird bei
+            jedem update() neu berechnet
+    manual  von Hand gesetzte Empfehlung, bleibt bei update() erhalten
+
+Die versionierte data/document_stats.csv ist nur Eingabe (base_path); die
+Ingestion schreibt in eine eigene, nicht versionierte Tabelle neben
+persist_directory. Der adaptive Modus von LicenseVectorStore übernimmt die
+manuellen Empfehlungen (_chunk_settings), alle anderen Dateien folgen den
+Stufen nach Wortanzahl; ein separater Korpus-Scan ist nicht nötig.
+
+Verwendung:
+    table = DocumentStatsTable(Path("data/ingest_stats/document_stats.csv"),
+                               base_path=Path("data/document_stats.csv"))
+    table.update([compute_document_stats(path, extracted)])
+    table.save()
+    table.chunk_params()  # {filename: (chunk_size, overlap)}, nur manual
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+import csv
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+# Spalten der Statistik-Tabelle (Schlüssel: filename)
+STATS_FIELDS = [
+    "filename",
+    "file_type",
+    "file_size_kb",
+    "pages",
+    "words",
+    "characters",
+    "paragraphs",
+    "sentences",
+    "words_per_page",
+    "chars_per_word",
+    "words_per_paragraph",
+    "recommended_chunk_size",
+    "recommended_overlap",
+    "recommendation_source",
+]
+
+RECOMMENDATION_SOURCES = ("auto", "manual")
+
+# DOCX haben keine echten Seiten → Schätzung über Wörter pro Seite
+DOCX_WORDS_PER_PAGE = 250
+
+
+def recommend_chunk_params(word_count: int) -> tuple:
+    """
+    Empfohlene Chunk-Parameter nach Dokumentgröße (adaptive Stufen).
+
+    Returns:
+        (chunk_size, overlap)
+    """
+    if word_count < 1000:
+        return 500, 125
+    elif word_count < 2000:
+        return 450, 110
+    elif word_count < 3500:
+        return 400, 100
+    elif word_count < 5000:
+        return 350, 90
+    elif word_count < 7000:
+        return 300, 75
+    else:
+        return 250, 60
+
+
+def compute_document_stats(file_path: Path, extracted: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Statistiken eines Dokuments aus dem Extraktions-Ergebnis (ohne erneutes Parsen).
+
+    Args:
+        file_path: Pfad zur Datei (für Dateigröße)
+        extracted: Ergebnis von extract_document
+
+    Returns:
+        Dict mit den Spalten aus STATS_FIELDS
+    """
+    separator = "\n\n" if extracted["file_type"] == "docx" else "\n"
+    full_text = separator.join(page.page_content for page in extracted["pages"])
+
+    word_count = extracted["word_count"]
+    char_count = len(full_text)
+
+    # Absätze (durch doppelte Zeilenumbrüche getrennt)
+    paragraph_count = sum(1 for p in full_text.split("\n\n") if p.strip())
+
+    # Sätze (grobe Schätzung via Satzzeichen)
+    sentence_count = full_text.count(".") + full_text.count("!") + full_text.count("?")
+
+    if extracted["file_type"] == "docx":
+        page_count = max(1, word_count // DOCX_WORDS_PER_PAGE)  # Geschätzt!
+    else:
+        page_count = extracted["page_count"]
+
+    chunk_size, overlap = recommend_chunk_params(word_count)
+
+    return {
+        "filename": Path(file_path).name,
+        "file_type": extracted["file_type"],
+        "file_size_kb": round(os.path.getsize(file_path) / 1024, 1),
+        "pages": page_count,
+        "words": word_count,
+        "characters": char_count,
+        "paragraphs": paragraph_count,
+        "sentences": sentence_count,
+        "words_per_page": round(word_count / page_count, 1) if page_count > 0 else 0,
+        "chars_per_word": round(char_count / word_count, 1) if word_count > 0 else 0,
+        "words_per_paragraph": round(word_count / paragraph_count, 1) if paragraph_count > 0 else 0,
+        "recommended_chunk_size": chunk_size,
+        "recommended_overlap": overlap,
+        "recommendation_source": "auto",
+    }
+
+
+class DocumentStatsTable:
+    """CSV-Tabelle der Dokument-Statistiken, geschlüsselt nach Dateiname."""
+
+    def __init__(self, path: Path, base_path: Optional[Path] = None):
+        """
+        Args:
+            path: Pfad zur CSV-Datei (wird bei save() angelegt)
+            base_path: Optionale Ausgangstabelle (nur gelesen, z.B. die
+                       versionierte data/document_stats.csv); Zeilen aus path
+                       haben Vorrang, manuelle Empfehlungen bleiben erhalten
+        """
+        self.path = Path(path)
+        self.base_path = Path(base_path) if base_path is not None else None
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @staticmethod
+    def _read(path: Optional[Path]) -> List[Dict[str, Any]]:
+        """Zeilen einer CSV-Datei (fehlende Datei = keine Zeilen)."""
+        if path is None or not path.exists():
+            return []
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                return [row for row in csv.DictReader(f) if row.get("filename")]
+        except (OSError, csv.Error) as e:
+            logger.warning(f"⚠️  Dokument-Statistiken nicht lesbar ({path}): {e}")
+            return []
+
+    def load(self) -> None:
+        """Lädt Ausgangstabelle und Tabelle (fehlende Dateien = leere Tabelle)."""
+        self.rows = {}
+        if self.base_path is not None and self.base_path != self.path:
+            self.update(self._read(self.base_path))
+        self.update(self._read(self.path))
+
+    def save(self) -> None:
+        """Schreibt die Tabelle atomar (nach Dateiname sortiert)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=STATS_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for name in sorted(self.rows):
+                writer.writerow(self.rows[name])
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _is_manual(row: Optional[Dict[str, Any]]) -> bool:
+        """True, wenn die Zeile eine vollständige manuelle Empfehlung enthält."""
+        if not row or row.get("recommendation_source") != "manual":
+            return False
+        return row.get("recommended_chunk_size") not in (None, "") and row.get("recommended_overlap") not in (None, "")
+
+    def update(self, stats: Iterable[Dict[str, Any]]) -> None:
+        """
+        Trägt Statistiken ein bzw. ersetzt vorhandene Zeilen.
+
+        Manuelle Empfehlungen (der neuen oder der bisherigen Zeile) bleiben
+        erhalten; alle anderen werden aus der aktuellen Wortanzahl neu
+        berechnet, damit Zeile und Größen-Stufe zusammenpassen.
+
+        Args:
+            stats: Zeilen im Format von compute_document_stats
+        """
+        for row in stats:
+            old = self.rows.get(row["filename"])
+            row = dict(row)
+            if self._is_manual(old) and not self._is_manual(row):
+                row["recommended_chunk_size"] = old["recommended_chunk_size"]
+                row["recommended_overlap"] = old["recommended_overlap"]
+                row["recommendation_source"] = "manual"
+            elif not self._is_manual(row):
+                chunk_size, overlap = recommend_chunk_params(int(float(row.get("words") or 0)))
+                row["recommended_chunk_size"] = chunk_size
+                row["recommended_overlap"] = overlap
+                row["recommendation_source"] = "auto"
+            self.rows[row["filename"]] = row
+
+    def get(self, file_name: str) -> Optional[Dict[str, Any]]:
+        return self.rows.get(file_name)
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Alle Zeilen (Format wie compute_document_stats, Zahlen als Zahlen)."""
+        out = []
+        for name in sorted(self.rows):
+            row = dict(self.rows[name])
+            for key in ("pages", "words", "characters", "paragraphs", "sentences"):
+                row[key] = int(float(row.get(key) or 0))
+            out.append(row)
+        return out
+
+    def chunk_params(self, include_auto: bool = False) -> Dict[str, tuple]:
+        """
+        {filename: (recommended_chunk_size, recommended_overlap)}
+
+        Args:
+            include_auto: False = nur manuelle Empfehlungen (für resolve_chunk_params;
+                          automatische ergeben sich dort aus der aktuellen Wortanzahl),
+                          True = alle (Abgleich mit dem Manifest)
+        """
+        params = {}
+        for name, row in self.rows.items():
+            if not include_auto and not self._is_manual(row):
+                continue
+            size = row.get("recommended_chunk_size")
+            overlap = row.get("recommended_overlap")
+            if size in (None, "") or overlap in (None, ""):
+                continue
+            params[name] = (int(float(size)), int(float(overlap)))
+        return params
+
+    def __len__(self) -> int:
+        return len(self.rows)
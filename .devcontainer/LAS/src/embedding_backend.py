@@ -0,0 +1,91 @@
+"""
+Inference-Backends für das Embedding-Modell (CPU).
+
+    torch       SentenceTransformer unverändert (float32, Referenz)
+    torch-int8  Dynamische int8-Quantisierung aller nn.Linear-Schichten
+                (torch.quantization.quantize_dynamic). Gewichte int8,
+                Aktivierungen werden pro Batch quantisiert; kein Export und
+                keine Kalibrierung nötig.
+
+Auswahl: Parameter embedding_backend von LicenseVectorStore oder
+LAS_EMBEDDING_BACKEND (Default: torch). Unabhängig davon können die Gewichte
+des torch-Backends in bfloat16/float16 geladen werden (model_precision.py).
+
+Quantisierte Embeddings weichen leicht von float32 ab. Manifest und
+Embedding-Cache verwenden daher embedding_model_key() als Modell-Kennung, damit
+Vektoren verschiedener Backends nicht gemischt werden. Die Abweichung im
+Retrieval misst compare_embedding_backends.py auf ibm_expert_questions.json.
+"""
+
+from typing import TYPE_CHECKING, Optional
+import logging
+import os
+
+from model_precision import apply_model_dtype, resolve_model_dtype
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+
+EMBEDDING_BACKENDS = ("torch", "torch-int8")
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Backend aus Parameter oder LAS_EMBEDDING_BACKEND (Default: torch)."""
+    if backend is None:
+        backend = os.environ.get("LAS_EMBEDDING_BACKEND", "torch")
+    backend = backend.strip().lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unbekanntes Embedding-Backend: {backend} (erlaubt: {', '.join(EMBEDDING_BACKENDS)})"
+        )
+    return backend
+
+
+def embedding_model_key(model_name: str, backend: str, dtype: str = "float32") -> str:
+    """Kennung für Manifest/Cache: Modellname, bei quantisierten Backends/reduzierter Genauigkeit mit Suffix."""
+    key = model_name if backend == "torch" else f"{model_name}@{backend}"
+    return key if dtype == "float32" else f"{key}@{dtype}"
+
+
+def load_embedding_model(
+    model_name: str, backend: str = "torch", device: Optional[str] = None, dtype: str = "float32"
+) -> "SentenceTransformer":
+    """
+    Lädt das Embedding-Modell für das gewählte Backend.
+
+    Args:
+        model_name: Hugging Face Model-Name
+        backend: Eines von EMBEDDING_BACKENDS
+        device: z.B. "cpu"/"cuda" (Default: automatisch; torch-int8 immer CPU)
+        dtype: Gewichts-Datentyp für torch (float32|bfloat16|float16, mit Fallback)
+
+    Returns:
+        SentenceTransformer (encode() wie gewohnt); der tatsächliche Datentyp
+        steht in model.las_model_dtype
+    """
+    # Import erst hier: Scripts mit Embedding-Daemon sollen torch nicht laden
+    from sentence_transformers import SentenceTransformer
+
+    backend = resolve_backend(backend)
+    dtype = resolve_model_dtype(dtype)
+
+    if backend == "torch":
+        model = SentenceTransformer(model_name, device=device)
+        model.las_model_dtype = apply_model_dtype(
+            model, dtype, probe=lambda: model.encode(["probe"], convert_to_numpy=True), label=model_name
+        )
+        return model
+
+    # torch-int8: Quantisierung läuft nur auf der CPU
+    import torch
+
+    model = SentenceTransformer(model_name, device="cpu")
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    logger.info(f"⚙️  Embedding-Backend torch-int8: nn.Linear dynamisch quantisiert ({model_name})")
+    if dtype != "float32":
+        logger.warning(f"⚠️  torch-int8 unterstützt kein {dtype} → Aktivierungen bleiben float32")
+    model.las_model_dtype = "float32"
+    return model
@@ -0,0 +1,139 @@
+"""
+Längen-sortiertes Batching mit Token-Budget für SentenceTransformer.encode.
+
+Bisher: encode(texts, batch_size=32) in Korpus-Reihenfolge. Kurze und lange
+Chunks landen im selben Batch, jeder Batch wird auf seinen längsten Text
+gepaddet.
+
+Jetzt:
+1. Token-Länge pro Text (Tokenizer des Modells, gekappt auf max_seq_length)
+2. Absteigend nach Länge sortieren → Texte ähnlicher Länge bilden Buckets
+3. Batch-Größe pro Bucket aus dem Token-Budget: batch_size × max_len ≤ budget
+   (lange Chunks: kleine Batches, kurze Chunks: große Batches)
+4. Ergebnis wieder in Original-Reihenfolge
+
+Auswahl: LAS_EMBED_BATCHING=bucketed|fixed (Default: bucketed),
+Budget: LAS_EMBED_TOKEN_BUDGET (Default: 16384 = 32 × 512).
+"""
+
+from typing import List, Optional, Sequence
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Default-Budget: entspricht dem bisherigen Worst Case (32 Texte à 512 Tokens)
+DEFAULT_TOKEN_BUDGET = 32 * 512
+DEFAULT_MAX_BATCH_SIZE = 256
+
+
+def token_lengths(model, texts: Sequence[str]) -> List[int]:
+    """
+    Token-Länge pro Text inkl. Spezial-Tokens, gekappt auf model.max_seq_length.
+
+    Ohne Tokenizer (z.B. andere Modell-Typen): Schätzung über 4 Zeichen/Token.
+    """
+    max_len = getattr(model, "max_seq_length", None) or 512
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return [min(max_len, len(text) // 4 + 2) for text in texts]
+    encoded = tokenizer(list(texts), add_special_tokens=True, truncation=True, max_length=max_len)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def plan_token_batches(
+    lengths: Sequence[int],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+) -> List[List[int]]:
+    """
+    Teilt Text-Indizes in Batches mit batch_size × max_len ≤ token_budget.
+
+    Args:
+        lengths: Token-Länge pro Text
+        token_budget: Maximale gepaddete Tokens pro Batch
+        max_batch_size: Obergrenze für die Batch-Größe
+
+    Returns:
+        Liste von Index-Listen (absteigend nach Länge sortiert)
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_max = 0
+    for i in order:
+        length = max(1, lengths[i])
+        new_max = max(current_max, length)
+        if current and (new_max * (len(current) + 1) > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            new_max = length
+        current.append(i)
+        current_max = new_max
+    if current:
+        batches.append(current)
+    return batches
+
+
+def encode_bucketed(
+    model,
+    texts: Sequence[str],
+    token_budget: Optional[int] = None,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    show_progress_bar: bool = False,
+    **encode_kwargs,
+) -> np.ndarray:
+    """
+    encode() mit längen-sortierten Batches aus dem Token-Budget.
+
+    Args:
+        model: SentenceTransformer
+        texts: Texte
+        token_budget: Gepaddete Tokens pro Batch (Default: LAS_EMBED_TOKEN_BUDGET oder 16384)
+        max_batch_size: Obergrenze für die Batch-Größe
+        show_progress_bar: Fortschritt über alle Batches anzeigen
+        **encode_kwargs: Weitere Argumente für model.encode (z.B. normalize_embeddings)
+
+    Returns:
+        float32-Matrix [len(texts), dim] in Original-Reihenfolge
+    """
+    if token_budget is None:
+        token_budget = int(os.environ.get("LAS_EMBED_TOKEN_BUDGET", str(DEFAULT_TOKEN_BUDGET)))
+
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    lengths = token_lengths(model, texts)
+    batches = plan_token_batches(lengths, token_budget, max_batch_size)
+
+    out: Optional[np.ndarray] = None
+    progress = None
+    if show_progress_bar:
+        from tqdm.auto import tqdm
+        progress = tqdm(total=len(texts), desc="Batches (Token-Budget)")
+
+    for batch in batches:
+        embeddings = model.encode(
+            [texts[i] for i in batch],
+            batch_size=len(batch),
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            **encode_kwargs,
+        )
+        if out is None:
+            out = np.empty((len(texts), embeddings.shape[1]), dtype=embeddings.dtype)
+        out[batch] = embeddings
+        if progress is not None:
+            progress.update(len(batch))
+
+    if progress is not None:
+        progress.close()
+    logger.debug(
+        f"🧮 Token-Budget-Batching: {len(texts)} Texte in {len(batches)} Batches "
+        f"(Budget {token_budget}, Ø {len(texts) / len(batches):.1f} Texte/Batch)"
+    )
+    return out
@@ -0,0 +1,253 @@
+"""
+Persistenter Embedding-Cache für Dokument-Chunks.
+
+Schlüssel: (Embedding-Modell, SHA-256 des normalisierten Chunk-Texts).
+Chunks, die sich zwischen zwei Builds nicht ändern (Metadaten-Änderungen,
+wiederholte Builds, überlappende Chunk-Experimente), werden nicht erneut
+durch BGE-large geschickt.
+
+Normalisierung: Unicode NFC + zusammengefasste Whitespaces. Der WordPiece-
+Tokenizer von BERT/BGE trennt an beliebigem Whitespace; Texte, die sich nur
+darin unterscheiden, ergeben dieselben Tokens und damit dasselbe Embedding.
+
+Speicherort (Default): data/embedding_cache/<modell>/ (neben data/chroma_db)
+    vectors.<dtype>   Vektoren als memory-mapped Matrix [capacity, dim]
+    index.json        {hash: [slot, last_used]} + dim/dtype/capacity
+
+Größenbegrenzung: max_mb (Default: LAS_EMBED_CACHE_MAX_MB oder 512). Ist der
+Cache voll, werden die am längsten nicht genutzten Einträge (LRU) verdrängt.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_VERSION = 1
+
+# Anteil der Einträge, der bei vollem Cache auf einmal verdrängt wird
+_EVICT_FRACTION = 0.1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalisierte Form eines Chunk-Texts (Unicode NFC, Whitespace zusammengefasst)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def text_hash(model_name: str, text: str) -> str:
+    """Cache-Schlüssel für (Modell, normalisierter Text)."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Memory-mapped Vektor-Cache mit JSON-Index und LRU-Verdrängung."""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model_name: str,
+        dim: int,
+        dtype: Optional[str] = None,
+        max_mb: Optional[float] = None,
+    ):
+        """
+        Args:
+            cache_dir: Basisverzeichnis (pro Modell ein Unterverzeichnis)
+            model_name: Name des Embedding-Modells (Teil des Schlüssels)
+            dim: Dimension der Embeddings
+            dtype: "float16" oder "float32" (Default: LAS_EMBED_CACHE_DTYPE oder float32)
+            max_mb: Maximale Größe der Vektordatei in MB (Default: LAS_EMBED_CACHE_MAX_MB oder 512)
+        """
+        if dtype is None:
+            dtype = os.environ.get("LAS_EMBED_CACHE_DTYPE", "float32")
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Nicht unterstützter Cache-dtype: {dtype}")
+        if max_mb is None:
+            max_mb = float(os.environ.get("LAS_EMBED_CACHE_MAX_MB", "512"))
+
+        self.model_name = model_name
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = dim * self.dtype.itemsize
+        self.max_entries = max(1, int(max_mb * 1024 * 1024) // self.row_bytes)
+
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        self.dir = Path(cache_dir) / slug
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / "index.json"
+        self.vectors_path = self.dir / f"vectors.{dtype}"
+
+        self.entries: Dict[str, List[int]] = {}
+        self.capacity = 0
+        self._tick = 0
+        self._free: List[int] = []
+        self._vectors: Optional[np.memmap] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Laden / Speichern
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if self.index_path.exists() and self.vectors_path.exists():
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if (
+                    data.get("version") == INDEX_VERSION
+                    and data.get("dim") == self.dim
+                    and data.get("dtype") == self.dtype.name
+                ):
+                    self.entries = {k: list(v) for k, v in data["entries"].items()}
+                    self.capacity = int(data["capacity"])
+                    self._tick = int(data.get("tick", 0))
+                else:
+                    logger.warning("⚠️  Embedding-Cache passt nicht (dim/dtype/Version) – wird neu aufgebaut")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"⚠️  Embedding-Cache-Index defekt: {e} – wird neu aufgebaut")
+                self.entries = {}
+                self.capacity = 0
+
+        if self.capacity > self.max_entries:
+            logger.info("📦 Embedding-Cache größer als das Limit – wird neu aufgebaut")
+            self.capacity = 0
+        if self.capacity == 0:
+            self.entries = {}
+        self._open(self.capacity)
+
+        used = {slot for slot, _ in self.entries.values()}
+        self._free = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+        logger.info(
+            f"📦 Embedding-Cache: {len(self.entries)} Vektoren ({self.dtype.name}, "
+            f"max {self.max_entries}) in {self.dir}"
+        )
+
+    def _open(self, capacity: int) -> None:
+        """Öffnet (bzw. vergrößert) die Vektordatei als memmap."""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(max(capacity, 0) * self.row_bytes)
+        self.capacity = capacity
+        if capacity > 0:
+            self._vectors = np.memmap(self.vectors_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+
+    def flush(self) -> None:
+        """Schreibt Vektoren und Index auf die Platte (Index atomar, nach den Vektoren)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._vectors is not None:
+                self._vectors.flush()
+            data = {
+                "version": INDEX_VERSION,
+                "model": self.model_name,
+                "dim": self.dim,
+                "dtype": self.dtype.name,
+                "capacity": self.capacity,
+                "tick": self._tick,
+                "entries": self.entries,
+            }
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Zugriff
+    # ------------------------------------------------------------------
+
+    def get_many(self, texts: Sequence[str]) -> tuple:
+        """
+        Sucht Embeddings für Texte.
+
+        Returns:
+            (keys, found) – keys: Cache-Schlüssel pro Text,
+            found: {Position: Vektor (float32)} für Treffer
+        """
+        keys = [text_hash(self.model_name, text) for text in texts]
+        found: Dict[int, np.ndarray] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry is None:
+                    continue
+                self._tick += 1
+                entry[1] = self._tick
+                found[i] = np.asarray(self._vectors[entry[0]], dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if found:
+                self._dirty = True
+        return keys, found
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Legt Vektoren unter den Schlüsseln ab (verdrängt bei Bedarf LRU-Einträge)."""
+        vectors = np.asarray(vectors)
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                entry = self.entries.get(key)
+                if entry is not None:
+                    slot = entry[0]
+                else:
+                    slot = self._allocate_slot()
+                self._tick += 1
+                self._vectors[slot] = vector
+                self.entries[key] = [slot, self._tick]
+            self._dirty = True
+
+    def _allocate_slot(self) -> int:
+        if not self._free:
+            if self.capacity < self.max_entries:
+                # Datei verdoppeln (höchstens bis max_entries)
+                new_capacity = min(self.max_entries, max(1024, self.capacity * 2))
+                self._free = list(range(new_capacity - 1, self.capacity - 1, -1))
+                self._open(new_capacity)
+            else:
+                self._evict(max(1, int(self.max_entries * _EVICT_FRACTION)))
+        return self._free.pop()
+
+    def _evict(self, count: int) -> None:
+        """Verdrängt die count am längsten nicht genutzten Einträge."""
+        oldest = sorted(self.entries.items(), key=lambda item: item[1][1])[:count]
+        for key, (slot, _) in oldest:
+            del self.entries[key]
+            self._free.append(slot)
+        self._dirty = True
+        logger.info(f"📦 Embedding-Cache: {len(oldest)} Einträge verdrängt (LRU)")
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self.entries),
+            "capacity": self.capacity,
+            "max_entries": self.max_entries,
+            "size_mb": round(self.capacity * self.row_bytes / (1024 * 1024), 1),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Lokaler Embedding-/Rerank-Dienst über einen Unix-Socket.
+
+Jedes Script (test_expert_questions_fixed.py, debug_fixed.py, list_docs.py,
+Build) lädt sonst zuerst BGE-large (und ggf. den CrossEncoder). Der Daemon
+hält die Modelle dauerhaft im Speicher (model_registry, geladen beim ersten
+Request bzw. mit --preload). LicenseVectorStore verbindet sich automatisch,
+wenn der Socket erreichbar ist, und nutzt dann RemoteEmbeddingModel /
+RemoteCrossEncoder statt lokaler Modelle. Fällt der Daemon während eines
+Laufs aus, wird das Modell lokal nachgeladen.
+
+Protokoll (eine Anfrage pro Verbindung):
+    [4 Byte Header-Länge][4 Byte Payload-Länge][JSON-Header][Payload]
+    Embeddings/Scores kommen als rohe float32-Matrix im Payload zurück.
+
+Verwendung:
+    python embedding_daemon.py serve --preload BAAI/bge-large-en-v1.5
+    python embedding_daemon.py status
+    python embedding_daemon.py stop
+
+Socket: LAS_EMBED_DAEMON_SOCKET (Default: /tmp/las-embed-<uid>.sock),
+LAS_EMBED_DAEMON=0 schaltet die Nutzung im Vectorstore ab.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+_HEADER = struct.Struct("!II")
+_CONNECT_TIMEOUT_S = 0.5
+
+
+def default_socket_path() -> str:
+    """Socket-Pfad aus LAS_EMBED_DAEMON_SOCKET oder pro Benutzer im Temp-Verzeichnis."""
+    path = os.environ.get("LAS_EMBED_DAEMON_SOCKET")
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"las-embed-{uid}.sock")
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        part = sock.recv(min(n - len(buf), 1 << 20))
+        if not part:
+            raise ConnectionError("Verbindung zum Embedding-Daemon unterbrochen")
+        buf.extend(part)
+    return bytes(buf)
+
+
+def _send_message(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    data = json.dumps(header).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data), len(payload)) + data + payload)
+
+
+def _recv_message(sock: socket.socket) -> Tuple[dict, bytes]:
+    header_len, payload_len = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    header = json.loads(_recv_exact(sock, header_len).decode("utf-8"))
+    payload = _recv_exact(sock, payload_len) if payload_len else b""
+    return header, payload
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        try:
+            header, _ = _recv_message(self.request)
+        except (ConnectionError, ValueError):
+            return
+        try:
+            reply, payload = self.server.dispatch(header)
+        except Exception as e:
+            logger.error(f"❌ Embedding-Daemon: {header.get('op')} fehlgeschlagen: {e}")
+            reply, payload = {"ok": False, "error": str(e)}, b""
+        _send_message(self.request, reply, payload)
+
+
+class EmbeddingDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-Socket-Server; Modelle kommen aus model_registry (lazy)."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+        self.started_at = time.time()
+        self.requests = 0
+        # Ein Forward-Pass zur Zeit: parallele Clients teilen sich die Kerne sonst schlecht
+        self._compute_lock = threading.Lock()
+        # torch-Threads pro Anfrage-Profil (ingest/query, siehe thread_tuning.py)
+        from thread_tuning import ThreadSettings
+
+        self.threads = ThreadSettings()
+
+    def dispatch(self, header: dict) -> Tuple[dict, bytes]:
+        import model_registry
+
+        op = header.get("op")
+        self.requests += 1
+
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}, b""
+
+        if op == "info":
+            model = model_registry.get_embedding_model(
+                header["model"], header.get("backend", "torch"), dtype=header.get("dtype", "float32")
+            )
+            return {
+                "ok": True,
+                "dim": model.get_sentence_embedding_dimension(),
+                "max_seq_length": getattr(model, "max_seq_length", None),
+                "dtype": getattr(model, "las_model_dtype", "float32"),
+            }, b""
+
+        if op == "encode":
+            from embedding_batching import encode_bucketed
+
+            model = model_registry.get_embedding_model(
+                header["model"], header.get("backend", "torch"), dtype=header.get("dtype", "float32")
+            )
+            texts = header["texts"]
+            with self._compute_lock, self.threads.use(header.get("profile", "ingest")):
+                if header.get("batching", "bucketed") == "fixed":
+                    matrix = model.encode(texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+                else:
+                    matrix = encode_bucketed(model, texts, token_budget=header.get("token_budget"))
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            return {"ok": True, "shape": list(matrix.shape)}, matrix.tobytes()
+
+        if op == "rerank":
+            model = model_registry.get_cross_encoder(header["model"], dtype=header.get("dtype", "float32"))
+            with self._compute_lock, self.threads.use("query"):
+                scores = np.asarray(model.predict([tuple(p) for p in header["pairs"]]), dtype=np.float32)
+            return {"ok": True, "shape": list(scores.shape)}, scores.tobytes()
+
+        if op == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "requests": self.requests,
+                "models": model_registry.memory_report(),
+            }, b""
+
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}, b""
+
+        raise ValueError(f"Unbekannte Operation: {op}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class DaemonClient:
+    """Client für den Embedding-Daemon (eine Verbindung pro Anfrage)."""
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or default_socket_path()
+
+    def _request(self, header: dict, timeout: Optional[float] = None) -> Tuple[dict, bytes]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT_S)
+            sock.connect(self.socket_path)
+            sock.settimeout(timeout)
+            _send_message(sock, header)
+            reply, payload = _recv_message(sock)
+        if not reply.get("ok"):
+            raise RuntimeError(f"Embedding-Daemon: {reply.get('error', 'unbekannter Fehler')}")
+        return reply, payload
+
+    def available(self) -> bool:
+        """True, wenn ein Daemon auf dem Socket antwortet."""
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            self._request({"op": "ping"}, timeout=_CONNECT_TIMEOUT_S)
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def info(self, model_name: str, backend: str = "torch", dtype: str = "float32") -> dict:
+        # Erster Request für ein Modell lädt es im Daemon → ohne Timeout
+        reply, _ = self._request({"op": "info", "model": model_name, "backend": backend, "dtype": dtype})
+        return reply
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        model_name: str,
+        backend: str = "torch",
+        batching: str = "bucketed",
+        token_budget: Optional[int] = None,
+        dtype: str = "float32",
+        profile: str = "ingest",
+    ) -> np.ndarray:
+        """Kodiert Texte im Daemon; float32-Matrix [len(texts), dim]."""
+        reply, payload = self._request({
+            "op": "encode",
+            "model": model_name,
+            "backend": backend,
+            "dtype": dtype,
+            "profile": profile,
+            "texts": list(texts),
+            "batching": batching,
+            "token_budget": token_budget,
+        })
+        return np.frombuffer(payload, dtype=np.float32).reshape(reply["shape"])
+
+    def rerank(self, pairs: Sequence[Tuple[str, str]], model_name: str, dtype: str = "float32") -> np.ndarray:
+        """CrossEncoder-Scores für (query, text)-Paare."""
+        reply, payload = self._request({
+            "op": "rerank", "model": model_name, "dtype": dtype, "pairs": [list(p) for p in pairs],
+        })
+        return np.frombuffer(payload, dtype=np.float32).reshape(reply["shape"])
+
+    def status(self) -> dict:
+        reply, _ = self._request({"op": "status"}, timeout=5.0)
+        return reply
+
+    def shutdown(self) -> None:
+        self._request({"op": "shutdown"}, timeout=5.0)
+
+
+def connect_daemon(socket_path: Optional[str] = None) -> Optional[DaemonClient]:
+    """Client, wenn der Daemon läuft und LAS_EMBED_DAEMON nicht 0 ist; sonst None."""
+    if os.environ.get("LAS_EMBED_DAEMON", "1") == "0":
+        return None
+    client = DaemonClient(socket_path)
+    return client if client.available() else None
+
+
+class RemoteEmbeddingModel:
+    """
+    Stellvertreter für SentenceTransformer, der im Daemon kodiert.
+
+    Unterstützt encode() und get_sentence_embedding_dimension(). Ist der
+    Daemon nicht mehr erreichbar, wird das Modell lokal (model_registry)
+    geladen und ab dann lokal kodiert.
+    """
+
+    is_remote = True
+
+    def __init__(self, client: DaemonClient, model_name: str, backend: str = "torch", dtype: str = "float32"):
+        self.client = client
+        self.model_name = model_name
+        self.backend = backend
+        self.dtype = dtype
+        info = client.info(model_name, backend, dtype)
+        self._dim = info["dim"]
+        self.max_seq_length = info.get("max_seq_length")
+        # Tatsächlicher Datentyp im Daemon (nach evtl. Fallback auf float32)
+        self.las_model_dtype = info.get("dtype", "float32")
+        self._local = None
+
+    def _fallback(self, error: Exception):
+        if self._local is None:
+            import model_registry
+
+            logger.warning(f"⚠️  Embedding-Daemon nicht erreichbar ({error}) → lade Modell lokal")
+            self._local = model_registry.get_embedding_model(self.model_name, self.backend, dtype=self.dtype)
+        return self._local
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def encode_texts(self, texts: Sequence[str], batching: str = "bucketed", profile: str = "ingest") -> np.ndarray:
+        """Kodiert Texte (Batching und Threads im Daemon); float32-Matrix."""
+        if not texts:
+            return np.zeros((0, self._dim), dtype=np.float32)
+        if self._local is None:
+            try:
+                return self.client.encode(
+                    texts, self.model_name, self.backend, batching=batching, dtype=self.dtype, profile=profile
+                )
+            except OSError as e:
+                self._fallback(e)
+        from embedding_batching import encode_bucketed
+
+        if batching == "fixed":
+            return self._local.encode(list(texts), batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+        return encode_bucketed(self._local, texts)
+
+    def encode(self, sentences, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        # Kompatibel zu SentenceTransformer.encode (batch_size wird im Daemon geplant)
+        single = isinstance(sentences, str)
+        matrix = self.encode_texts([sentences] if single else list(sentences))
+        return matrix[0] if single else matrix
+
+
+class RemoteCrossEncoder:
+    """Stellvertreter für CrossEncoder.predict() über den Daemon (mit lokalem Fallback)."""
+
+    is_remote = True
+
+    def __init__(self, client: DaemonClient, model_name: str, dtype: str = "float32"):
+        self.client = client
+        self.model_name = model_name
+        self.dtype = dtype
+        self._local = None
+
+    def predict(self, pairs: List[Tuple[str, str]], **kwargs) -> np.ndarray:
+        if self._local is None:
+            try:
+                return self.client.rerank(pairs, self.model_name, dtype=self.dtype)
+            except OSError as e:
+                import model_registry
+
+                logger.warning(f"⚠️  Embedding-Daemon nicht erreichbar ({e}) → lade Reranker lokal")
+                self._local = model_registry.get_cross_encoder(self.model_name, dtype=self.dtype)
+        return self._local.predict(pairs, **kwargs)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lokaler Embedding-/Rerank-Daemon (Unix-Socket)")
+    parser.add_argument("command", choices=("serve", "status", "stop"))
+    parser.add_argument("--socket", default=None, help="Socket-Pfad (Default: LAS_EMBED_DAEMON_SOCKET)")
+    parser.add_argument("--preload", action="append", default=[], help="Embedding-Modell beim Start laden")
+    parser.add_argument("--preload-reranker", action="append", default=[], help="CrossEncoder beim Start laden")
+    parser.add_argument("--backend", default=None, help="Backend für --preload (Default: LAS_EMBEDDING_BACKEND)")
+    parser.add_argument("--dtype", default=None, help="Gewichts-Datentyp für --preload (Default: LAS_MODEL_DTYPE)")
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path()
+
+    if args.command == "status":
+        client = DaemonClient(socket_path)
+        if not client.available():
+            print(f"⚪ Kein Daemon auf {socket_path}")
+            return 1
+        status = client.status()
+        print(f"🟢 Daemon PID {status['pid']} | {socket_path} | Uptime {status['uptime_s']:.0f}s | {status['requests']} Requests")
+        for row in status["models"]:
+            print(f"   {row['kind']:<13} {row['name']} ({row['variant']}): {row['size_mb']:.0f} MB, {row['shared_hits']}× genutzt")
+        return 0
+
+    if args.command == "stop":
+        client = DaemonClient(socket_path)
+        if not client.available():
+            print(f"⚪ Kein Daemon auf {socket_path}")
+            return 1
+        client.shutdown()
+        print("🛑 Daemon beendet")
+        return 0
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if DaemonClient(socket_path).available():
+        logger.error(f"❌ Auf {socket_path} läuft bereits ein Daemon")
+        return 1
+
+    import model_registry
+    from embedding_backend import resolve_backend
+
+    from model_precision import resolve_model_dtype
+
+    backend = resolve_backend(args.backend)
+    dtype = resolve_model_dtype(args.dtype)
+    for name in args.preload:
+        model_registry.get_embedding_model(name, backend, dtype=dtype)
+    for name in args.preload_reranker:
+        model_registry.get_cross_encoder(name, dtype=dtype)
+
+    server = EmbeddingDaemon(socket_path)
+    logger.info(f"🟢 Embedding-Daemon lauscht auf {socket_path} (PID {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info("🛑 Embedding-Daemon beendet")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Multi-Prozess-Encoding für große Ingestion-Läufe.
+
+torch skaliert über Intra-Op-Threads auf vielen Kernen schlecht. Hier laden
+mehrere Worker-Prozesse je eine Kopie des Modells
+(SentenceTransformer.start_multi_process_pool) und kodieren Shards der Texte.
+Die Threads pro Prozess werden so begrenzt, dass Prozesse × Threads den
+Kernen entspricht.
+
+Die Texte werden vor dem Verteilen nach Länge sortiert (homogene Shards,
+wenig Padding) und das Ergebnis danach in die Original-Reihenfolge gebracht.
+Mit LAS_EMBED_BATCHING=bucketed (Default) gilt dasselbe Token-Budget wie im
+Hauptprozess (embedding_batching.plan_token_batches): die Batch-Größen des
+Plans werden auf Zweierpotenzen abgerundet, und jede dieser Größenklassen
+geht als eigener encode_multi_process-Aufruf mit passender batch_size an die
+Worker (wenige Aufrufe, Budget bleibt eingehalten). fixed: batch_size=32.
+
+Auswahl: LAS_ENCODE_PROCESSES=1 (Default, ein Prozess) | N | auto
+    auto = alle Kerne, LAS_ENCODE_THREADS_PER_PROCESS (Default 4) Threads je Prozess
+Kleine Aufrufe (< LAS_ENCODE_POOL_MIN_TEXTS, Default 256) bleiben im Hauptprozess.
+"""
+
+from typing import List, Optional, Sequence
+import logging
+import math
+import os
+
+import numpy as np
+
+from embedding_batching import DEFAULT_TOKEN_BUDGET, plan_token_batches, token_lengths
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_THREADS_PER_PROCESS = 4
+DEFAULT_MIN_TEXTS = 256
+
+
+def resolve_encode_processes(value: Optional[str] = None) -> int:
+    """Anzahl Encode-Prozesse aus Parameter oder LAS_ENCODE_PROCESSES (1 = aus)."""
+    if value is None:
+        value = os.environ.get("LAS_ENCODE_PROCESSES", "1")
+    value = str(value).strip().lower()
+    cpus = os.cpu_count() or 1
+    if value == "auto":
+        threads = int(os.environ.get("LAS_ENCODE_THREADS_PER_PROCESS", str(DEFAULT_THREADS_PER_PROCESS)))
+        return max(1, cpus // max(1, threads))
+    return max(1, int(value))
+
+
+class EncodePool:
+    """Prozess-Pool mit je einer Modell-Kopie; wird beim ersten Bedarf gestartet."""
+
+    def __init__(self, model, processes: int):
+        """
+        Args:
+            model: SentenceTransformer (wird an die Worker gepickelt)
+            processes: Anzahl Worker-Prozesse (≥ 2)
+        """
+        self.model = model
+        self.processes = processes
+        self.threads_per_process = max(1, (os.cpu_count() or 1) // processes)
+        self.min_texts = int(os.environ.get("LAS_ENCODE_POOL_MIN_TEXTS", str(DEFAULT_MIN_TEXTS)))
+        self._pool = None
+
+    def _start(self) -> None:
+        # Threads der Worker begrenzen: torch liest OMP/MKL_NUM_THREADS beim Start
+        saved = {key: os.environ.get(key) for key in ("OMP_NUM_THREADS", "MKL_NUM_THREADS")}
+        for key in saved:
+            os.environ[key] = str(self.threads_per_process)
+        try:
+            self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.processes)
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        logger.info(
+            f"⚙️  Encode-Pool gestartet: {self.processes} Prozesse × {self.threads_per_process} Threads"
+        )
+
+    def should_use(self, n_texts: int) -> bool:
+        return n_texts >= self.min_texts
+
+    def _encode_sorted(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Längen-sortierte Texte mit fester batch_size auf die Worker verteilen."""
+        # Mehrere Shards pro Prozess, damit ungleich lange Shards sich ausgleichen;
+        # Shards als Vielfache von batch_size, damit kein Batch zwei Shards überspannt
+        shards = math.ceil(len(texts) / (self.processes * 4 * batch_size))
+        chunk_size = max(1, shards) * batch_size
+        return self.model.encode_multi_process(texts, self._pool, batch_size=batch_size, chunk_size=chunk_size)
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        batching: str = "bucketed",
+        token_budget: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Kodiert Texte verteilt auf die Worker.
+
+        Args:
+            texts: Texte
+            batching: bucketed (Token-Budget, siehe embedding_batching.py) oder fixed (batch_size=32)
+            token_budget: Gepaddete Tokens pro Batch (Default: LAS_EMBED_TOKEN_BUDGET oder 16384)
+
+        Returns:
+            float32-Matrix [len(texts), dim] in Original-Reihenfolge
+        """
+        if self._pool is None:
+            self._start()
+
+        texts = list(texts)
+        if batching == "fixed":
+            order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+            groups = [(32, order)]
+        else:
+            if token_budget is None:
+                token_budget = int(os.environ.get("LAS_EMBED_TOKEN_BUDGET", str(DEFAULT_TOKEN_BUDGET)))
+            # Plan wie im Hauptprozess, Batch-Größen auf Zweierpotenzen abgerundet:
+            # jede Klasse hält das Budget ein (kleiner oder gleich der geplanten Größe)
+            groups = []
+            for batch in plan_token_batches(token_lengths(self.model, texts), token_budget):
+                size = 1 << (len(batch).bit_length() - 1)
+                if groups and groups[-1][0] == size:
+                    groups[-1][1].extend(batch)
+                else:
+                    groups.append((size, list(batch)))
+
+        out: Optional[np.ndarray] = None
+        for batch_size, indices in groups:
+            embeddings = self._encode_sorted([texts[i] for i in indices], batch_size)
+            if out is None:
+                out = np.empty((len(texts), embeddings.shape[1]), dtype=embeddings.dtype)
+            out[indices] = embeddings
+        logger.debug(
+            f"⚙️  Encode-Pool: {len(texts)} Texte in {len(groups)} Größenklassen "
+            f"({', '.join(str(size) for size, _ in groups)})"
+        )
+        return out
+
+    def close(self) -> None:
+        """Beendet die Worker-Prozesse."""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+            logger.info("⚙️  Encode-Pool beendet")
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
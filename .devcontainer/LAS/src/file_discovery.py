@@ -0,0 +1,185 @@
+"""
+Zentrale Datei-Erkennung für Lizenzdokumente.
+
+Ersetzt die verstreuten, case-sensitiven Globs (*.pdf + *.PDF, *.docx + *.DOCX)
+in loader.py, vectorstore_IBM_Mapping.py und analyze_documents.py:
+
+- EIN Verzeichnis-Scan pro Aufruf (os.scandir), Endungen case-insensitiv
+- keine Duplikate auf case-insensitiven Dateisystemen (ein Eintrag = eine Datei)
+- pro Datei werden Größe und mtime festgehalten
+- Watch-Modus (Polling): liefert nur neue/geänderte bzw. gelöschte Dateien,
+  sobald sie zwischen zwei Scans stabil sind (keine halb kopierten Dateien)
+
+Verwendung:
+    from file_discovery import FileDiscovery
+
+    discovery = FileDiscovery(data_dir)
+    for path in discovery.paths():
+        ...
+
+    for changed, removed in discovery.watch(interval=10):
+        ...
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+# Standard: von der Ingestion unterstützte Dokumenttypen
+DOCUMENT_EXTENSIONS = (".pdf", ".docx")
+
+
+class FileDiscovery:
+    """Scannt einen Verzeichnisbaum einmal und merkt sich Größe/mtime pro Datei."""
+
+    def __init__(
+        self,
+        root: Path,
+        extensions: Iterable[str] = DOCUMENT_EXTENSIONS,
+        recursive: bool = False,
+    ):
+        """
+        Args:
+            root: Wurzelverzeichnis
+            extensions: Dateiendungen inkl. Punkt (Groß-/Kleinschreibung egal)
+            recursive: True = Unterverzeichnisse einbeziehen
+        """
+        self.root = Path(root)
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.recursive = recursive
+        self.files: Dict[str, Dict[str, Any]] = {}
+
+    def scan(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Scannt den Baum.
+
+        Returns:
+            {relativer Pfad (posix): {"path", "size", "mtime"}}
+        """
+        files: Dict[str, Dict[str, Any]] = {}
+        seen_inodes = set()
+        stack = [self.root]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                logger.warning(f"⚠️  Verzeichnis nicht lesbar: {directory}: {e}")
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if self.recursive:
+                            stack.append(Path(entry.path))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Datei wurde während des Scans gelöscht
+                    continue
+
+                # Symlinks/Hardlinks auf dieselbe Datei nur einmal zählen
+                inode = (stat.st_dev, stat.st_ino)
+                if stat.st_ino and inode in seen_inodes:
+                    continue
+                seen_inodes.add(inode)
+
+                path = Path(entry.path)
+                files[path.relative_to(self.root).as_posix()] = {
+                    "path": path,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                }
+
+        self.files = files
+        return files
+
+    def paths(self, extensions: Optional[Iterable[str]] = None) -> List[Path]:
+        """
+        Gefundene Dateien, gruppiert in der Reihenfolge der Endungen und
+        innerhalb einer Endung sortiert (deterministisch). Scannt bei Bedarf.
+
+        Args:
+            extensions: Optional Teilmenge der Endungen (Default: alle)
+        """
+        if not self.files:
+            self.scan()
+        wanted = tuple(ext.lower() for ext in (extensions or self.extensions))
+        result = []
+        for ext in wanted:
+            result.extend(sorted(
+                info["path"] for info in self.files.values()
+                if info["path"].suffix.lower() == ext
+            ))
+        return result
+
+    def count_by_extension(self) -> Dict[str, int]:
+        """Anzahl gefundener Dateien pro Endung."""
+        if not self.files:
+            self.scan()
+        counts = {ext: 0 for ext in self.extensions}
+        for info in self.files.values():
+            counts[info["path"].suffix.lower()] += 1
+        return counts
+
+    def watch(
+        self,
+        interval: float = 10.0,
+        stop_event: Optional[threading.Event] = None,
+        initial: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Iterator[Tuple[List[Path], List[str]]]:
+        """
+        Polling-Watch: liefert Änderungen seit dem letzten Stand.
+
+        Eine neue/geänderte Datei wird erst gemeldet, wenn Größe und mtime in
+        zwei aufeinanderfolgenden Scans gleich sind.
+
+        Args:
+            interval: Sekunden zwischen zwei Scans
+            stop_event: Optionales Event zum Beenden
+            initial: Bekannter Ausgangszustand (Default: aktueller Scan)
+
+        Yields:
+            (neue/geänderte Pfade, gelöschte relative Pfade)
+        """
+        known = dict(initial) if initial is not None else dict(self.scan())
+        pending: Dict[str, Tuple[int, float]] = {}
+        stop_event = stop_event or threading.Event()
+
+        logger.info(f"👀 Watch aktiv: {self.root} (alle {interval:g}s)")
+        while not stop_event.wait(interval):
+            current = self.scan()
+
+            changed: List[Path] = []
+            for rel, info in current.items():
+                signature = (info["size"], info["mtime"])
+                old = known.get(rel)
+                if old is not None and (old["size"], old["mtime"]) == signature:
+                    pending.pop(rel, None)
+                    continue
+                if pending.get(rel) == signature:
+                    # Zwei Scans lang stabil → melden
+                    changed.append(info["path"])
+                    known[rel] = info
+                    pending.pop(rel, None)
+                else:
+                    pending[rel] = signature
+
+            removed = [rel for rel in known if rel not in current]
+            for rel in removed:
+                known.pop(rel, None)
+                pending.pop(rel, None)
+
+            if changed or removed:
+                logger.info(f"👀 Änderungen: {len(changed)} neu/geändert, {len(removed)} gelöscht")
+                yield sorted(changed), sorted(removed)
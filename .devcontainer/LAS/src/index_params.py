@@ -0,0 +1,87 @@
+"""
+HNSW-Parameter der ChromaDB-Collections.
+
+ChromaDB legt den HNSW-Index mit Collection-Metadaten an:
+
+    hnsw:space            Distanz: l2 (Default), cosine, ip
+    hnsw:M                Kanten pro Knoten (Default 16): mehr Recall, mehr Speicher
+    hnsw:construction_ef  Kandidatenliste beim Aufbau (Default 100)
+    hnsw:search_ef        Kandidatenliste bei der Suche (Default 10): mehr Recall, mehr Latenz
+
+Alle vier gelten nur beim Anlegen der Collection; ChromaDB 0.5 lehnt spätere
+Änderungen ab (auch search_ef). Für andere Werte die Collection neu bauen
+bzw. mit sweep_index_params.py eine Kopie aus den gespeicherten Vektoren.
+
+Parameter von LicenseVectorStore bzw. LAS_HNSW_SPACE, LAS_HNSW_M,
+LAS_HNSW_CONSTRUCTION_EF, LAS_HNSW_SEARCH_EF; nicht gesetzte Werte bleiben
+beim ChromaDB-Default.
+"""
+
+from typing import Dict, Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+HNSW_SPACES = ("l2", "cosine", "ip")
+HNSW_DEFAULTS = {"hnsw:space": "l2", "hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 10}
+
+
+def resolve_hnsw_params(
+    space: Optional[str] = None,
+    m: Optional[int] = None,
+    construction_ef: Optional[int] = None,
+    search_ef: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    HNSW-Metadaten aus Parametern bzw. LAS_HNSW_* (nur gesetzte Werte).
+
+    Returns:
+        z.B. {"hnsw:space": "cosine", "hnsw:search_ef": 64}
+    """
+    values = {
+        "hnsw:space": space or os.environ.get("LAS_HNSW_SPACE"),
+        "hnsw:M": m or os.environ.get("LAS_HNSW_M"),
+        "hnsw:construction_ef": construction_ef or os.environ.get("LAS_HNSW_CONSTRUCTION_EF"),
+        "hnsw:search_ef": search_ef or os.environ.get("LAS_HNSW_SEARCH_EF"),
+    }
+    params: Dict[str, object] = {}
+    for key, value in values.items():
+        if value in (None, ""):
+            continue
+        if key == "hnsw:space":
+            value = str(value).lower()
+            if value not in HNSW_SPACES:
+                raise ValueError(f"Unbekannter Distanz-Raum: {value} (erlaubt: {', '.join(HNSW_SPACES)})")
+        else:
+            value = int(value)
+            if value <= 0:
+                raise ValueError(f"{key} muss positiv sein: {value}")
+        params[key] = value
+    return params
+
+
+def effective_hnsw_params(metadata: Optional[dict]) -> Dict[str, object]:
+    """Tatsächliche HNSW-Parameter einer Collection (Metadaten, sonst ChromaDB-Default)."""
+    metadata = metadata or {}
+    return {key: metadata.get(key, default) for key, default in HNSW_DEFAULTS.items()}
+
+
+def check_hnsw_params(collection, params: Dict[str, object]) -> Dict[str, tuple]:
+    """
+    Vergleicht gewünschte Parameter mit einer bestehenden Collection und warnt
+    bei Abweichungen (sie lassen sich nachträglich nicht ändern).
+
+    Returns:
+        {key: (ist, soll)} für abweichende Parameter
+    """
+    actual = effective_hnsw_params(collection.metadata)
+    mismatch = {key: (actual[key], value) for key, value in params.items() if actual[key] != value}
+    if mismatch:
+        details = ", ".join(f"{key}={is_} (gewünscht {want})" for key, (is_, want) in mismatch.items())
+        logger.warning(
+            f"⚠️  Collection '{collection.name}' hat abweichende HNSW-Parameter: {details} – "
+            f"gelten nur beim Anlegen (Collection neu bauen)"
+        )
+    return mismatch
@@ -0,0 +1,160 @@
+"""
+Ingestion-Manifest für inkrementelles Re-Indexing.
+
+Pro Quelldokument wird festgehalten, mit welchem Inhalt (SHA-256), welchen
+Chunk-Parametern und welchem Embedding-Modell es indexiert wurde und welche
+Chunk-IDs dabei in der ChromaDB Collection entstanden sind. Damit kann ein
+Rebuild nur neue/geänderte Dateien verarbeiten und die Chunks gelöschter
+Dateien gezielt entfernen.
+
+Speicherort: <persist_directory>/ingest_manifest_<collection>.json
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_VERSION = 1
+
+
+class IngestManifest:
+    """
+    JSON-Manifest einer Collection: file_name → Hash, Chunk-Parameter,
+    Embedding-Modell und erzeugte Chunk-IDs.
+    """
+
+    def __init__(self, persist_directory: str, collection_name: str):
+        """
+        Args:
+            persist_directory: ChromaDB-Verzeichnis (Manifest liegt daneben)
+            collection_name: Name der Collection
+        """
+        self.path = Path(persist_directory) / f"ingest_manifest_{collection_name}.json"
+        self.collection_name = collection_name
+        self.embedding_model: Optional[str] = None
+        self.chunk_settings: Optional[dict] = None
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Lädt das Manifest (leer, falls nicht vorhanden oder ungültig)."""
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                logger.warning(f"⚠️  Manifest-Version {data.get('version')} unbekannt: {self.path} – ignoriere")
+                return
+            self.embedding_model = data.get("embedding_model")
+            self.chunk_settings = data.get("chunk_settings")
+            self.documents = data.get("documents", {})
+            logger.info(f"📒 Manifest geladen: {len(self.documents)} Dokumente ({self.path.name})")
+        except Exception as e:
+            logger.warning(f"⚠️  Manifest konnte nicht gelesen werden ({self.path}): {e} – starte leer")
+            self.documents = {}
+
+    def save(self) -> None:
+        """Schreibt das Manifest atomar (tmp-Datei + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "collection": self.collection_name,
+            "embedding_model": self.embedding_model,
+            "chunk_settings": self.chunk_settings,
+            "documents": self.documents,
+        }
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def is_compatible(self, embedding_model: str, chunk_settings: dict) -> bool:
+        """
+        True, wenn Embedding-Modell und Chunk-Konfiguration zum Manifest passen.
+
+        Die Empfehlungen pro Datei ("stats") zählen nicht dazu: Sie wachsen mit
+        jeder Ingestion und werden pro Datei über stale_chunk_params geprüft.
+        """
+        if not self.documents:
+            return True
+
+        def _global(settings: Optional[dict]) -> dict:
+            # JSON kennt keine Tupel → Vergleich über die JSON-Form
+            settings = json.loads(json.dumps(settings or {}))
+            settings.pop("stats", None)
+            return settings
+
+        return (
+            self.embedding_model == embedding_model
+            and _global(self.chunk_settings) == _global(chunk_settings)
+        )
+
+    def stale_chunk_params(self, chunk_params: Dict[str, tuple]) -> List[str]:
+        """Dateien, deren indexierte Chunk-Parameter nicht mehr der Empfehlung entsprechen."""
+        stale = []
+        for file_name, (chunk_size, overlap) in chunk_params.items():
+            entry = self.documents.get(file_name)
+            if entry is None:
+                continue
+            if (entry.get("chunk_size"), entry.get("overlap")) != (chunk_size, overlap):
+                stale.append(file_name)
+        return stale
+
+    def plan(self, file_hashes: Dict[str, str], force: bool = False) -> Dict[str, List[str]]:
+        """
+        Vergleicht die aktuellen Dateien mit dem Manifest.
+
+        Args:
+            file_hashes: {file_name: sha256} der aktuell vorhandenen Dateien
+            force: True = alle vorhandenen Dateien als geändert behandeln
+
+        Returns:
+            Dict mit Listen "added", "changed", "removed", "unchanged" (file_names)
+        """
+        plan = {"added": [], "changed": [], "removed": [], "unchanged": []}
+        for file_name, sha256 in file_hashes.items():
+            entry = self.documents.get(file_name)
+            if entry is None:
+                plan["added"].append(file_name)
+            elif force or entry.get("sha256") != sha256:
+                plan["changed"].append(file_name)
+            else:
+                plan["unchanged"].append(file_name)
+        plan["removed"] = [name for name in self.documents if name not in file_hashes]
+        return plan
+
+    def chunk_ids(self, file_name: str) -> List[str]:
+        """Chunk-IDs, die für eine Datei zuletzt indexiert wurden."""
+        return list(self.documents.get(file_name, {}).get("chunk_ids", []))
+
+    def record(
+        self,
+        file_name: str,
+        source: str,
+        sha256: str,
+        chunk_size: Optional[int],
+        overlap: Optional[int],
+        embedding_model: str,
+        chunk_ids: List[str],
+    ) -> None:
+        """Trägt das Indexierungs-Ergebnis einer Datei ein."""
+        self.documents[file_name] = {
+            "source": source,
+            "sha256": sha256,
+            "chunk_size": chunk_size,
+            "overlap": overlap,
+            "embedding_model": embedding_model,
+            "chunk_ids": list(chunk_ids),
+            "indexed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def remove(self, file_name: str) -> None:
+        """Entfernt eine Datei aus dem Manifest."""
+        self.documents.pop(file_name, None)
@@ -0,0 +1,273 @@
+"""
+Überlappende Ingestion: Extraktion → Embedding → ChromaDB-Schreiben.
+
+Drei Stufen laufen gleichzeitig und sind über begrenzte Queues verbunden:
+
+    [Extraktion]  Chunks aus einem Generator (z.B. LicenseVectorStore.iter_chunks,
+                  intern mit Process-Pool) → Batches fester Größe
+         │ embed_queue (maxsize)
+    [Embedding]   Metadaten bereinigen, IDs vergeben, BGE-Encode
+         │ write_queue (maxsize)
+    [Writer]      collection.add
+
+Während BGE einen Batch kodiert, parst die Extraktion schon die nächsten
+Dateien und der Writer schreibt den vorherigen Batch. Die begrenzten Queues
+halten den Speicher konstant (Backpressure). Pro Stufe werden Durchsatz und
+Queue-Füllstand protokolliert, damit der Engpass sichtbar wird.
+
+Verwendung:
+    pipeline = StagedIngestPipeline(vectorstore, batch_size=256, queue_size=4)
+    ids_by_file = pipeline.run(vectorstore.iter_chunks(files, workers=4))
+    pipeline.report()
+"""
+
+from typing import Dict, Any, List, Iterable, Optional
+import logging
+import os
+import queue
+import threading
+import time
+import types
+
+logger = logging.getLogger(__name__)
+
+
+# Ende-Markierung in den Queues
+_DONE = object()
+
+
+class _StageStats:
+    """Zähler einer Pipeline-Stufe (Durchsatz, Arbeits- und Wartezeit, Queue-Füllstand)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.chunks = 0
+        self.busy_s = 0.0
+        self.wait_s = 0.0
+        self.queue_samples = 0
+        self.queue_sum = 0
+        self.queue_max = 0
+
+    def sample_queue(self, q: queue.Queue) -> None:
+        size = q.qsize()
+        self.queue_samples += 1
+        self.queue_sum += size
+        self.queue_max = max(self.queue_max, size)
+
+    def as_dict(self, queue_capacity: Optional[int] = None) -> Dict[str, Any]:
+        avg_queue = self.queue_sum / self.queue_samples if self.queue_samples else 0.0
+        return {
+            "batches": self.batches,
+            "chunks": self.chunks,
+            "busy_s": round(self.busy_s, 3),
+            "wait_s": round(self.wait_s, 3),
+            "chunks_per_s": round(self.chunks / self.busy_s, 1) if self.busy_s > 0 else 0.0,
+            "queue_avg": round(avg_queue, 2),
+            "queue_max": self.queue_max,
+            "queue_capacity": queue_capacity,
+        }
+
+
+class StagedIngestPipeline:
+    """
+    Dreistufige Ingestion mit begrenzten Queues zwischen Extraktion,
+    Embedding-Worker und Writer-Thread.
+    """
+
+    def __init__(
+        self,
+        vectorstore,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            vectorstore: LicenseVectorStore (liefert Embedding + Collection)
+            batch_size: Chunks pro Embedding-Batch (Default: LAS_STREAM_BATCH_SIZE oder 256)
+            queue_size: Max. Batches pro Queue (Default: LAS_PIPELINE_QUEUE_SIZE oder 4)
+        """
+        if batch_size is None:
+            batch_size = int(os.environ.get("LAS_STREAM_BATCH_SIZE", "256"))
+        if queue_size is None:
+            queue_size = int(os.environ.get("LAS_PIPELINE_QUEUE_SIZE", "4"))
+
+        self.vectorstore = vectorstore
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.stats: Dict[str, Any] = {}
+
+    def _put(self, q: queue.Queue, item, stats: _StageStats, stop: threading.Event) -> bool:
+        """Blockierendes put mit Abbruch-Möglichkeit; misst die Wartezeit (Backpressure)."""
+        t0 = time.perf_counter()
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                stats.wait_s += time.perf_counter() - t0
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue, stats: _StageStats, stop: threading.Event):
+        """Blockierendes get mit Abbruch-Möglichkeit; misst die Wartezeit (Leerlauf)."""
+        t0 = time.perf_counter()
+        while not stop.is_set():
+            try:
+                stats.sample_queue(q)
+                item = q.get(timeout=0.1)
+                stats.wait_s += time.perf_counter() - t0
+                return item
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def run(self, documents: Iterable) -> Dict[str, List[str]]:
+        """
+        Führt die Pipeline aus, bis der Chunk-Generator erschöpft ist.
+
+        Args:
+            documents: Iterable/Generator von Chunks
+
+        Returns:
+            {file_name: [Chunk-IDs]} in Einfüge-Reihenfolge
+        """
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        extract_stats = _StageStats("extract")
+        embed_stats = _StageStats("embed")
+        write_stats = _StageStats("write")
+        ids_by_file: Dict[str, List[str]] = {}
+
+        def _extract() -> None:
+            iterator = None
+            try:
+                batch = []
+                iterator = iter(documents)
+                t0 = time.perf_counter()
+                for doc in iterator:
+                    batch.append(doc)
+                    if len(batch) >= self.batch_size:
+                        extract_stats.busy_s += time.perf_counter() - t0
+                        extract_stats.batches += 1
+                        extract_stats.chunks += len(batch)
+                        if not self._put(embed_queue, batch, extract_stats, stop):
+                            return
+                        batch = []
+                        t0 = time.perf_counter()
+                    if stop.is_set():
+                        return
+                extract_stats.busy_s += time.perf_counter() - t0
+                if batch:
+                    extract_stats.batches += 1
+                    extract_stats.chunks += len(batch)
+                    self._put(embed_queue, batch, extract_stats, stop)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                # Bei vorzeitigem Ende den Generator schließen (beendet z.B. den
+                # Process-Pool von iter_chunks), bevor run() zurückkehrt
+                if isinstance(iterator, types.GeneratorType):
+                    try:
+                        iterator.close()
+                    except BaseException as e:
+                        errors.append(e)
+                        stop.set()
+                self._put(embed_queue, _DONE, extract_stats, stop)
+
+        def _embed() -> None:
+            try:
+                while True:
+                    batch = self._get(embed_queue, embed_stats, stop)
+                    if batch is _DONE:
+                        break
+                    t0 = time.perf_counter()
+                    ids, texts, metadatas = self.vectorstore._prepare_documents(batch)
+                    embeddings = self.vectorstore.embed_texts(texts, is_query=False, show_progress_bar=False)
+                    file_names = [doc.metadata.get("file_name") for doc in batch]
+                    embed_stats.busy_s += time.perf_counter() - t0
+                    embed_stats.batches += 1
+                    embed_stats.chunks += len(batch)
+                    if not self._put(write_queue, (ids, embeddings, texts, metadatas, file_names), embed_stats, stop):
+                        return
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                self._put(write_queue, _DONE, embed_stats, stop)
+
+        def _write() -> None:
+            try:
+                while True:
+                    item = self._get(write_queue, write_stats, stop)
+                    if item is _DONE:
+                        break
+                    ids, embeddings, texts, metadatas, file_names = item
+                    t0 = time.perf_counter()
+                    self.vectorstore._write_batch(ids, embeddings, texts, metadatas)
+                    write_stats.busy_s += time.perf_counter() - t0
+                    write_stats.batches += 1
+                    write_stats.chunks += len(ids)
+                    for file_name, chunk_id in zip(file_names, ids):
+                        ids_by_file.setdefault(file_name, []).append(chunk_id)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        t_start = time.perf_counter()
+        threads = [
+            threading.Thread(target=_extract, name="las-extract", daemon=True),
+            threading.Thread(target=_embed, name="las-embed", daemon=True),
+            threading.Thread(target=_write, name="las-write", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_s = time.perf_counter() - t_start
+
+        stages = {
+            "extract": extract_stats.as_dict(),
+            "embed": embed_stats.as_dict(self.queue_size),
+            "write": write_stats.as_dict(self.queue_size),
+        }
+        bottleneck = max(stages, key=lambda name: stages[name]["busy_s"])
+        self.stats = {
+            "wall_s": round(wall_s, 3),
+            "chunks": write_stats.chunks,
+            "chunks_per_s": round(write_stats.chunks / wall_s, 1) if wall_s > 0 else 0.0,
+            "batch_size": self.batch_size,
+            "queue_size": self.queue_size,
+            "bottleneck": bottleneck,
+            "stages": stages,
+        }
+
+        if errors:
+            raise errors[0]
+
+        self.report()
+        return ids_by_file
+
+    def report(self) -> None:
+        """Loggt Durchsatz und Queue-Füllstand pro Stufe."""
+        if not self.stats:
+            return
+        logger.info(
+            f"⏱️  Pipeline: {self.stats['chunks']} Chunks in {self.stats['wall_s']:.1f}s "
+            f"({self.stats['chunks_per_s']} Chunks/s, Batch {self.batch_size}, Queue {self.queue_size})"
+        )
+        for name, st in self.stats["stages"].items():
+            # Queue-Füllstand wird von der konsumierenden Stufe gemessen (Eingangs-Queue)
+            queue_info = (
+                f" | Eingangs-Queue Ø {st['queue_avg']:.1f}/{st['queue_capacity']} (max {st['queue_max']})"
+                if st["queue_capacity"] else ""
+            )
+            logger.info(
+                f"   {name:8s}: {st['chunks']:6d} Chunks | busy {st['busy_s']:7.1f}s | "
+                f"wait {st['wait_s']:7.1f}s | {st['chunks_per_s']:8.1f} Chunks/s{queue_info}"
+            )
+        logger.info(f"   🐢 Engpass: {self.stats['bottleneck']}")
@@ -0,0 +1,241 @@
+"""
+Lexikalischer Index für Lizenz-Codes, Produktnamen und Schlüsselbegriffe.
+
+Viele Fragen nennen einen Lizenz-Code (L-XXXX-XXXXXX) oder ein Produkt aus
+product_mapping.csv wörtlich. Der Index ordnet beim Schreiben jedem Chunk
+seine Entitäten zu (invertiert: Entität → Chunk-IDs):
+
+    code:<L-XXXX-XXXXXX>  Metadaten license_code, Code im Text oder
+                          Produktname aus dem Mapping im Text
+    term:<PVU|RVU|UVU|ILMT>  Abkürzung oder ausgeschriebene Form im Text
+
+Query-Seite (analyze): Codes direkt bzw. über Produktnamen (voller Name oder
+ohne Versionsangabe), dazu die Schlüsselbegriffe. Nur exakte Treffer (Code
+wörtlich oder voller Produktname mit Version) leiten search() auf eine
+vorgefilterte Suche um (license_code $in Codes, kleiner Kandidaten-Pool);
+ein Produktname ohne Version ("WebSphere Application Server") ist oft nur
+Kontext. Der lexikalische Score (Summe der IDF aller getroffenen Entitäten)
+fließt als Bonus in Distanz und Rerank-Score ein.
+
+Persistenz: JSON pro Collection (lexical_index/<collection>.json),
+sync() gleicht mit der Collection ab (z.B. für vor dem Index gebaute Collections).
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+import json
+import logging
+import math
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+
+LICENSE_CODE_PATTERN = re.compile(r"\bL-[A-Z0-9]{4}-[A-Z0-9]{6}\b", re.IGNORECASE)
+
+# Schlüsselbegriff → Muster (Abkürzung und ausgeschriebene Form)
+KEY_TERMS = {
+    "PVU": re.compile(r"\bpvus?\b|processor value units?", re.IGNORECASE),
+    "RVU": re.compile(r"\brvus?\b|resource value units?", re.IGNORECASE),
+    "UVU": re.compile(r"\buvus?\b|user value units?", re.IGNORECASE),
+    "ILMT": re.compile(r"\bilmt\b|license metric tool", re.IGNORECASE),
+}
+
+# Versions-/Release-Anhänge am Ende von Produktnamen ("v5.1.1", "16.0", "- GA", "Update")
+_VERSION_SUFFIX = re.compile(r"(\s+(v?\d[\w.]*|ga|update))+$")
+
+
+def normalize_text(text: str) -> str:
+    """Kleinbuchstaben, Satzzeichen → Leerzeichen, mit Rand-Leerzeichen für Wortgrenzen."""
+    tokens = (t.strip(".") for t in re.sub(r"[^a-z0-9.]+", " ", text.lower()).split())
+    return " " + " ".join(t for t in tokens if t) + " "
+
+
+def product_name_variants(product_name: str) -> Set[str]:
+    """Normalisierte Schreibweisen eines Produktnamens (voll, ohne Version, ohne 'IBM')."""
+    full = normalize_text(product_name).strip()
+    variants = {full}
+    base = _VERSION_SUFFIX.sub("", full).strip()
+    if len(base.split()) >= 3:
+        variants.add(base)
+    for name in list(variants):
+        if name.startswith("ibm ") and len(name.split()) >= 4:
+            variants.add(name[4:])
+    return variants
+
+
+class QueryEntities:
+    """
+    Entitäten einer Query: Lizenz-Codes (direkt oder über Produktnamen), davon
+    exakt genannte (route_codes), und Schlüsselbegriffe.
+    """
+
+    def __init__(self, codes: Iterable[str] = (), terms: Iterable[str] = (), route_codes: Iterable[str] = ()):
+        self.codes = sorted(set(codes) | set(route_codes))
+        self.terms = sorted(set(terms))
+        self.route_codes = sorted(set(route_codes))
+
+    def keys(self) -> List[str]:
+        return [f"code:{c}" for c in self.codes] + [f"term:{t}" for t in self.terms]
+
+    def __bool__(self) -> bool:
+        return bool(self.codes or self.terms)
+
+    def __repr__(self) -> str:
+        return f"QueryEntities(codes={self.codes}, terms={self.terms}, route_codes={self.route_codes})"
+
+
+class LexicalIndex:
+    """Invertierter Index Entität → Chunk-IDs, persistiert als JSON."""
+
+    def __init__(self, path: Path, ibm_mapping: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        Args:
+            path: JSON-Datei des Index
+            ibm_mapping: Ergebnis von load_ibm_product_mapping (Produktnamen → Codes)
+        """
+        self.path = Path(path)
+        self.postings: Dict[str, Set[str]] = {}
+        self.chunk_entities: Dict[str, List[str]] = {}
+        self._dirty = False
+
+        # Produktname (alle Schreibweisen) → Lizenz-Codes; längste Namen zuerst prüfen
+        self.product_codes: Dict[str, Set[str]] = {}
+        self._full_names: Set[str] = set()
+        for code, info in (ibm_mapping or {}).items():
+            product_name = info.get("product_name", "")
+            self._full_names.add(normalize_text(product_name).strip())
+            for variant in product_name_variants(product_name):
+                if variant:
+                    self.product_codes.setdefault(variant, set()).add(code.upper())
+        self._product_names = sorted(self.product_codes, key=len, reverse=True)
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.chunk_entities)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.chunk_entities = {chunk_id: list(keys) for chunk_id, keys in data.get("chunks", {}).items()}
+        for chunk_id, keys in self.chunk_entities.items():
+            for key in keys:
+                self.postings.setdefault(key, set()).add(chunk_id)
+
+    def save(self) -> None:
+        """Schreibt den Index (atomar), falls seit dem letzten Speichern geändert."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"chunks": self.chunk_entities}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Analyse
+    # ------------------------------------------------------------------
+
+    def _codes_in(self, text: str) -> tuple:
+        """(alle Codes, exakte Codes): Code wörtlich bzw. über Produktnamen im Text."""
+        exact = {m.group(0).upper() for m in LICENSE_CODE_PATTERN.finditer(text)}
+        codes = set(exact)
+        normalized = normalize_text(text)
+        for name in self._product_names:
+            if f" {name} " in normalized:
+                codes |= self.product_codes[name]
+                if name in self._full_names:
+                    exact |= self.product_codes[name]
+        return codes, exact
+
+    def analyze(self, query: str) -> QueryEntities:
+        """Lizenz-Codes (direkt oder über Produktnamen) und Schlüsselbegriffe einer Query."""
+        codes, exact = self._codes_in(query)
+        terms = [term for term, pattern in KEY_TERMS.items() if pattern.search(query)]
+        return QueryEntities(codes, terms, route_codes=exact)
+
+    def chunk_keys(self, text: str, metadata: Optional[dict]) -> List[str]:
+        """Entitäten eines Chunks (Metadaten + Text)."""
+        codes, _ = self._codes_in(text)
+        license_code = (metadata or {}).get("license_code")
+        if license_code:
+            codes.add(str(license_code).upper())
+        keys = [f"code:{c}" for c in sorted(codes)]
+        keys.extend(f"term:{term}" for term, pattern in KEY_TERMS.items() if pattern.search(text))
+        return keys
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            self.remove([chunk_id])
+            keys = self.chunk_keys(text or "", metadata)
+            self.chunk_entities[chunk_id] = keys
+            for key in keys:
+                self.postings.setdefault(key, set()).add(chunk_id)
+        self._dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        for chunk_id in ids:
+            keys = self.chunk_entities.pop(chunk_id, None)
+            if keys is None:
+                continue
+            for key in keys:
+                posting = self.postings.get(key)
+                if posting is not None:
+                    posting.discard(chunk_id)
+                    if not posting:
+                        del self.postings[key]
+            self._dirty = True
+
+    def sync(self, collection, batch_size: int = 512) -> Dict[str, int]:
+        """
+        Gleicht den Index mit der Collection ab: fehlende Chunks aufnehmen,
+        verwaiste IDs entfernen, danach speichern.
+
+        Returns:
+            {"added": n, "removed": m}
+        """
+        main_ids = set(collection.get(include=[])["ids"])
+        orphans = set(self.chunk_entities) - main_ids
+        self.remove(orphans)
+
+        missing = sorted(main_ids - set(self.chunk_entities))
+        for start in range(0, len(missing), batch_size):
+            batch = collection.get(ids=missing[start:start + batch_size], include=["documents", "metadatas"])
+            self.add(batch["ids"], batch["documents"], batch["metadatas"])
+        self.save()
+
+        if missing or orphans:
+            logger.info(f"🔤 Lexikalischer Index: {len(missing)} ergänzt, {len(orphans)} entfernt")
+        return {"added": len(missing), "removed": len(orphans)}
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def idf(self, key: str) -> float:
+        df = len(self.postings.get(key, ()))
+        if df == 0:
+            return 0.0
+        return math.log(1.0 + len(self.chunk_entities) / df)
+
+    def score(self, chunk_id: str, entities: QueryEntities) -> float:
+        """Summe der IDF aller Query-Entitäten, die der Chunk enthält."""
+        own = self.chunk_entities.get(chunk_id)
+        if not own:
+            return 0.0
+        return sum(self.idf(key) for key in entities.keys() if key in own)
+
+    def annotate(self, results: List[dict], entities: QueryEntities) -> None:
+        """Setzt r["lexical_score"] (0–1, relativ zum besten Kandidaten der Query)."""
+        scores = [self.score(r["id"], entities) for r in results]
+        best = max(scores, default=0.0)
+        for r, s in zip(results, scores):
+            r["lexical_score"] = s / best if best > 0 else 0.0
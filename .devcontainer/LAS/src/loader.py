@@ -15,6 +15,8 @@ from langchain_community.document_loaders import (
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
+from file_discovery import FileDiscovery
+
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -165,31 +167,25 @@ class LicenseDocumentLoader:
         # Zähler für Statistik
         stats = {"pdf": 0, "markdown": 0, "docx": 0}
         
-        # PDFs laden
-        for pdf_file in directory.glob("**/*.pdf"):
-            chunks = self.load_single_pdf(pdf_file)
-            all_chunks.extend(chunks)
-            stats["pdf"] += 1
+        # Ein Scan für alle Typen (Endungen case-insensitiv, keine Duplikate)
+        discovery = FileDiscovery(directory, (".pdf", ".md", ".docx"), recursive=True)
+        discovery.scan()
         
-        for pdf_file in directory.glob("**/*.PDF"):  # Auch Großbuchstaben
+        # PDFs laden
+        for pdf_file in discovery.paths([".pdf"]):
             chunks = self.load_single_pdf(pdf_file)
             all_chunks.extend(chunks)
             stats["pdf"] += 1
         
         # Markdown laden
-        for md_file in directory.glob("**/*.md"):
+        for md_file in discovery.paths([".md"]):
             docs = self.load_markdown(md_file)
             chunks = self.text_splitter.split_documents(docs)
             all_chunks.extend(chunks)
             stats["markdown"] += 1
         
         # DOCX laden
-        for docx_file in directory.glob("**/*.docx"):
-            chunks = self.load_docx(docx_file)
-            all_chunks.extend(chunks)
-            stats["docx"] += 1
-        
-        for docx_file in directory.glob("**/*.DOCX"):  # Auch Großbuchstaben
+        for docx_file in discovery.paths([".docx"]):
             chunks = self.load_docx(docx_file)
             all_chunks.extend(chunks)
             stats["docx"] += 1
@@ -0,0 +1,190 @@
+"""
+Sekundärindex über Metadaten-Felder für vorgefilterte Suche.
+
+filter_metadata ging bisher als where-Klausel an Chroma, und die Suche holte
+trotzdem max(k, internal_k) Ergebnisse aus der ganzen Collection. Der Index
+ordnet jedem Wert von
+
+    manufacturer, license_code, language, file_name
+
+eine Bitmap der Chunk-Zeilen zu (Python-int als Bitmenge). Beim Schreiben
+fortgeschrieben, persistiert als JSON pro Collection (metadata_index/).
+
+resolve(where) wertet Filter auf diesen Feldern mit Chroma-Semantik aus
+(Literal, $eq/$ne/$in/$nin, $and/$or; ohne Schlüssel nur $ne/$nin) und
+liefert die passenden Chunk-IDs, oder None, wenn der Filter andere Felder
+oder Operatoren enthält (dann bleibt es bei der where-Klausel). search()
+bewertet dann nur diese Teilmenge und begrenzt den Kandidaten-Pool auf ihre
+Größe.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+INDEXED_FIELDS = ("manufacturer", "license_code", "language", "file_name")
+
+
+class MetadataIndex:
+    """Bitmaps Feld → Wert → Chunk-Zeilen, dazu Zeile ↔ Chunk-ID."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: JSON-Datei des Index
+        """
+        self.path = Path(path)
+        self.ids: List[Optional[str]] = []          # Zeile → Chunk-ID (None = frei)
+        self.row_of: Dict[str, int] = {}
+        self.values: Dict[str, Dict[str, object]] = {}  # Chunk-ID → indexierte Felder
+        self.bitmaps: Dict[str, Dict[object, int]] = {field: {} for field in INDEXED_FIELDS}
+        self.live = 0
+        self._free: List[int] = []
+        self._dirty = False
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for chunk_id, values in data.get("chunks", {}).items():
+            self._insert(chunk_id, values)
+
+    def save(self) -> None:
+        """Schreibt den Index (atomar), falls seit dem letzten Speichern geändert."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"chunks": self.values}, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Pflege
+    # ------------------------------------------------------------------
+
+    def _insert(self, chunk_id: str, values: Dict[str, object]) -> None:
+        row = self._free.pop() if self._free else len(self.ids)
+        if row == len(self.ids):
+            self.ids.append(chunk_id)
+        else:
+            self.ids[row] = chunk_id
+        self.row_of[chunk_id] = row
+        self.values[chunk_id] = values
+        bit = 1 << row
+        self.live |= bit
+        for field, value in values.items():
+            field_maps = self.bitmaps[field]
+            field_maps[value] = field_maps.get(value, 0) | bit
+
+    def add(self, ids: List[str], metadatas: List[dict]) -> None:
+        for chunk_id, metadata in zip(ids, metadatas):
+            self.remove([chunk_id])
+            metadata = metadata or {}
+            self._insert(chunk_id, {f: metadata[f] for f in INDEXED_FIELDS if metadata.get(f) is not None})
+        self._dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        for chunk_id in ids:
+            row = self.row_of.pop(chunk_id, None)
+            if row is None:
+                continue
+            bit = 1 << row
+            for field, value in self.values.pop(chunk_id).items():
+                remaining = self.bitmaps[field][value] & ~bit
+                if remaining:
+                    self.bitmaps[field][value] = remaining
+                else:
+                    del self.bitmaps[field][value]
+            self.live &= ~bit
+            self.ids[row] = None
+            self._free.append(row)
+            self._dirty = True
+
+    def sync(self, collection, batch_size: int = 2048) -> Dict[str, int]:
+        """
+        Gleicht den Index mit der Collection ab (nur Metadaten, keine Vektoren),
+        danach speichern.
+
+        Returns:
+            {"added": n, "removed": m}
+        """
+        main_ids = set(collection.get(include=[])["ids"])
+        orphans = set(self.row_of) - main_ids
+        self.remove(orphans)
+
+        missing = sorted(main_ids - set(self.row_of))
+        for start in range(0, len(missing), batch_size):
+            batch = collection.get(ids=missing[start:start + batch_size], include=["metadatas"])
+            self.add(batch["ids"], batch["metadatas"])
+        self.save()
+
+        if missing or orphans:
+            logger.info(f"🏷️  Metadaten-Index: {len(missing)} ergänzt, {len(orphans)} entfernt")
+        return {"added": len(missing), "removed": len(orphans)}
+
+    # ------------------------------------------------------------------
+    # Abfrage
+    # ------------------------------------------------------------------
+
+    def _equal(self, field: str, value: object) -> int:
+        return self.bitmaps[field].get(value, 0)
+
+    def _bitmap(self, where: dict) -> Optional[int]:
+        """Bitmap für den where-Filter; None = nicht vollständig über den Index auswertbar."""
+        result = self.live
+        for key, expr in where.items():
+            if key in ("$and", "$or"):
+                parts = [self._bitmap(w) for w in expr]
+                if any(p is None for p in parts):
+                    return None
+                combined = 0 if key == "$or" else self.live
+                for part in parts:
+                    combined = combined | part if key == "$or" else combined & part
+                result &= combined
+                continue
+            if key not in INDEXED_FIELDS:
+                return None
+            op, expected = next(iter(expr.items())) if isinstance(expr, dict) else ("$eq", expr)
+            if op == "$eq":
+                result &= self._equal(key, expected)
+            elif op == "$ne":
+                result &= self.live & ~self._equal(key, expected)
+            elif op in ("$in", "$nin"):
+                hits = 0
+                for value in expected:
+                    hits |= self._equal(key, value)
+                result &= hits if op == "$in" else self.live & ~hits
+            else:
+                return None
+        return result
+
+    def resolve(self, where: Optional[dict]) -> Optional[List[str]]:
+        """
+        Chunk-IDs, die den where-Filter erfüllen.
+
+        Returns:
+            Liste der IDs, oder None wenn kein Filter bzw. nicht über den Index auswertbar
+        """
+        if not where:
+            return None
+        bitmap = self._bitmap(where)
+        if bitmap is None:
+            return None
+        if not bitmap:
+            return []
+        raw = np.frombuffer(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        rows = np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+        return [self.ids[row] for row in rows]
@@ -0,0 +1,127 @@
+"""
+Gewichte in reduzierter Genauigkeit (bfloat16/float16) für Embedding-Modell und
+CrossEncoder.
+
+float32-Gewichte belegen doppelt so viel Speicher und Speicherbandbreite wie
+nötig. Mit LAS_MODEL_DTYPE=bfloat16|float16 (bzw. Parameter model_dtype von
+LicenseVectorStore) werden die Gewichte nach dem Laden umgewandelt.
+
+Fallback auf float32, wenn
+- die CPU den Datentyp nicht nativ unterstützt (avx512_bf16/amx_bf16 bzw.
+  avx512_fp16/amx_fp16, ARM: bf16 bzw. asimdhp), sonst wäre es langsamer als
+  float32; LAS_MODEL_DTYPE_FORCE=1 überspringt diese Prüfung
+- ein Probe-Forward-Pass im Ziel-Datentyp fehlschlägt
+
+Ausgaben (Embeddings, Logits) werden per Forward-Hook nach float32 gewandelt,
+damit .numpy() und alle nachgelagerten Schritte unverändert bleiben.
+Den Vergleich mit float32 (Durchsatz, Speicher, Retrieval) misst
+compare_embedding_backends.py --dtype.
+"""
+
+from typing import Optional
+import functools
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+MODEL_DTYPES = ("float32", "bfloat16", "float16")
+
+# CPU-Flags (/proc/cpuinfo) mit nativer Unterstützung pro Datentyp
+_CPU_FLAGS = {
+    "bfloat16": ("avx512_bf16", "amx_bf16", "bf16"),
+    "float16": ("avx512_fp16", "amx_fp16", "asimdhp", "fphp"),
+}
+
+
+def resolve_model_dtype(dtype: Optional[str] = None) -> str:
+    """Gewichts-Datentyp aus Parameter oder LAS_MODEL_DTYPE (Default: float32)."""
+    if dtype is None:
+        dtype = os.environ.get("LAS_MODEL_DTYPE", "float32")
+    dtype = dtype.strip().lower()
+    dtype = {"bf16": "bfloat16", "fp16": "float16", "half": "float16", "fp32": "float32"}.get(dtype, dtype)
+    if dtype not in MODEL_DTYPES:
+        raise ValueError(f"Unbekannter Modell-Datentyp: {dtype} (erlaubt: {', '.join(MODEL_DTYPES)})")
+    return dtype
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_flags() -> frozenset:
+    flags = set()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                key = line.split(":", 1)[0].strip().lower()
+                if key in ("flags", "features"):
+                    flags.update(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return frozenset(flags)
+
+
+def cpu_supports_dtype(dtype: str) -> bool:
+    """True, wenn die CPU den Datentyp nativ rechnet (float32 immer)."""
+    if dtype == "float32":
+        return True
+    return any(flag in _cpu_flags() for flag in _CPU_FLAGS[dtype])
+
+
+def _module_device(module) -> str:
+    try:
+        return str(next(module.parameters()).device)
+    except (StopIteration, AttributeError):
+        return "cpu"
+
+
+def _to_float32_hook(module, inputs, output):
+    # SentenceTransformer-Module liefern ein Feature-Dict, HF-Modelle ein ModelOutput
+    if isinstance(output, dict):
+        for key in ("sentence_embedding", "token_embeddings", "logits"):
+            value = output.get(key)
+            if value is not None and hasattr(value, "float"):
+                output[key] = value.float()
+    return output
+
+
+def apply_model_dtype(model, dtype: str, probe=None, label: str = "") -> str:
+    """
+    Wandelt die Gewichte von model in dtype um (inplace).
+
+    Args:
+        model: torch-Modul (SentenceTransformer oder CrossEncoder.model)
+        dtype: Eines von MODEL_DTYPES
+        probe: Optional Funktion ohne Argumente, die einen Forward-Pass ausführt
+        label: Modellname für das Log
+
+    Returns:
+        Tatsächlich verwendeter Datentyp (float32 nach Fallback)
+    """
+    dtype = resolve_model_dtype(dtype)
+    if dtype == "float32":
+        return dtype
+
+    on_cpu = _module_device(model).startswith("cpu")
+    force = os.environ.get("LAS_MODEL_DTYPE_FORCE", "0") == "1"
+    if on_cpu and not force and not cpu_supports_dtype(dtype):
+        logger.warning(f"⚠️  CPU ohne native {dtype}-Unterstützung → {label} bleibt float32")
+        return "float32"
+
+    import torch
+
+    model.to(getattr(torch, dtype))
+    # Letztes Modul (SentenceTransformer) bzw. ganzes HF-Modell: Ausgabe als float32
+    last = model[-1] if isinstance(model, torch.nn.Sequential) and len(model) else model
+    handle = last.register_forward_hook(_to_float32_hook)
+
+    if probe is not None:
+        try:
+            probe()
+        except (RuntimeError, TypeError) as e:
+            handle.remove()
+            model.to(torch.float32)
+            logger.warning(f"⚠️  {dtype} für {label} nicht lauffähig ({e}) → float32")
+            return "float32"
+
+    logger.info(f"⚙️  Gewichte {label}: {dtype}")
+    return dtype
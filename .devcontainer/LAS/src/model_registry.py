@@ -0,0 +1,240 @@
+"""
+Prozessweite Registry für Embedding- und Reranker-Modelle.
+
+Jede LicenseVectorStore-Instanz hat bisher ihr eigenes SentenceTransformer-
+Modell geladen (BGE-large ≈ 1.3 GB). debug_fixed.py baut drei Instanzen, also
+drei Kopien. Jetzt wird jedes Modell einmal pro (Typ, Name, Variante, Device)
+geladen und von allen Instanzen geteilt:
+
+    get_embedding_model(name, backend)   SentenceTransformer (Variante = Backend + Datentyp)
+    get_cross_encoder(name)              CrossEncoder für Reranking (Variante = Datentyp)
+    memory_report() / log_memory_report()  Geladene Modelle + Speicherbedarf
+    unload(name=None)                    Modelle aus der Registry entfernen
+
+Die Variante enthält den tatsächlich verwendeten Datentyp: Fällt
+bfloat16/float16 auf float32 zurück (CPU ohne native Unterstützung, Probe
+fehlgeschlagen), teilt sich die Anfrage das float32-Modell, statt eine zweite
+identische Kopie zu laden.
+
+Nach unload() laden neue Instanzen das Modell neu; bestehende Instanzen
+behalten ihre Referenz, bis sie freigegeben werden.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import gc
+import logging
+import os
+import threading
+import time
+
+from embedding_backend import load_embedding_model
+from model_precision import apply_model_dtype, cpu_supports_dtype, resolve_model_dtype
+
+logger = logging.getLogger(__name__)
+
+
+# (Typ, Name, Variante, Device) → {"model", "loaded_at", "load_s", "hits"}
+_MODELS: Dict[Tuple[str, str, str, str], dict] = {}
+# Angefragter → tatsächlicher Schlüssel, wenn der Datentyp erst beim Laden zurückfiel
+_ALIASES: Dict[Tuple[str, str, str, str], Tuple[str, str, str, str]] = {}
+_LOCK = threading.Lock()
+
+
+def _get_or_load(key: Tuple[str, str, str, str], loader, effective_key=None):
+    """
+    Modell aus der Registry oder über loader() laden.
+
+    Args:
+        effective_key: Optional Funktion model → Schlüssel mit dem tatsächlich
+                       verwendeten Datentyp (Fallback beim Laden)
+    """
+    # Laden unter dem Lock: parallele Instanzen warten statt doppelt zu laden
+    with _LOCK:
+        key = _ALIASES.get(key, key)
+        entry = _MODELS.get(key)
+        if entry is not None:
+            entry["hits"] += 1
+            return entry["model"]
+        t0 = time.perf_counter()
+        model = loader()
+        actual = effective_key(model) if effective_key is not None else key
+        if actual != key:
+            _ALIASES[key] = actual
+            entry = _MODELS.get(actual)
+            if entry is not None:
+                # Fallback auf eine schon geladene Variante → neue Kopie verwerfen
+                entry["hits"] += 1
+                logger.info(f"🗂️  Model-Registry: {key[0]} {key[1]} ({key[2]} → {actual[2]}) geteilt")
+                return entry["model"]
+        _MODELS[actual] = {
+            "model": model,
+            "loaded_at": time.time(),
+            "load_s": time.perf_counter() - t0,
+            "hits": 0,
+        }
+        logger.info(f"🗂️  Model-Registry: {actual[0]} {actual[1]} ({actual[2]}, {actual[3]}) geladen")
+        return model
+
+
+def model_variant(base: str, dtype: str) -> str:
+    return base if dtype == "float32" else f"{base}+{dtype}"
+
+
+def _expected_dtype(dtype: str, device: Optional[str]) -> str:
+    """Datentyp nach dem absehbaren CPU-Fallback von apply_model_dtype (ohne zu laden)."""
+    if dtype == "float32" or cpu_supports_dtype(dtype) or os.environ.get("LAS_MODEL_DTYPE_FORCE", "0") == "1":
+        return dtype
+    if device is None:
+        try:
+            import torch
+            on_cpu = not torch.cuda.is_available()
+        except ImportError:
+            on_cpu = True
+    else:
+        on_cpu = device.startswith("cpu")
+    return "float32" if on_cpu else dtype
+
+
+def get_embedding_model(
+    model_name: str, backend: str = "torch", device: Optional[str] = None, dtype: str = "float32"
+):
+    """
+    Geteiltes Embedding-Modell (siehe embedding_backend.load_embedding_model).
+
+    Args:
+        model_name: Hugging Face Model-Name
+        backend: Eines von embedding_backend.EMBEDDING_BACKENDS
+        device: z.B. "cpu"/"cuda" (Default: automatisch)
+        dtype: Gewichts-Datentyp (siehe model_precision.py)
+    """
+    dtype = _expected_dtype(resolve_model_dtype(dtype), "cpu" if backend == "torch-int8" else device)
+    key = ("embedding", model_name, model_variant(backend, dtype), device or "auto")
+    return _get_or_load(
+        key,
+        lambda: load_embedding_model(model_name, backend, device=device, dtype=dtype),
+        lambda model: key[:2] + (model_variant(backend, model.las_model_dtype),) + key[3:],
+    )
+
+
+def _load_cross_encoder(model_name: str, device: Optional[str], dtype: str):
+    from sentence_transformers import CrossEncoder
+
+    model = CrossEncoder(model_name, device=device)
+    model.las_model_dtype = apply_model_dtype(
+        model.model, dtype, probe=lambda: model.predict([("probe", "probe")]), label=model_name
+    )
+    return model
+
+
+def get_cross_encoder(model_name: str, device: Optional[str] = None, dtype: str = "float32"):
+    """Geteilter CrossEncoder (Reranking)."""
+    dtype = _expected_dtype(resolve_model_dtype(dtype), device)
+    key = ("cross-encoder", model_name, model_variant("default", dtype), device or "auto")
+    return _get_or_load(
+        key,
+        lambda: _load_cross_encoder(model_name, device, dtype),
+        lambda model: key[:2] + (model_variant("default", model.las_model_dtype),) + key[3:],
+    )
+
+
+def _tensor_bytes(value) -> int:
+    # state_dict quantisierter Schichten enthält (weight, bias)-Tupel
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    if hasattr(value, "element_size") and hasattr(value, "numel"):
+        return value.numel() * value.element_size()
+    return 0
+
+
+def _model_bytes(model) -> int:
+    """Größe aller Gewichte/Buffer (torch-Modul; CrossEncoder über .model)."""
+    module = getattr(model, "model", model)
+    state_dict = getattr(module, "state_dict", None)
+    if state_dict is None:
+        return 0
+    try:
+        return sum(_tensor_bytes(v) for v in state_dict().values())
+    except Exception:
+        return 0
+
+
+def _process_rss_mb() -> Optional[float]:
+    """Aktueller Resident Set Size des Prozesses (nur Linux, sonst None)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def memory_report() -> List[dict]:
+    """
+    Geladene Modelle mit Speicherbedarf der Gewichte.
+
+    Returns:
+        Liste von {kind, name, variant, device, size_mb, load_s, shared_hits}
+    """
+    with _LOCK:
+        items = list(_MODELS.items())
+    return [
+        {
+            "kind": kind,
+            "name": name,
+            "variant": variant,
+            "device": device,
+            "size_mb": round(_model_bytes(entry["model"]) / (1024 * 1024), 1),
+            "load_s": round(entry["load_s"], 2),
+            "shared_hits": entry["hits"],
+        }
+        for (kind, name, variant, device), entry in items
+    ]
+
+
+def log_memory_report() -> None:
+    """Schreibt memory_report() und den Prozess-RSS ins Log."""
+    report = memory_report()
+    total = sum(row["size_mb"] for row in report)
+    rss = _process_rss_mb()
+    rss_text = f", Prozess-RSS {rss:.0f} MB" if rss is not None else ""
+    logger.info(f"🗂️  Model-Registry: {len(report)} Modelle, {total:.0f} MB Gewichte{rss_text}")
+    for row in report:
+        logger.info(
+            f"   {row['kind']:<13} {row['name']} ({row['variant']}, {row['device']}): "
+            f"{row['size_mb']:.0f} MB, {row['shared_hits']}× geteilt"
+        )
+
+
+def unload(model_name: Optional[str] = None, kind: Optional[str] = None) -> int:
+    """
+    Entfernt Modelle aus der Registry.
+
+    Args:
+        model_name: Nur Modelle mit diesem Namen (Default: alle)
+        kind: Nur "embedding" oder "cross-encoder" (Default: beide)
+
+    Returns:
+        Anzahl entfernter Modelle
+    """
+    with _LOCK:
+        keys = [
+            key for key in _MODELS
+            if (model_name is None or key[1] == model_name) and (kind is None or key[0] == kind)
+        ]
+        for key in keys:
+            del _MODELS[key]
+        for alias, target in list(_ALIASES.items()):
+            if target in keys:
+                del _ALIASES[alias]
+    if keys:
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        logger.info(f"🗂️  Model-Registry: {len(keys)} Modelle entladen")
+    return len(keys)
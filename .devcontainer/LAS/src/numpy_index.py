@@ -0,0 +1,277 @@
+"""
+Exakte Suche im Arbeitsspeicher als Alternative zu collection.query().
+
+Die Collections haben einige tausend 1024-d Chunks. Dafür ist ein
+Matrix-Produkt über eine zusammenhängende float32-Matrix schneller als ein
+HNSW-Aufruf über Chroma (inkl. Serialisierung der Ergebnisse).
+
+NumpyIndex lädt einmal alle Vektoren der Collection in eine ausgerichtete
+Matrix (64 Byte) mit paralleler Tabelle aus IDs, Texten und Metadaten und
+beantwortet Queries mit vektorisiertem Top-k (argpartition). Distanzen wie
+ChromaDB/hnswlib im Raum der Collection (l2/cosine/ip).
+
+filter_metadata wird mit derselben Semantik wie Chromas where ausgewertet:
+Literal bzw. $eq/$ne/$gt/$gte/$lt/$lte/$in/$nin sowie $and/$or. Wie bei
+Chroma erfüllen Chunks ohne den Schlüssel nur $ne/$nin, und Werte werden nur
+innerhalb derselben Art (Zahl, Bool, String) verglichen.
+
+Aktivierung: LAS_SEARCH_BACKEND=numpy (Default: chroma) bzw. Parameter
+search_backend von LicenseVectorStore.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+SEARCH_BACKENDS = ("chroma", "numpy")
+_ALIGNMENT = 64
+_MASK_CACHE_SIZE = 64
+
+
+def aligned_empty(shape: tuple, dtype=np.float32, alignment: int = _ALIGNMENT) -> np.ndarray:
+    """Leeres C-zusammenhängendes Array, dessen Daten auf alignment Bytes ausgerichtet sind."""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buffer = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = (-buffer.ctypes.data) % alignment
+    return buffer[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
+def top_k(distances: np.ndarray, n: int) -> tuple:
+    """
+    Top-n kleinste Distanzen pro Zeile (argpartition + Sortierung nur der Top-n).
+
+    Returns:
+        (Spalten-Indizes, Distanzen), je [Queries, n], aufsteigend
+    """
+    n = min(n, distances.shape[1])
+    if n < distances.shape[1]:
+        top = np.argpartition(distances, n - 1, axis=1)[:, :n]
+    else:
+        top = np.broadcast_to(np.arange(n), (distances.shape[0], n))
+    top_d = np.take_along_axis(distances, top, axis=1)
+    order = np.argsort(top_d, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_d, order, axis=1)
+
+
+# ============================================================================
+# WHERE-FILTER (Chroma-Semantik)
+# ============================================================================
+
+def _kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "str"
+
+
+def _compare(actual: Any, op: str, expected: Any) -> bool:
+    """Ein Operator für einen vorhandenen Metadaten-Wert."""
+    if op in ("$in", "$nin"):
+        hit = any(_kind(actual) == _kind(v) and actual == v for v in expected)
+        return hit if op == "$in" else not hit
+    same_kind = _kind(actual) == _kind(expected)
+    if op == "$eq":
+        return same_kind and actual == expected
+    if op == "$ne":
+        return not (same_kind and actual == expected)
+    if not same_kind or _kind(expected) != "number":
+        return False
+    if op == "$gt":
+        return actual > expected
+    if op == "$gte":
+        return actual >= expected
+    if op == "$lt":
+        return actual < expected
+    if op == "$lte":
+        return actual <= expected
+    raise ValueError(f"Unbekannter where-Operator: {op}")
+
+
+def matches_where(metadata: Optional[dict], where: Optional[dict]) -> bool:
+    """True, wenn metadata den Chroma-where-Filter erfüllt (None = kein Filter)."""
+    if not where:
+        return True
+    metadata = metadata or {}
+    for key, expr in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, w) for w in expr):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, w) for w in expr):
+                return False
+        else:
+            op, expected = next(iter(expr.items())) if isinstance(expr, dict) else ("$eq", expr)
+            if key not in metadata or metadata[key] is None:
+                if op not in ("$ne", "$nin"):
+                    return False
+            elif not _compare(metadata[key], op, expected):
+                return False
+    return True
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class NumpyIndex:
+    """Alle Vektoren einer Collection als Matrix im Speicher, exakte Top-k-Suche."""
+
+    def __init__(self, collection, batch_size: int = 2048):
+        """
+        Args:
+            collection: chromadb Collection (Quelle der Vektoren und Metadaten)
+            batch_size: Chunks pro collection.get() beim Laden
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.space = (collection.metadata or {}).get("hnsw:space", "l2")
+        self.ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[dict] = []
+        self.matrix = aligned_empty((0, 0))
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._masks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def invalidate(self) -> None:
+        """Markiert den Index als veraltet; der nächste query() lädt neu."""
+        self._loaded = False
+
+    def load(self) -> None:
+        """Lädt Vektoren, Texte und Metadaten der Collection (seitenweise)."""
+        t0 = time.perf_counter()
+        total = self.collection.count()
+        ids: List[str] = []
+        documents: List[Optional[str]] = []
+        metadatas: List[dict] = []
+        matrix = None
+        for offset in range(0, total, self.batch_size):
+            batch = self.collection.get(
+                include=["embeddings", "documents", "metadatas"],
+                limit=self.batch_size,
+                offset=offset,
+            )
+            if not batch["ids"]:
+                break
+            vectors = np.asarray(batch["embeddings"], dtype=np.float32)
+            if matrix is None:
+                matrix = aligned_empty((total, vectors.shape[1]))
+            matrix[len(ids):len(ids) + len(vectors)] = vectors
+            ids.extend(batch["ids"])
+            documents.extend(batch["documents"])
+            metadatas.extend(m or {} for m in batch["metadatas"])
+
+        self.ids, self.documents, self.metadatas = ids, documents, metadatas
+        self._row_of = {chunk_id: row for row, chunk_id in enumerate(ids)}
+        self.matrix = matrix[:len(ids)] if matrix is not None else aligned_empty((0, 0))
+        if self.space == "cosine":
+            # Einmal normalisieren → Kosinus = Skalarprodukt
+            norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+            self.matrix /= np.maximum(norms, 1e-12)
+        self._sq_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self._masks.clear()
+        self._loaded = True
+        logger.info(
+            f"🧮 NumPy-Index: {len(ids)} Vektoren × {self.matrix.shape[1] if ids else 0} "
+            f"({self.matrix.nbytes / 1e6:.1f} MB, {self.space}) in {time.perf_counter() - t0:.2f}s"
+        )
+
+    def ensure_loaded(self) -> None:
+        """Lädt beim ersten Zugriff bzw. wenn sich die Anzahl in der Collection geändert hat."""
+        if not self._loaded or self.collection.count() != len(self.ids):
+            self.load()
+
+    def _where_mask(self, where: dict) -> np.ndarray:
+        key = json.dumps(where, sort_keys=True, default=str)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.fromiter((matches_where(m, where) for m in self.metadatas), dtype=bool, count=len(self.metadatas))
+            self._masks[key] = mask
+            if len(self._masks) > _MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        else:
+            self._masks.move_to_end(key)
+        return mask
+
+    def distances(self, query_vectors: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distanzmatrix [Queries, Chunks] im Raum der Collection (optional nur für rows)."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        queries = np.ascontiguousarray(query_vectors, dtype=np.float32)
+        if self.space == "cosine":
+            queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = queries @ matrix.T
+        if self.space == "l2":
+            # |x - q|² = |x|² - 2x·q + |q|² (quadriert wie hnswlib)
+            sq_norms = self._sq_norms if rows is None else self._sq_norms[rows]
+            q_sq = np.einsum("ij,ij->i", queries, queries)[:, None]
+            return np.maximum(sq_norms[None, :] - 2.0 * scores + q_sq, 0.0)
+        if self.space in ("cosine", "ip"):
+            return 1.0 - scores
+        raise ValueError(f"Unbekannter Distanz-Raum: {self.space}")
+
+    def query(
+        self,
+        query_vectors: np.ndarray,
+        n_results: int,
+        where: Optional[dict] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Exakte Top-n pro Query-Vektor.
+
+        Args:
+            where: Chroma-where-Filter auf die Metadaten
+            ids: Optional nur diese Chunks bewerten (z.B. aus dem Metadaten-Index)
+
+        Returns:
+            Pro Query eine Liste {id, text, metadata, distance}, aufsteigend nach Distanz
+        """
+        self.ensure_loaded()
+        n_queries = len(query_vectors)
+        if not self.ids:
+            return [[] for _ in range(n_queries)]
+
+        if ids is not None:
+            # Nur die Teilmenge bewerten: Zeilen auswählen statt alles zu maskieren
+            rows = np.fromiter((self._row_of[i] for i in ids if i in self._row_of), dtype=np.intp)
+            if where:
+                rows = rows[self._where_mask(where)[rows]]
+            if not len(rows):
+                return [[] for _ in range(n_queries)]
+            distances = self.distances(query_vectors, rows)
+        else:
+            rows = None
+            distances = self.distances(query_vectors)
+            if where:
+                distances[:, ~self._where_mask(where)] = np.inf
+
+        top, top_d = top_k(distances, n_results)
+        if rows is not None:
+            top = rows[top]
+
+        results = []
+        for query_rows, dists in zip(top, top_d):
+            results.append([
+                {
+                    "id": self.ids[row],
+                    "text": self.documents[row],
+                    "metadata": self.metadatas[row],
+                    "distance": float(dist),
+                }
+                for row, dist in zip(query_rows, dists)
+                if np.isfinite(dist)
+            ])
+        return results
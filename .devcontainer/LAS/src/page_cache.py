@@ -0,0 +1,124 @@
+"""
+Persistenter Cache für extrahierte Seiten-Texte.
+
+Chunk-Experimente (Fixed 400/100 vs. adaptive Stufen) müssen die PDFs dann
+nicht erneut parsen: Der Cache liefert die Seiten-Texte und -Metadaten direkt
+aus einer memory-mappbaren Datei.
+
+Schlüssel: SHA-256 des Dateiinhalts + EXTRACTOR_VERSION
+Speicherort (Default): data/page_cache/ (neben data/chroma_db)
+
+Dateiformat (<sha256>_v<version>.pages):
+    8 Bytes  Magic  b"LASPAGE1"
+    4 Bytes  Header-Länge (uint32, little endian)
+    n Bytes  Header (JSON, UTF-8): file_type, word_count, pages=[{offset, length, metadata}]
+    Rest     UTF-8-Texte aller Seiten hintereinander (Offsets relativ zum Blob-Start)
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Optional
+import json
+import logging
+import mmap
+import os
+import struct
+
+from langchain.schema import Document
+
+logger = logging.getLogger(__name__)
+
+
+_MAGIC = b"LASPAGE1"
+_HEADER_LEN = struct.Struct("<I")
+
+
+class PageTextCache:
+    """Datei-basierter Cache: (Content-Hash, Extractor-Version) → extrahierte Seiten."""
+
+    def __init__(self, cache_dir: str, extractor_version: int):
+        """
+        Args:
+            cache_dir: Verzeichnis für die Cache-Dateien
+            extractor_version: Version der Extraktion (Teil des Schlüssels)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.extractor_version = extractor_version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, file_hash: str) -> Path:
+        return self.cache_dir / f"{file_hash}_v{self.extractor_version}.pages"
+
+    def get(self, file_hash: str, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Liefert das Extraktions-Ergebnis aus dem Cache oder None.
+
+        Args:
+            file_hash: SHA-256 des Dateiinhalts
+            file_path: Aktueller Pfad der Datei (für file_name und "source")
+
+        Returns:
+            Dict im Format von extract_document oder None bei Cache-Miss
+        """
+        path = self._path(file_hash)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(_MAGIC)] != _MAGIC:
+                    raise ValueError("ungültige Cache-Datei")
+                pos = len(_MAGIC)
+                (header_len,) = _HEADER_LEN.unpack_from(mm, pos)
+                pos += _HEADER_LEN.size
+                header = json.loads(mm[pos:pos + header_len].decode("utf-8"))
+                blob_start = pos + header_len
+
+                pages = []
+                for page in header["pages"]:
+                    start = blob_start + page["offset"]
+                    text = mm[start:start + page["length"]].decode("utf-8")
+                    metadata = {"source": str(file_path), **page["metadata"]}
+                    pages.append(Document(page_content=text, metadata=metadata))
+        except Exception as e:
+            logger.warning(f"⚠️  Page-Cache defekt ({path.name}): {e} – extrahiere neu")
+            return None
+
+        return {
+            "file_name": Path(file_path).name,
+            "file_type": header["file_type"],
+            "pages": pages,
+            "word_count": header["word_count"],
+            "page_count": len(pages),
+        }
+
+    def put(self, file_hash: str, extracted: Dict[str, Any]) -> None:
+        """Schreibt ein Extraktions-Ergebnis atomar in den Cache."""
+        pages_meta = []
+        blobs = []
+        offset = 0
+        for page in extracted["pages"]:
+            data = page.page_content.encode("utf-8")
+            # "source" ist pfadabhängig und wird beim Lesen neu gesetzt
+            metadata = {k: v for k, v in page.metadata.items() if k != "source"}
+            pages_meta.append({"offset": offset, "length": len(data), "metadata": metadata})
+            blobs.append(data)
+            offset += len(data)
+
+        header = json.dumps(
+            {
+                "file_type": extracted["file_type"],
+                "word_count": extracted["word_count"],
+                "pages": pages_meta,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        path = self._path(file_hash)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            for data in blobs:
+                f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Sweep der HNSW-Parameter: Recall gegen exakte Suche und Latenz pro Konfiguration.
+
+Für jede Kombination aus --space, --m, --construction-ef und --search-ef wird
+eine Kopie der Collection aus den gespeicherten Vektoren gebaut (kein
+erneutes Encoding; eigene DB unter --sweep-dir). Bei späteren Läufen wird die
+Kopie wieder geöffnet, solange Anzahl und Parameter passen (--rebuild erzwingt
+den Neubau). ChromaDB 0.5 setzt alle HNSW-Parameter nur beim Anlegen, daher
+eine Kopie pro search_ef.
+
+Gemessen über die Experten-Fragen (ibm_expert_questions.json, mit
+expand_query wie im Test):
+
+- Recall@k gegen exakte Suche (NumPy, gleicher Distanz-Raum) für jedes --k
+- Latenz pro collection.query() (p50/p95/p99, --repeat Durchläufe)
+- Aufbauzeit der Kopie
+
+Verwendung:
+    python sweep_index_params.py
+    python sweep_index_params.py --m 8 16 32 --construction-ef 100 200 --search-ef 10 50 100 200
+    python sweep_index_params.py --space l2 cosine --k 5 50 --log
+"""
+
+import argparse
+import itertools
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import chromadb
+import numpy as np
+from chromadb.config import Settings
+
+from chroma_compat import to_chroma_embeddings
+from collection_names import IBM_FIXED
+from index_params import HNSW_SPACES, effective_hnsw_params
+from numpy_index import top_k
+from test_expert_questions_fixed import load_questions_from_json, expand_query, DEFAULT_QUESTIONS_FILE
+from two_stage_retrieval import vector_distances
+from vectorstore_IBM_Mapping import LicenseVectorStore
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def sweep_collection_name(base: str, params: Dict[str, object]) -> str:
+    """z.B. ibm_licenses_fixed_ibmmap__l2_m16_c100_s10 (ChromaDB: max. 63 Zeichen)."""
+    suffix = (
+        f"{params['hnsw:space']}_m{params['hnsw:M']}"
+        f"_c{params['hnsw:construction_ef']}_s{params['hnsw:search_ef']}"
+    )
+    base = re.sub(r"[^A-Za-z0-9_-]+", "-", base)[:63 - len(suffix) - 2].rstrip("-_")
+    return f"{base}__{suffix}"
+
+
+def load_vectors(collection, batch_size: int = 2048) -> tuple:
+    """IDs und Rohvektoren der Collection (ohne Normalisierung)."""
+    total = collection.count()
+    ids: List[str] = []
+    chunks = []
+    for offset in range(0, total, batch_size):
+        batch = collection.get(include=["embeddings"], limit=batch_size, offset=offset)
+        ids.extend(batch["ids"])
+        chunks.append(np.asarray(batch["embeddings"], dtype=np.float32))
+    matrix = np.ascontiguousarray(np.concatenate(chunks)) if chunks else np.empty((0, 0), dtype=np.float32)
+    return ids, matrix
+
+
+def open_or_build(client, name: str, params: Dict[str, object], ids: List[str], matrix: np.ndarray,
+                  rebuild: bool, batch_size: int = 1024) -> tuple:
+    """
+    Öffnet die Sweep-Collection oder baut sie aus den Vektoren neu.
+
+    Returns:
+        (collection, Aufbauzeit in s oder None wenn wiederverwendet)
+    """
+    if not rebuild:
+        try:
+            collection = client.get_collection(name)
+            if collection.count() == len(ids) and effective_hnsw_params(collection.metadata) == params:
+                return collection, None
+        except Exception:
+            pass
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+
+    t0 = time.perf_counter()
+    collection = client.create_collection(name=name, metadata=dict(params))
+    for start in range(0, len(ids), batch_size):
+        collection.add(
+            ids=ids[start:start + batch_size],
+            embeddings=to_chroma_embeddings(matrix[start:start + batch_size]),
+        )
+    return collection, time.perf_counter() - t0
+
+
+def exact_neighbors(query_vectors: np.ndarray, matrix: np.ndarray, ids: List[str], space: str, k: int) -> List[List[str]]:
+    """Exakte Top-k pro Query (Referenz für den Recall)."""
+    distances = np.stack([vector_distances(q, matrix, space) for q in query_vectors])
+    rows, _ = top_k(distances, k)
+    return [[ids[row] for row in query_rows] for query_rows in rows]
+
+
+def measure(collection, query_vectors: np.ndarray, exact: List[List[str]], ks: List[int], repeat: int) -> dict:
+    """Recall@k gegen exact und Latenz-Perzentile einzelner collection.query()-Aufrufe."""
+    max_k = max(ks)
+    collection.query(query_embeddings=to_chroma_embeddings(query_vectors[:1]), n_results=max_k, include=[])  # Index laden
+
+    latencies = []
+    found = []
+    for run in range(repeat):
+        for q in query_vectors:
+            t0 = time.perf_counter()
+            result = collection.query(query_embeddings=to_chroma_embeddings(q[None, :]), n_results=max_k, include=[])
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if run == 0:
+                found.append(result["ids"][0])
+
+    recall = {
+        f"recall@{k}": round(float(np.mean([
+            len(set(hnsw[:k]) & set(ref[:k])) / max(1, len(ref[:k])) for hnsw, ref in zip(found, exact)
+        ])), 4)
+        for k in ks
+    }
+    return {
+        **recall,
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "latency_p99_ms": round(float(np.percentile(latencies, 99)), 3),
+        "latency_mean_ms": round(float(np.mean(latencies)), 3),
+    }
+
+
+def main() -> int:
+    default_sweep_dir = Path(__file__).parent.parent / "data" / "hnsw_sweep"
+
+    parser = argparse.ArgumentParser(description="HNSW-Parameter-Sweep: Recall@k vs. Latenz")
+    parser.add_argument("--collection", default=IBM_FIXED)
+    parser.add_argument("--space", nargs="+", choices=HNSW_SPACES, default=None,
+                        help="Default: Distanz-Raum der Quell-Collection")
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 50], help="Recall@k (50 = LAS_INTERNAL_K)")
+    parser.add_argument("--repeat", type=int, default=3, help="Durchläufe über alle Fragen für die Latenz")
+    parser.add_argument("--questions", type=Path, default=DEFAULT_QUESTIONS_FILE)
+    parser.add_argument("--vendor", default="IBM", help="IBM|Microsoft|All")
+    parser.add_argument("--sweep-dir", type=Path, default=default_sweep_dir)
+    parser.add_argument("--rebuild", action="store_true", help="Sweep-Collections neu bauen statt öffnen")
+    parser.add_argument("--cleanup", action="store_true", help="Sweep-Collections am Ende löschen")
+    parser.add_argument("--log", action="store_true", help="Ergebnis im ExperimentTracker speichern")
+    args = parser.parse_args()
+
+    vs = LicenseVectorStore(
+        collection_name=args.collection,
+        embedding_model="BAAI/bge-large-en-v1.5",
+        use_adaptive_chunking=False,
+    )
+    ids, matrix = load_vectors(vs.collection)
+    if not ids:
+        print(f"⚠️  Collection '{args.collection}' ist leer")
+        return 1
+
+    questions = load_questions_from_json(args.questions)
+    if args.vendor != "All":
+        questions = {k: v for k, v in questions.items() if v["vendor"] == args.vendor}
+    queries = [expand_query(q["question"]) for q in questions.values()]
+    query_vectors = np.asarray(vs.embed_texts(queries, is_query=True, show_progress_bar=False), dtype=np.float32)
+
+    spaces = args.space or [vs.hnsw_params["hnsw:space"]]
+    max_k = max(args.k)
+    client = chromadb.PersistentClient(path=str(args.sweep_dir), settings=Settings(anonymized_telemetry=False))
+
+    print("=" * 70)
+    print(f"🕸️  HNSW-SWEEP: {args.collection} | {len(ids)} Vektoren × {matrix.shape[1]} | {len(queries)} Fragen")
+    print(f"   Aktuell: {vs.hnsw_params}")
+    print("=" * 70)
+
+    recall_cols = " | ".join(f"{'R@' + str(k):>6}" for k in args.k)
+    print(f"{'space':<6} | {'M':>3} | {'c_ef':>4} | {'s_ef':>4} | {recall_cols} | {'p50':>7} | {'p95':>7} | {'p99':>7} | {'Aufbau':>7}")
+    print("-" * 70)
+
+    rows = []
+    for space in spaces:
+        t0 = time.perf_counter()
+        exact = exact_neighbors(query_vectors, matrix, ids, space, max_k)
+        exact_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+        print(f"{space:<6} | {'exakt (NumPy)':<17} | " + " | ".join(f"{1:>6.3f}" for _ in args.k) + f" | {exact_ms:>5.2f}ms")
+
+        for m, construction_ef, search_ef in itertools.product(args.m, args.construction_ef, args.search_ef):
+            params = {
+                "hnsw:space": space,
+                "hnsw:M": m,
+                "hnsw:construction_ef": construction_ef,
+                "hnsw:search_ef": search_ef,
+            }
+            name = sweep_collection_name(args.collection, params)
+            collection, build_s = open_or_build(client, name, params, ids, matrix, args.rebuild)
+            row = {
+                "space": space,
+                "M": m,
+                "construction_ef": construction_ef,
+                "search_ef": search_ef,
+                "build_s": round(build_s, 2) if build_s is not None else None,
+                **measure(collection, query_vectors, exact, args.k, args.repeat),
+            }
+            rows.append(row)
+            recalls = " | ".join(f"{row['recall@' + str(k)]:>6.3f}" for k in args.k)
+            build = f"{build_s:>6.1f}s" if build_s is not None else f"{'reuse':>7}"
+            print(
+                f"{space:<6} | {m:>3} | {construction_ef:>4} | {search_ef:>4} | {recalls} | "
+                f"{row['latency_p50_ms']:>5.2f}ms | {row['latency_p95_ms']:>5.2f}ms | "
+                f"{row['latency_p99_ms']:>5.2f}ms | {build}"
+            )
+            if args.cleanup:
+                client.delete_collection(name)
+    print("=" * 70)
+
+    if args.log:
+        from experiment_tracker import ExperimentTracker
+
+        ExperimentTracker().log_experiment(
+            experiment_name="hnsw_sweep",
+            config={
+                "collection": args.collection,
+                "vectors": len(ids),
+                "dimensions": int(matrix.shape[1]),
+                "current_hnsw": vs.hnsw_params,
+                "k": args.k,
+                "repeat": args.repeat,
+                "vendor": args.vendor,
+                "questions": len(queries),
+            },
+            results={"configs": rows},
+            notes="Recall@k gegen exakte Suche und Latenz pro HNSW-Konfiguration (sweep_index_params.py)",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -172,8 +172,34 @@ def test_questions(vendor_filter="IBM", only_ids=None):
         use_adaptive_chunking=False
     )
 
+    # Suche durchführen - Reranking optional per Env
+    rerank = os.environ.get("LAS_RERANK", "0") == "1"
+    rerank_top_n = int(os.environ.get("LAS_RERANK_TOP_N", "30"))
+    rerank_model = os.environ.get("LAS_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+    # Für die Bewertung wollen wir IMMER Top-5 zurückbekommen:
+    k_eval = 5
+
+    # Alle Fragen in einem Batch: ein Encode, ein Chroma-Query, ein Rerank-Aufruf
+    # Query-Expansion (vendor-/question-agnostisch)
+    questions = [q_data["question"] for q_data in filtered_questions.values()]
+    questions_to_search = [expand_query(question) for question in questions]
+    all_results = vs.search_many(
+        questions_to_search,
+        k=k_eval,
+        rerank=rerank,
+        rerank_top_n=rerank_top_n,
+        rerank_model=rerank_model,
+        rerank_queries=questions,
+    )
+    # DEBUG: Optional dense-only Top-100 OHNE Rerank (LAS_DEBUG_DENSE_TOP100=1)
+    debug_dense_top100 = os.environ.get("LAS_DEBUG_DENSE_TOP100", "0") == "1"
+    all_debug_results = [None] * len(questions)
+    if debug_dense_top100:
+        all_debug_results = vs.search_many(questions_to_search, k=100, rerank=False)
+
     # Teste jede Frage
-    for q_id, q_data in filtered_questions.items():
+    for q_index, (q_id, q_data) in enumerate(filtered_questions.items()):
         stats["total"] += 1
 
         vendor = q_data["vendor"]
@@ -198,30 +224,8 @@ def test_questions(vendor_filter="IBM", only_ids=None):
             print(f"Grund: {q_data['reason']}")
         print("-" * 70)
 
-        # Suche durchführen - Reranking optional per Env
-        rerank = os.environ.get("LAS_RERANK", "0") == "1"
-        rerank_top_n = int(os.environ.get("LAS_RERANK_TOP_N", "30"))
-        rerank_model = os.environ.get("LAS_RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
-
-        # Für die Bewertung wollen wir IMMER Top-5 zurückbekommen:
-        k_eval = 5
-
-        # Query-Expansion (vendor-/question-agnostisch)
-        question_to_search = expand_query(question)
-
-        results = vs.search(
-            question_to_search,
-            k=k_eval,
-            rerank=rerank,
-            rerank_top_n=rerank_top_n,
-            rerank_model=rerank_model,
-            rerank_query=question,
-        )
-      # DEBUG: Optional dense-only Top-100 OHNE Rerank (LAS_DEBUG_DENSE_TOP100=1)
-        debug_dense_top100 = os.environ.get("LAS_DEBUG_DENSE_TOP100", "0") == "1"
-        debug_results = None
-        if debug_dense_top100:
-            debug_results = vs.search(question_to_search, k=100, rerank=False)
+        results = all_results[q_index]
+        debug_results = all_debug_results[q_index]
 
         # Bewertung
         found_at = None
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+torch-Threads für Embedding und Reranking, getrennt nach Ingestion und Query.
+
+Ohne Vorgabe nutzt torch für encode()/predict() alle Kerne. Das überbucht die
+CPU, sobald parallel ein Process-Pool läuft (Extraktion, Encode-Pool), und
+bringt für eine einzelne Query kaum etwas (kleine Matrizen, Sync-Overhead).
+
+Profile:
+    ingest  Chunk-Embeddings (add_documents, Streaming, Pipeline)
+    query   Query-Embedding und CrossEncoder-Reranking in search()
+
+Auflösung pro Profil (erste Angabe gewinnt):
+    1. Parameter ingest_threads/query_threads von LicenseVectorStore
+    2. LAS_INGEST_THREADS / LAS_QUERY_THREADS
+    3. Autotune-Ergebnis (LAS_THREAD_TUNING_FILE, Default: data/thread_tuning.json)
+    4. torch-Default (unverändert)
+
+torch.set_num_threads gilt prozessweit; ThreadSettings.use() setzt das Profil
+nur bei Bedarf um. Ist torch (noch) nicht geladen, z.B. bei Nutzung des
+Embedding-Daemons, passiert nichts.
+
+Autotune (misst auf dem Host und speichert das Ergebnis):
+    python thread_tuning.py autotune
+    python thread_tuning.py autotune --threads 1 2 4 8 16 --chunks 512
+    python thread_tuning.py show
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+THREAD_PROFILES = ("ingest", "query")
+DEFAULT_TUNING_FILE = Path(__file__).parent.parent / "data" / "thread_tuning.json"
+# Innerhalb dieser Toleranz gewinnt die kleinere Thread-Anzahl (lässt Kerne frei)
+_TOLERANCE = 0.05
+
+
+def tuning_file() -> Path:
+    return Path(os.environ.get("LAS_THREAD_TUNING_FILE", str(DEFAULT_TUNING_FILE)))
+
+
+def load_tuned_threads(path: Optional[Path] = None) -> Dict[str, int]:
+    """Thread-Anzahl pro Profil aus der Autotune-Datei ({} wenn nicht vorhanden)."""
+    path = path or tuning_file()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {
+        profile: int(data[profile]["threads"])
+        for profile in THREAD_PROFILES
+        if isinstance(data.get(profile), dict) and data[profile].get("threads")
+    }
+
+
+class ThreadSettings:
+    """Aufgelöste Thread-Anzahl pro Profil; None = torch-Default."""
+
+    def __init__(self, ingest: Optional[int] = None, query: Optional[int] = None):
+        tuned = load_tuned_threads()
+        explicit = {"ingest": ingest, "query": query}
+        self.threads: Dict[str, Optional[int]] = {}
+        for profile in THREAD_PROFILES:
+            value = explicit[profile]
+            if value is None:
+                value = os.environ.get(f"LAS_{profile.upper()}_THREADS") or tuned.get(profile)
+            self.threads[profile] = max(1, int(value)) if value else None
+
+    def describe(self) -> str:
+        return ", ".join(f"{p}={self.threads[p] or 'default'}" for p in THREAD_PROFILES)
+
+    @contextmanager
+    def use(self, profile: str) -> Iterator[None]:
+        """Setzt torch.set_num_threads für das Profil (nur wenn torch geladen ist)."""
+        threads = self.threads.get(profile)
+        torch = sys.modules.get("torch")
+        if threads and torch is not None and torch.get_num_threads() != threads:
+            torch.set_num_threads(threads)
+        yield
+
+
+# ============================================================================
+# AUTOTUNE
+# ============================================================================
+
+def _candidate_threads(cpus: int) -> List[int]:
+    counts = {1, cpus}
+    n = 2
+    while n < cpus:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+
+def _pick(results: Dict[int, float], higher_is_better: bool) -> int:
+    """Beste Thread-Anzahl; innerhalb der Toleranz die kleinste."""
+    best = max(results.values()) if higher_is_better else min(results.values())
+    for threads in sorted(results):
+        value = results[threads]
+        if higher_is_better and value >= best * (1 - _TOLERANCE):
+            return threads
+        if not higher_is_better and value <= best * (1 + _TOLERANCE):
+            return threads
+    return min(results)
+
+
+def _sample_texts(data_dir: Path, cache_dir: Path, limit: int) -> List[str]:
+    """Echte Chunks aus dem Page-Cache; ohne Dokumente synthetische Texte."""
+    try:
+        from benchmark_embedding import load_chunk_texts
+
+        texts = load_chunk_texts(data_dir, cache_dir, limit)
+    except Exception as e:
+        logger.warning(f"⚠️  Keine Chunks aus {data_dir} ({e}) → synthetische Texte")
+        texts = []
+    if not texts:
+        base = "IBM license terms for sub-capacity PVU counting with ILMT reporting. "
+        texts = [base * (1 + i % 8) for i in range(limit)]
+    return texts
+
+
+def autotune(
+    model_name: str,
+    backend: str,
+    dtype: str,
+    rerank_model: Optional[str],
+    thread_counts: List[int],
+    n_chunks: int,
+    repeat: int,
+    data_dir: Path,
+    cache_dir: Path,
+) -> dict:
+    """
+    Misst Durchsatz (ingest) und Latenz (query) pro Thread-Anzahl.
+
+    Returns:
+        Dict mit ingest/query-Empfehlung und allen Messwerten
+    """
+    import torch
+
+    from embedding_backend import load_embedding_model
+    from embedding_batching import encode_bucketed
+
+    default_threads = torch.get_num_threads()
+
+    model = load_embedding_model(model_name, backend, dtype=dtype)
+    reranker = None
+    if rerank_model:
+        import model_registry
+
+        reranker = model_registry.get_cross_encoder(rerank_model, dtype=dtype)
+
+    texts = _sample_texts(data_dir, cache_dir, n_chunks)
+    query = "Represent this sentence for searching relevant passages: How is sub-capacity licensing counted?"
+    pairs = [(query, text) for text in texts[:30]]
+
+    ingest: Dict[int, float] = {}
+    query_ms: Dict[int, float] = {}
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        encode_bucketed(model, texts[:16])  # Warm-up
+
+        t0 = time.perf_counter()
+        encode_bucketed(model, texts)
+        ingest[threads] = len(texts) / (time.perf_counter() - t0)
+
+        latencies = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            model.encode([query], convert_to_numpy=True, show_progress_bar=False)
+            if reranker is not None:
+                reranker.predict(pairs)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        query_ms[threads] = statistics.median(latencies)
+
+        print(f"  {threads:>3} Threads | ingest {ingest[threads]:>8.1f} Chunks/s | query {query_ms[threads]:>8.1f} ms")
+
+    return {
+        "ingest": {"threads": _pick(ingest, higher_is_better=True)},
+        "query": {"threads": _pick(query_ms, higher_is_better=False)},
+        "host": {
+            "cpu_count": os.cpu_count(),
+            "torch": torch.__version__,
+            "torch_default_threads": default_threads,
+        },
+        "config": {
+            "model": model_name,
+            "backend": backend,
+            "dtype": dtype,
+            "rerank_model": rerank_model,
+            "chunks": len(texts),
+            "repeat": repeat,
+        },
+        "measurements": {
+            "ingest_chunks_per_s": {str(k): round(v, 1) for k, v in ingest.items()},
+            "query_ms": {str(k): round(v, 2) for k, v in query_ms.items()},
+        },
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def main() -> int:
+    default_data_dir = Path(__file__).parent.parent / "data" / "ibm"
+    default_cache_dir = Path(__file__).parent.parent / "data" / "page_cache"
+
+    parser = argparse.ArgumentParser(description="torch-Threads für Ingestion und Query")
+    parser.add_argument("command", choices=("autotune", "show"))
+    parser.add_argument("--model", default="BAAI/bge-large-en-v1.5")
+    parser.add_argument("--backend", default=None, help="Default: LAS_EMBEDDING_BACKEND")
+    parser.add_argument("--dtype", default=None, help="Default: LAS_MODEL_DTYPE")
+    parser.add_argument("--rerank-model", default="cross-encoder/ms-marco-MiniLM-L-6-v2",
+                        help="In die Query-Latenz einbeziehen ('' = ohne Reranking)")
+    parser.add_argument("--threads", type=int, nargs="+", default=None,
+                        help="Zu testende Thread-Anzahlen (Default: 1, 2, 4, … bis alle Kerne)")
+    parser.add_argument("--chunks", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--data-dir", type=Path, default=default_data_dir)
+    parser.add_argument("--cache-dir", type=Path, default=default_cache_dir)
+    parser.add_argument("--output", type=Path, default=None, help="Default: LAS_THREAD_TUNING_FILE")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    output = args.output or tuning_file()
+
+    if args.command == "show":
+        settings = ThreadSettings()
+        print(f"🧵 Aufgelöst: {settings.describe()} | Datei: {output} ({'vorhanden' if output.exists() else 'fehlt'})")
+        return 0
+
+    from embedding_backend import resolve_backend
+    from model_precision import resolve_model_dtype
+
+    backend = resolve_backend(args.backend)
+    dtype = resolve_model_dtype(args.dtype)
+    thread_counts = args.threads or _candidate_threads(os.cpu_count() or 1)
+
+    print("=" * 70)
+    print(f"🧵 THREAD-AUTOTUNE: {args.model} ({backend}, {dtype}) | {os.cpu_count()} Kerne")
+    print("=" * 70)
+    result = autotune(
+        args.model, backend, dtype, args.rerank_model or None, thread_counts,
+        args.chunks, args.repeat, args.data_dir, args.cache_dir,
+    )
+    print("-" * 70)
+    print(f"Empfehlung: ingest={result['ingest']['threads']} Threads, query={result['query']['threads']} Threads")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, output)
+    print(f"✅ Gespeichert: {output}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Zweistufiges Retrieval: Kandidaten mit kleinem Modell, Rescoring mit BGE-large.
+
+Stufe 1: Ein kompaktes Modell (z.B. BAAI/bge-small-en-v1.5, 384 Dimensionen)
+         kodiert alle Chunks in eine eigene Kandidaten-Collection
+         (<collection>__<modell>, gleiche IDs und Metadaten, keine Texte).
+         Die Query wird mit dem kleinen Modell kodiert und liefert die
+         Top-N Kandidaten (LAS_CANDIDATE_K, Default 200).
+Stufe 2: Für diese Kandidaten werden die gespeicherten BGE-large-Vektoren aus
+         der Haupt-Collection geholt und exakt gegen den BGE-large-Query-Vektor
+         bewertet (gleiche Distanz wie die Collection: l2/cosine/ip).
+
+Danach läuft die übliche Nachbearbeitung von search() (Penalty, Rerank,
+Diversifizierung). Recall gegenüber dem dichten Pfad misst
+compare_retrieval_modes.py auf den Experten-Fragen.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import logging
+import re
+
+import numpy as np
+
+from chroma_compat import to_chroma_embeddings
+from embedding_batching import encode_bucketed
+
+logger = logging.getLogger(__name__)
+
+
+RETRIEVAL_MODES = ("dense", "two_stage")
+DEFAULT_CANDIDATE_K = 200
+QUERY_PREFIX = "Represent this sentence for searching relevant passages: "
+
+
+def candidate_collection_name(base_collection: str, model_name: str) -> str:
+    """Name der Kandidaten-Collection (ChromaDB: 3–63 Zeichen, [A-Za-z0-9_-])."""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", model_name.split("/")[-1]).strip("-_")
+    return f"{base_collection}__{slug}"[:63].rstrip("-_")
+
+
+def vector_distances(query: np.ndarray, matrix: np.ndarray, space: str = "l2") -> np.ndarray:
+    """
+    Distanzen wie ChromaDB/hnswlib: l2 = quadrierte euklidische Distanz,
+    cosine = 1 - Kosinus, ip = 1 - Skalarprodukt.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if space == "l2":
+        diff = matrix - query
+        return np.einsum("ij,ij->i", diff, diff)
+    if space == "cosine":
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        return 1.0 - (matrix @ query) / np.maximum(norms, 1e-12)
+    if space == "ip":
+        return 1.0 - matrix @ query
+    raise ValueError(f"Unbekannter Distanz-Raum: {space}")
+
+
+class CandidateIndex:
+    """Kandidaten-Collection mit Embeddings des kleinen Modells."""
+
+    def __init__(self, client, base_collection: str, model, model_name: str):
+        """
+        Args:
+            client: chromadb Client der Haupt-Collection
+            base_collection: Name der Haupt-Collection
+            model: SentenceTransformer oder RemoteEmbeddingModel des kleinen Modells
+            model_name: Hugging Face Model-Name des kleinen Modells
+        """
+        self.model = model
+        self.model_name = model_name
+        self.collection = client.get_or_create_collection(
+            name=candidate_collection_name(base_collection, model_name),
+            metadata={"candidate_model": model_name, "base_collection": base_collection},
+        )
+
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        if getattr(self.model, "is_remote", False):
+            return self.model.encode_texts(texts)
+        return encode_bucketed(self.model, texts)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[dict]) -> None:
+        """Kodiert Chunk-Texte mit dem kleinen Modell und schreibt sie unter denselben IDs."""
+        if not ids:
+            return
+        self.collection.add(ids=ids, embeddings=to_chroma_embeddings(self._encode(texts)), metadatas=metadatas)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[dict] = None) -> None:
+        self.collection.delete(ids=ids, where=where)
+
+    def query_ids(self, query: str, n_results: int, where: Optional[dict] = None) -> List[str]:
+        """Stufe 1: IDs der Top-n Kandidaten für die Query."""
+        return self.query_ids_many([query], n_results, where=where)[0]
+
+    def query_ids_many(self, queries: Sequence[str], n_results: int, where: Optional[dict] = None) -> List[List[str]]:
+        """Stufe 1 für mehrere Queries: ein Encode-Batch, ein Collection-Query."""
+        n_results = min(n_results, self.count())
+        if n_results <= 0 or not queries:
+            return [[] for _ in queries]
+        query_vectors = self._encode([QUERY_PREFIX + query for query in queries])
+        result = self.collection.query(
+            query_embeddings=to_chroma_embeddings(query_vectors),
+            n_results=n_results,
+            where=where,
+            include=[],
+        )
+        return result["ids"]
+
+    def sync(self, main_collection, batch_size: int = 256) -> Dict[str, int]:
+        """
+        Gleicht die Kandidaten-Collection mit der Haupt-Collection ab:
+        fehlende Chunks kodieren, verwaiste IDs entfernen.
+
+        Returns:
+            {"added": n, "removed": m}
+        """
+        main_ids = set(main_collection.get(include=[])["ids"])
+        own_ids = set(self.collection.get(include=[])["ids"])
+
+        orphans = sorted(own_ids - main_ids)
+        for start in range(0, len(orphans), batch_size):
+            self.collection.delete(ids=orphans[start:start + batch_size])
+
+        missing = sorted(main_ids - own_ids)
+        for start in range(0, len(missing), batch_size):
+            batch = main_collection.get(ids=missing[start:start + batch_size], include=["documents", "metadatas"])
+            self.add(batch["ids"], batch["documents"], batch["metadatas"])
+
+        if missing or orphans:
+            logger.info(
+                f"🪜 Kandidaten-Index ({self.model_name}): {len(missing)} ergänzt, {len(orphans)} entfernt"
+            )
+        return {"added": len(missing), "removed": len(orphans)}
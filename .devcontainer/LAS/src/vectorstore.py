@@ -22,9 +22,10 @@ from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 from langchain.schema import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader
+from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from product_mapping import ProductMapper
+from document_extraction import extract_document
 
 
 # Logging konfigurieren
@@ -214,20 +215,16 @@ class LicenseVectorStore:
         # DOCX verarbeiten
         for docx_file in all_docx:
             try:
-                # Wortanzahl aus DOCX
-                from docx import Document as DocxDocument
-                doc = DocxDocument(docx_file)
-                text = "\n".join([para.text for para in doc.paragraphs])
-                word_count = len(text.split())
+                # DOCX einmal gestreamt lesen (Wortanzahl + Abschnitte aus einem Durchlauf)
+                extracted = extract_document(docx_file)
+                word_count = extracted["word_count"]
                 
                 # Chunk-Parameter bestimmen
                 chunk_size, overlap = self._get_chunk_params(docx_file.name, word_count)
                 
                 logger.info(f"📄 {docx_file.name} (DOCX): {word_count} Wörter → Chunk {chunk_size}/{overlap}")
                 
-                # DOCX laden
-                docx_loader = Docx2txtLoader(str(docx_file))
-                doc_content = docx_loader.load()
+                doc_content = extracted["pages"]
                 
                 splitter = RecursiveCharacterTextSplitter(
                     chunk_size=chunk_size,
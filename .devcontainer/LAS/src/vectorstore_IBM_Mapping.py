@@ -11,21 +11,43 @@ Kombiniert:
 """
 
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Iterable, Sequence
 import logging
 import uuid
 import os
 import re
 import time
 import json
-from collections import Counter
+import threading
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
-from sentence_transformers import SentenceTransformer, CrossEncoder
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from langchain.schema import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from chunking import get_splitter, CHUNK_SEPARATORS
+from file_discovery import FileDiscovery, DOCUMENT_EXTENSIONS
+from document_extraction import extract_document, compute_file_hash, EXTRACTOR_VERSION
+from page_cache import PageTextCache
+from embedding_cache import EmbeddingCache
+from embedding_batching import encode_bucketed
+from embedding_pool import EncodePool, resolve_encode_processes
+from embedding_backend import resolve_backend, embedding_model_key
+from model_precision import resolve_model_dtype
+from thread_tuning import ThreadSettings
+from model_registry import get_embedding_model, get_cross_encoder
+from embedding_daemon import connect_daemon, RemoteEmbeddingModel, RemoteCrossEncoder
+from document_stats import DocumentStatsTable, compute_document_stats, recommend_chunk_params
+from ingest_manifest import IngestManifest
+from ingest_pipeline import StagedIngestPipeline
+from chroma_compat import to_chroma_embeddings
+from two_stage_retrieval import CandidateIndex, RETRIEVAL_MODES, DEFAULT_CANDIDATE_K, vector_distances
+from numpy_index import NumpyIndex, SEARCH_BACKENDS, top_k
+from metadata_index import MetadataIndex
+from index_params import resolve_hnsw_params, check_hnsw_params, effective_hnsw_params
+from lexical_index import LexicalIndex
 
 # Logging konfigurieren
 logging.basicConfig(level=logging.INFO)
@@ -73,6 +95,20 @@ def _load_bad_actors() -> frozenset:
 BAD_ACTORS: frozenset = _load_bad_actors()
 
 
+# ============================================================================
+# HELPER-FUNKTION: Dtype der Embedding-Matrizen
+# ============================================================================
+
+def resolve_embedding_dtype(dtype: Optional[str] = None) -> np.dtype:
+    """Dtype der Embedding-Matrizen aus Parameter oder LAS_EMBED_DTYPE (float32|float16)."""
+    if dtype is None:
+        dtype = os.environ.get("LAS_EMBED_DTYPE", "float32")
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float16):
+        raise ValueError(f"Nicht unterstützter Embedding-Dtype: {dtype} (erlaubt: float32, float16)")
+    return dtype
+
+
 # ============================================================================
 # HELPER-FUNKTION: IBM Produkt-Mapping einlesen
 # ============================================================================
@@ -227,6 +263,111 @@ def sanitize_metadata(metadata: dict) -> dict:
     return sanitized
 
 
+# ============================================================================
+# HELPER-FUNKTION: Datei-Verarbeitung (seriell ODER im Process-Pool)
+# ============================================================================
+
+def resolve_chunk_params(file_name: str, word_count: int, chunk_settings: dict) -> tuple:
+    """
+    Bestimmt optimale Chunk-Parameter.
+    
+    Args:
+        file_name: Dateiname (Lookup in den Dokument-Statistiken)
+        word_count: Wortanzahl des Dokuments
+        chunk_settings: {"fixed": (size, overlap) oder None,
+                         "stats": {file_name: (size, overlap)} (manuelle Empfehlungen)}
+    
+    Returns:
+        (chunk_size, overlap)
+    """
+    # Fixed mode?
+    if chunk_settings.get("fixed") is not None:
+        return chunk_settings["fixed"]
+    
+    # Adaptive mode: Manuelle Empfehlung aus den Dokument-Statistiken
+    stats = chunk_settings.get("stats") or {}
+    if file_name in stats:
+        return stats[file_name]
+    
+    # Adaptive mode: Fallback auf Größen-basierte Logik
+    return recommend_chunk_params(word_count)
+
+
+def process_document_file(
+    file_path: Path,
+    ibm_mapping: Dict[str, Dict[str, str]],
+    chunk_settings: dict,
+    page_cache_dir: Optional[str] = None,
+    file_hash: Optional[str] = None,
+) -> tuple:
+    """
+    Verarbeitet eine einzelne PDF/DOCX-Datei: Extraktion (ein Durchlauf),
+    Chunking und Metadaten-Anreicherung.
+
+    Modul-Funktion (statt Methode), damit sie in einem ProcessPoolExecutor
+    laufen kann, ohne Embedding-Modell oder ChromaDB-Client zu picklen.
+
+    Args:
+        file_path: Pfad zur Datei
+        ibm_mapping: IBM Produkt-Mapping (siehe load_ibm_product_mapping)
+        chunk_settings: Chunk-Konfiguration (siehe resolve_chunk_params)
+        page_cache_dir: Verzeichnis des Page-Caches (None = ohne Cache)
+        file_hash: SHA-256 der Datei, falls schon bekannt
+
+    Returns:
+        (chunks, timing, stats) – Liste von Document-Chunks dieser Datei,
+        Dict mit Laufzeiten pro Schritt in Sekunden und Dokument-Statistiken
+        (siehe document_stats.compute_document_stats)
+    """
+    t0 = time.perf_counter()
+
+    # Einmalige Extraktion: Seiten, Wortanzahl und Seiten-Metadaten zusammen
+    # (bei Page-Cache-Treffer ganz ohne PDF-Parsing)
+    cache = PageTextCache(page_cache_dir, EXTRACTOR_VERSION) if page_cache_dir else None
+    extracted = extract_document(file_path, cache=cache, file_hash=file_hash)
+    word_count = extracted["word_count"]
+    stats = compute_document_stats(file_path, extracted)
+    type_label = " (DOCX)" if extracted["file_type"] == "docx" else ""
+    t1 = time.perf_counter()
+
+    # Chunk-Parameter bestimmen
+    chunk_size, overlap = resolve_chunk_params(file_path.name, word_count, chunk_settings)
+
+    logger.info(f"📄 {file_path.name}{type_label}: {word_count} Wörter → Chunk {chunk_size}/{overlap}")
+
+    # Splitter mit aktuellen Parametern (gecacht, offset-basiert; siehe chunking.py)
+    splitter = get_splitter(chunk_size, overlap, CHUNK_SEPARATORS)
+
+    chunks = splitter.split_documents(extracted["pages"])
+    t2 = time.perf_counter()
+
+    # Metadaten erweitern: Standard + IBM Mapping
+    ibm_metadata = extract_metadata_from_filename(file_path.name, ibm_mapping)
+
+    for chunk in chunks:
+        chunk.metadata['word_count'] = word_count
+        chunk.metadata['chunk_size'] = chunk_size
+        chunk.metadata['overlap'] = overlap
+        chunk.metadata['file_name'] = file_path.name
+        # IBM Mapping Metadaten hinzufügen
+        chunk.metadata['manufacturer'] = ibm_metadata['manufacturer']
+        chunk.metadata['product_name'] = ibm_metadata['product_name']
+        chunk.metadata['language'] = ibm_metadata['language']
+        if ibm_metadata.get('license_code') is not None:
+            chunk.metadata['license_code'] = ibm_metadata['license_code']
+    t3 = time.perf_counter()
+
+    logger.info(f"  → {len(chunks)} Chunks erstellt ({ibm_metadata['product_name']})")
+
+    timing = {
+        "extract_s": t1 - t0,
+        "chunk_s": t2 - t1,
+        "metadata_s": t3 - t2,
+        "total_s": t3 - t0,
+    }
+    return chunks, timing, stats
+
+
 # ============================================================================
 # HAUPTKLASSE: LicenseVectorStore
 # ============================================================================
@@ -251,7 +392,23 @@ class LicenseVectorStore:
         persist_directory: str = None,
         embedding_model: str = "BAAI/bge-large-en-v1.5",
         use_adaptive_chunking: bool = True,
-        ibm_mapping_file: str = "product_mapping.csv"
+        ibm_mapping_file: str = "product_mapping.csv",
+        page_cache_dir: Optional[str] = None,
+        stats_file: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
+        encode_processes: Optional[str] = None,
+        candidate_model: Optional[str] = None,
+        model_dtype: Optional[str] = None,
+        ingest_threads: Optional[int] = None,
+        query_threads: Optional[int] = None,
+        search_backend: Optional[str] = None,
+        lexical_index_dir: Optional[str] = None,
+        metadata_index_dir: Optional[str] = None,
+        hnsw_space: Optional[str] = None,
+        hnsw_m: Optional[int] = None,
+        hnsw_construction_ef: Optional[int] = None,
+        hnsw_search_ef: Optional[int] = None
     ):
         """
         Args:
@@ -260,6 +417,47 @@ class LicenseVectorStore:
             embedding_model: Hugging Face Model-name
             use_adaptive_chunking: True = adaptive Größen, False = fix 400/100
             ibm_mapping_file: Pfad zur IBM Product Mapping-Datei
+            page_cache_dir: Cache für extrahierte Seiten-Texte
+                            (Default: page_cache/ neben persist_directory; LAS_PAGE_CACHE=0 deaktiviert)
+            stats_file: Tabelle der Dokument-Statistiken, wird bei jeder Ingestion
+                        fortgeschrieben (Default: ingest_stats/document_stats.csv neben
+                        persist_directory; data/document_stats.csv wird nur gelesen)
+            embedding_cache_dir: Persistenter Cache für Chunk-Embeddings
+                                 (Default: embedding_cache/ neben persist_directory;
+                                 LAS_EMBED_CACHE=0 deaktiviert)
+            embedding_backend: "torch" (float32) oder "torch-int8" (dynamisch quantisiert)
+                               (Default: LAS_EMBEDDING_BACKEND oder torch; siehe embedding_backend.py)
+            encode_processes: Worker-Prozesse für das Chunk-Encoding, "auto" = alle Kerne
+                              (Default: LAS_ENCODE_PROCESSES oder 1 = im Hauptprozess;
+                              siehe embedding_pool.py)
+            candidate_model: Kleines Modell für zweistufiges Retrieval, z.B.
+                             "BAAI/bge-small-en-v1.5" (Default: LAS_CANDIDATE_MODEL oder
+                             keins; siehe two_stage_retrieval.py)
+            model_dtype: Gewichts-Datentyp für Embedding-Modell und Reranker:
+                         float32|bfloat16|float16, Fallback auf float32 ohne CPU-Support
+                         (Default: LAS_MODEL_DTYPE oder float32; siehe model_precision.py)
+            ingest_threads: torch-Threads für Chunk-Embeddings
+                            (Default: LAS_INGEST_THREADS, Autotune-Datei oder torch-Default)
+            query_threads: torch-Threads für Query-Embedding und Reranking
+                           (Default: LAS_QUERY_THREADS, Autotune-Datei oder torch-Default;
+                           siehe thread_tuning.py)
+            search_backend: "chroma" (HNSW über collection.query) oder "numpy" (exakte
+                            Suche über alle Vektoren im Speicher)
+                            (Default: LAS_SEARCH_BACKEND oder chroma; siehe numpy_index.py)
+            lexical_index_dir: Lexikalischer Index (Lizenz-Codes, Produktnamen, PVU/RVU/ILMT),
+                               wird bei der Ingestion fortgeschrieben
+                               (Default: lexical_index/ neben persist_directory;
+                               LAS_LEXICAL_INDEX=0 deaktiviert; siehe lexical_index.py)
+            metadata_index_dir: Bitmap-Index über manufacturer/license_code/language/file_name
+                                für vorgefilterte Suche, wird bei der Ingestion fortgeschrieben
+                                (Default: metadata_index/ neben persist_directory;
+                                LAS_METADATA_INDEX=0 deaktiviert; siehe metadata_index.py)
+            hnsw_space: Distanz des HNSW-Index: l2|cosine|ip (Default: LAS_HNSW_SPACE oder l2)
+            hnsw_m: Kanten pro Knoten (Default: LAS_HNSW_M oder 16)
+            hnsw_construction_ef: Kandidatenliste beim Aufbau (Default: LAS_HNSW_CONSTRUCTION_EF oder 100)
+            hnsw_search_ef: Kandidatenliste bei der Suche (Default: LAS_HNSW_SEARCH_EF oder 10)
+                            (alle HNSW-Parameter gelten nur beim Anlegen der Collection;
+                            siehe index_params.py, Sweep: sweep_index_params.py)
         """
         self.collection_name = collection_name
         self.use_adaptive_chunking = use_adaptive_chunking
@@ -268,29 +466,80 @@ class LicenseVectorStore:
         if persist_directory is None:
             persist_directory = str(Path(__file__).parent.parent / "data" / "chroma_db")        
         self.persist_directory = persist_directory
+
+        # Page-Cache: extrahierte Seiten-Texte, damit Chunk-Experimente nicht neu parsen
+        if os.environ.get("LAS_PAGE_CACHE", "1") == "0":
+            self.page_cache_dir = None
+        elif page_cache_dir is None:
+            self.page_cache_dir = str(Path(persist_directory).parent / "page_cache")
+        else:
+            self.page_cache_dir = page_cache_dir
         
         # IBM Product Mapping laden
         self.ibm_mapping = load_ibm_product_mapping(ibm_mapping_file)
         logger.info(f"📋 IBM Product Mapping: {len(self.ibm_mapping)} Produkte")
 
         # Embedding-Modell laden
-        logger.info(f"📥 Lade Embedding-Modell: {embedding_model}")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        self.embedding_model_name = embedding_model
+        self.embedding_backend = resolve_backend(embedding_backend)
+        self.model_dtype = resolve_model_dtype(model_dtype)
+        # Läuft der Embedding-Daemon, wird dort kodiert (kein Modell-Load im Script);
+        # sonst prozessweit geteilt: weitere Instanzen mit demselben Modell laden nicht erneut
+        self._daemon = connect_daemon()
+        self._remote_rerankers = {}
+        if self._daemon is not None:
+            logger.info(f"🔌 Embedding-Daemon: {self._daemon.socket_path} ({embedding_model}, {self.embedding_backend})")
+        else:
+            logger.info(f"📥 Lade Embedding-Modell: {embedding_model} (Backend: {self.embedding_backend})")
+        self.embedding_model = self._load_embedding_model(embedding_model, self.embedding_backend)
         logger.info(f"✅ Modell geladen: {self.embedding_model.get_sentence_embedding_dimension()} Dimensionen")
+        # Kennung für Manifest/Embedding-Cache: quantisierte bzw. bf16/fp16-Vektoren nicht
+        # mit float32 mischen (tatsächlicher Datentyp nach evtl. Fallback)
+        self.embedding_model_key = embedding_model_key(
+            embedding_model,
+            self.embedding_backend,
+            getattr(self.embedding_model, "las_model_dtype", "float32"),
+        )
+
+        # torch-Threads getrennt für Ingestion und Query (prozessweit, bei Bedarf umgeschaltet)
+        self.threads = ThreadSettings(ingest=ingest_threads, query=query_threads)
+        logger.info(f"🧵 Threads: {self.threads.describe()}")
+
+        # Dtype der Embedding-Matrizen zwischen Encoder und ChromaDB
+        self.embedding_dtype = resolve_embedding_dtype()
+
+        # Multi-Prozess-Encoding: Pool startet erst beim ersten großen encode()
+        # (nicht mit Daemon: dort liegt das Modell im Daemon-Prozess)
+        processes = resolve_encode_processes(encode_processes)
+        if processes > 1 and self._daemon is None:
+            self.encode_pool = EncodePool(self.embedding_model, processes)
+        else:
+            self.encode_pool = None
+
+        # Embedding-Cache: unveränderte Chunks werden nicht erneut kodiert
+        if os.environ.get("LAS_EMBED_CACHE", "1") == "0":
+            self.embedding_cache = None
+        else:
+            if embedding_cache_dir is None:
+                embedding_cache_dir = str(Path(persist_directory).parent / "embedding_cache")
+            self.embedding_cache = EmbeddingCache(
+                embedding_cache_dir,
+                self.embedding_model_key,
+                self.embedding_model.get_sentence_embedding_dimension(),
+            )
         
-        # Dokument-Statistiken laden (nur wenn adaptive)
+        # Dokument-Statistiken: schreibt die Ingestion fort (nicht versioniert),
+        # adaptive Chunking liest sie; die versionierte Tabelle ist nur Eingabe
+        if stats_file is None:
+            stats_file = str(Path(persist_directory).parent / "ingest_stats" / "document_stats.csv")
+        self.stats_table = DocumentStatsTable(
+            Path(stats_file),
+            base_path=Path(__file__).parent.parent / "data" / "document_stats.csv",
+        )
+
         if use_adaptive_chunking:
-            stats_file = Path(__file__).parent / "document_stats.csv"
-            if stats_file.exists():
-                import pandas as pd
-                self.doc_stats = pd.read_csv(stats_file)
-                logger.info(f"✅ Dokument-Statistiken geladen: {len(self.doc_stats)} Docs")
-                
-                # Index für schnellen Lookup
-                self.doc_stats.set_index('file_name', inplace=True)
-            else:
-                self.doc_stats = None
-                logger.warning("⚠️  Keine document_stats.csv gefunden - nutze adaptive Defaults")
+            self.doc_stats = self.stats_table
+            logger.info(f"✅ Dokument-Statistiken geladen: {len(self.doc_stats)} Docs")
         else:
             # Fixed mode
             logger.info("🔧 EXPERIMENT: Feste Chunk-Größe 400/100 (kein Adaptive Chunking)")
@@ -307,33 +556,93 @@ class LicenseVectorStore:
             )
         )
         
-        # Collection erstellen oder laden
+        # Collection erstellen oder laden (HNSW-Parameter nur beim Anlegen wirksam)
+        hnsw_params = resolve_hnsw_params(hnsw_space, hnsw_m, hnsw_construction_ef, hnsw_search_ef)
         try:
             self.collection = self.client.get_collection(name=collection_name)
             logger.info(f"✅ Collection '{collection_name}' geladen ({self.collection.count()} Dokumente)")
+            check_hnsw_params(self.collection, hnsw_params)
         except Exception:
             self.collection = self.client.create_collection(
                 name=collection_name,
-                metadata={"description": "IBM Licensing Documents with Product Mapping"}
+                metadata={"description": "IBM Licensing Documents with Product Mapping", **hnsw_params}
             )
             logger.info(f"✅ Collection '{collection_name}' erstellt")
+        self.hnsw_params = effective_hnsw_params(self.collection.metadata)
+        logger.info(
+            "🕸️  HNSW: " + ", ".join(f"{key.split(':')[1]}={value}" for key, value in self.hnsw_params.items())
+        )
+
+        # Zweistufiges Retrieval: Kandidaten-Collection mit kleinem Modell (gleiche IDs)
+        if candidate_model is None:
+            candidate_model = os.environ.get("LAS_CANDIDATE_MODEL") or None
+        if candidate_model:
+            self.candidate_index = CandidateIndex(
+                self.client, collection_name, self._load_embedding_model(candidate_model, "torch"), candidate_model
+            )
+            logger.info(
+                f"🪜 Kandidaten-Index: {candidate_model} ({self.candidate_index.count()} Dokumente)"
+            )
+        else:
+            self.candidate_index = None
+
+        # Exakte Suche im Speicher statt HNSW (lädt die Vektoren beim ersten search())
+        if search_backend is None:
+            search_backend = os.environ.get("LAS_SEARCH_BACKEND", "chroma")
+        if search_backend not in SEARCH_BACKENDS:
+            raise ValueError(f"Unbekanntes Such-Backend: {search_backend} (erlaubt: {', '.join(SEARCH_BACKENDS)})")
+        self.search_backend = search_backend
+        self.numpy_index = NumpyIndex(self.collection) if search_backend == "numpy" else None
+
+        # Lexikalischer Index: Entitäten → Chunk-IDs, Routing und Score-Fusion in search()
+        if os.environ.get("LAS_LEXICAL_INDEX", "1") == "0":
+            self.lexical_index = None
+        else:
+            if lexical_index_dir is None:
+                lexical_index_dir = str(Path(persist_directory).parent / "lexical_index")
+            self.lexical_index = LexicalIndex(Path(lexical_index_dir) / f"{collection_name}.json", self.ibm_mapping)
+
+        # Metadaten-Index: Filter → Chunk-Teilmenge, nur diese wird bewertet
+        if os.environ.get("LAS_METADATA_INDEX", "1") == "0":
+            self.metadata_index = None
+        else:
+            if metadata_index_dir is None:
+                metadata_index_dir = str(Path(persist_directory).parent / "metadata_index")
+            self.metadata_index = MetadataIndex(Path(metadata_index_dir) / f"{collection_name}.json")
 
-        # Lazy-loaded CrossEncoder für Reranking (nur wenn aktiviert)
-        self._reranker = None
-        self._reranker_model_name = None
+        # Timing der letzten Ingestion (load_and_process_documents / Pipeline)
+        self.last_ingest_timing = None
+        self.last_pipeline_stats = None
+
+    def _load_embedding_model(self, model_name: str, backend: str):
+        """Embedding-Modell aus dem Daemon (falls verbunden) oder der Model-Registry."""
+        if self._daemon is not None:
+            return RemoteEmbeddingModel(self._daemon, model_name, backend, self.model_dtype)
+        return get_embedding_model(model_name, backend, dtype=self.model_dtype)
 
     # Helper-Funktion: Lazy-Load CrossEncoder Reranker, 20260509
-    def _get_reranker(self, model_name: str) -> CrossEncoder:
+    def _get_reranker(self, model_name: str):
         """
         Lazy-load CrossEncoder reranker to avoid overhead when not used.
         CPU-only friendly; will download model on first use if not cached.
+        Shared process-wide via model_registry (one instance per model name),
+        or served by the embedding daemon when it is running.
         """
-        if self._reranker is None or self._reranker_model_name != model_name:
-            logger.info(f"📥 Lade Reranker-Modell: {model_name}")
-            self._reranker = CrossEncoder(model_name)
-            self._reranker_model_name = model_name
-            logger.info("✅ Reranker geladen")
-        return self._reranker
+        if self._daemon is not None:
+            if model_name not in self._remote_rerankers:
+                self._remote_rerankers[model_name] = RemoteCrossEncoder(self._daemon, model_name, self.model_dtype)
+            return self._remote_rerankers[model_name]
+        return get_cross_encoder(model_name, dtype=self.model_dtype)
+
+    def _chunk_settings(self) -> dict:
+        """Picklebare Chunk-Konfiguration für resolve_chunk_params / Process-Pool."""
+        fixed = None
+        if hasattr(self, 'fixed_chunk_size'):
+            fixed = (self.fixed_chunk_size, self.fixed_chunk_overlap)
+
+        stats = self.doc_stats.chunk_params() if self.doc_stats is not None else {}
+
+        return {"fixed": fixed, "stats": stats}
 
     def _get_chunk_params(self, file_name: str, word_count: int) -> tuple:
         """
@@ -342,166 +651,231 @@ class LicenseVectorStore:
         Adaptive Mode: Basiert auf Dokumentgröße
         Fixed Mode: Immer 400/100
         """
-        # Fixed mode?
-        if hasattr(self, 'fixed_chunk_size'):
-            return self.fixed_chunk_size, self.fixed_chunk_overlap
-        
-        # Adaptive mode: Falls Stats vorhanden, nutze diese
-        if self.doc_stats is not None and file_name in self.doc_stats.index:
-            row = self.doc_stats.loc[file_name]
-            return int(row['recommended_chunk_size']), int(row['recommended_overlap'])
-        
-        # Adaptive mode: Fallback auf Größen-basierte Logik
-        if word_count < 1000:
-            return 500, 125
-        elif word_count < 2000:
-            return 450, 110
-        elif word_count < 3500:
-            return 400, 100
-        elif word_count < 5000:
-            return 350, 90
-        elif word_count < 7000:
-            return 300, 75
-        else:
-            return 250, 60
+        return resolve_chunk_params(file_name, word_count, self._chunk_settings())
     
-    def load_and_process_documents(self, data_dir: Path) -> List[Document]:
+    def _find_documents(self, data_dir: Path) -> List[Path]:
+        """PDF- und DOCX-Dateien eines Verzeichnisses (sortiert, PDFs zuerst)."""
+        discovery = FileDiscovery(data_dir, DOCUMENT_EXTENSIONS)
+        discovery.scan()
+        counts = discovery.count_by_extension()
+
+        logger.info(
+            f"📚 Gefunden: {counts['.pdf']} PDFs + {counts['.docx']} DOCX = "
+            f"{len(discovery.files)} Dokumente"
+        )
+        return discovery.paths()
+
+    def load_and_process_documents(self, data_dir: Path, workers: Optional[int] = None) -> List[Document]:
         """
         Lädt und verarbeitet Dokumente mit adaptiver ODER fester Chunk-Größe.
         Reichert Metadaten mit IBM Product Mapping an.
+
+        Jede Datei wird nur EINMAL geparst (siehe document_extraction.py);
+        Wortanzahl und Seiten kommen aus demselben Extraktions-Ergebnis.
         
         Args:
             data_dir: Verzeichnis mit PDF/DOCX-Dateien
+            workers: Anzahl Worker-Prozesse (Default: LAS_INGEST_WORKERS oder 1 = seriell)
             
         Returns:
             Liste von Document-Objekten (Chunks)
         """
-        all_chunks = []
-        
-        # PDF-Dateien finden
-        pdf_files = list(data_dir.glob("*.pdf"))
-        pdf_files_upper = list(data_dir.glob("*.PDF"))
-        all_pdfs = pdf_files + pdf_files_upper
-        
-        # DOCX-Dateien finden
-        docx_files = list(data_dir.glob("*.docx"))
-        docx_files_upper = list(data_dir.glob("*.DOCX"))
-        all_docx = docx_files + docx_files_upper
-        
-        total_files = len(all_pdfs) + len(all_docx)
-        logger.info(f"📚 Verarbeite {len(all_pdfs)} PDFs + {len(all_docx)} DOCX = {total_files} Dokumente...")
-        
-        # PDFs verarbeiten
-        for pdf_file in all_pdfs:
-            try:
-                # Wortanzahl schätzen
-                import PyPDF2
-                with open(pdf_file, 'rb') as f:
-                    pdf = PyPDF2.PdfReader(f)
-                    text = ""
-                    for page in pdf.pages:
-                        text += page.extract_text()
-                    word_count = len(text.split())
-                
-                # Chunk-Parameter bestimmen
-                chunk_size, overlap = self._get_chunk_params(pdf_file.name, word_count)
-                
-                logger.info(f"📄 {pdf_file.name}: {word_count} Wörter → Chunk {chunk_size}/{overlap}")
-                
-                # PDF laden
-                pdf_loader = PyPDFLoader(str(pdf_file))
-                pages = pdf_loader.load()
-                
-                # Splitter mit aktuellen Parametern
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=chunk_size,
-                    chunk_overlap=overlap,
-                    length_function=len,
-                    separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""]
-                )
-                
-                chunks = splitter.split_documents(pages)
-                
-                # Metadaten erweitern: Standard + IBM Mapping
-                ibm_metadata = extract_metadata_from_filename(pdf_file.name, self.ibm_mapping)
-                
-                for chunk in chunks:
-                    chunk.metadata['word_count'] = word_count
-                    chunk.metadata['chunk_size'] = chunk_size
-                    chunk.metadata['overlap'] = overlap
-                    chunk.metadata['file_name'] = pdf_file.name
-                    # IBM Mapping Metadaten hinzufügen
-                    chunk.metadata['manufacturer'] = ibm_metadata['manufacturer']
-                    chunk.metadata['product_name'] = ibm_metadata['product_name']
-                    chunk.metadata['language'] = ibm_metadata['language']
-                    if ibm_metadata.get('license_code') is not None:
-                        chunk.metadata['license_code'] = ibm_metadata['license_code']
-                
-                all_chunks.extend(chunks)
-                logger.info(f"  → {len(chunks)} Chunks erstellt ({ibm_metadata['product_name']})")
-                
-            except Exception as e:
-                logger.error(f"❌ Fehler bei {pdf_file.name}: {e}")
-        
-        # DOCX verarbeiten
-        for docx_file in all_docx:
-            try:
-                # Wortanzahl aus DOCX
-                from docx import Document as DocxDocument
-                doc = DocxDocument(docx_file)
-                text = "\n".join([para.text for para in doc.paragraphs])
-                word_count = len(text.split())
-                
-                # Chunk-Parameter bestimmen
-                chunk_size, overlap = self._get_chunk_params(docx_file.name, word_count)
-                
-                logger.info(f"📄 {docx_file.name} (DOCX): {word_count} Wörter → Chunk {chunk_size}/{overlap}")
-                
-                # DOCX laden
-                docx_loader = Docx2txtLoader(str(docx_file))
-                doc_content = docx_loader.load()
-                
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=chunk_size,
-                    chunk_overlap=overlap,
-                    length_function=len,
-                    separators=["\n\n", "\n", ".", "!", "?", ",", " ", ""]
-                )
-                
-                chunks = splitter.split_documents(doc_content)
-                
-                # Metadaten erweitern
-                ibm_metadata = extract_metadata_from_filename(docx_file.name, self.ibm_mapping)
-                
-                for chunk in chunks:
-                    chunk.metadata['word_count'] = word_count
-                    chunk.metadata['chunk_size'] = chunk_size
-                    chunk.metadata['overlap'] = overlap
-                    chunk.metadata['file_name'] = docx_file.name
-                    chunk.metadata['manufacturer'] = ibm_metadata['manufacturer']
-                    chunk.metadata['product_name'] = ibm_metadata['product_name']
-                    chunk.metadata['language'] = ibm_metadata['language']
-                    if ibm_metadata.get('license_code') is not None:
-                        chunk.metadata['license_code'] = ibm_metadata['license_code']
-                
-                all_chunks.extend(chunks)
-                logger.info(f"  → {len(chunks)} Chunks erstellt")
-                
-            except Exception as e:
-                logger.error(f"❌ Fehler bei {docx_file.name}: {e}")
-        
-        return all_chunks
+        return self.process_files(self._find_documents(data_dir), workers=workers)
+
+    def iter_processed_files(
+        self,
+        files: List[Path],
+        workers: Optional[int] = None,
+        file_hashes: Optional[Dict[str, str]] = None,
+    ) -> Iterator[tuple]:
+        """
+        Verarbeitet PDF/DOCX-Dateien und liefert die Chunks Datei für Datei.
+
+        Mit workers > 1 laufen Extraktion, Chunking und Metadaten-Anreicherung
+        parallel in einem Process-Pool. Es sind höchstens 2 × workers Dateien
+        gleichzeitig in Arbeit, damit der Speicher nicht mit dem Korpus wächst.
+        Die Ausgabe-Reihenfolge entspricht in beiden Modi der Reihenfolge von
+        files, Fehler bleiben pro Datei isoliert.
+
+        Nach dem Durchlauf steht das aggregierte Timing in last_ingest_timing;
+        die Dokument-Statistiken der verarbeiteten Dateien werden in die
+        Statistik-Tabelle (stats_table) geschrieben.
+
+        Args:
+            files: Zu verarbeitende Dateien
+            workers: Anzahl Worker-Prozesse (Default: LAS_INGEST_WORKERS oder 1 = seriell)
+            file_hashes: Optional {file_name: sha256}, spart erneutes Hashen für den Page-Cache
+
+        Yields:
+            (file_path, chunks) – chunks ist None, wenn die Datei fehlgeschlagen ist
+        """
+        file_hashes = file_hashes or {}
+        if workers is None:
+            workers = int(os.environ.get("LAS_INGEST_WORKERS", "1"))
+        workers = max(1, workers)
+
+        all_files = list(files)
+        total_files = len(all_files)
+        logger.info(f"📚 Verarbeite {total_files} Dokumente...")
+
+        chunk_settings = self._chunk_settings()
+        timings = []
+        doc_stats = []
+        failed = 0
+        total_chunks = 0
+        t0 = time.perf_counter()
+
+        def _args(file_path: Path) -> tuple:
+            return (
+                file_path, self.ibm_mapping, chunk_settings,
+                self.page_cache_dir, file_hashes.get(file_path.name),
+            )
+
+        if workers > 1 and total_files > 1:
+            logger.info(f"⚙️  Parallele Ingestion mit {workers} Prozessen")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Futures in Eingabe-Reihenfolge → deterministische Ausgabe
+                pending = deque()
+                next_index = 0
+                while pending or next_index < total_files:
+                    while next_index < total_files and len(pending) < 2 * workers:
+                        file_path = all_files[next_index]
+                        pending.append((file_path, executor.submit(process_document_file, *_args(file_path))))
+                        next_index += 1
+                    file_path, future = pending.popleft()
+                    try:
+                        chunks, timing, stats = future.result()
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"❌ Fehler bei {file_path.name}: {e}")
+                        yield file_path, None
+                        continue
+                    timings.append(timing)
+                    doc_stats.append(stats)
+                    total_chunks += len(chunks)
+                    yield file_path, chunks
+        else:
+            # PDFs und DOCX seriell verarbeiten (Fehler pro Datei isoliert)
+            for file_path in all_files:
+                try:
+                    chunks, timing, stats = process_document_file(*_args(file_path))
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"❌ Fehler bei {file_path.name}: {e}")
+                    yield file_path, None
+                    continue
+                timings.append(timing)
+                doc_stats.append(stats)
+                total_chunks += len(chunks)
+                yield file_path, chunks
+
+        wall_s = time.perf_counter() - t0
+        if doc_stats:
+            self.stats_table.update(doc_stats)
+            self.stats_table.save()
+            logger.info(f"📊 Dokument-Statistiken: {len(doc_stats)} aktualisiert ({self.stats_table.path})")
+        self.last_ingest_timing = {
+            "files": total_files,
+            "failed": failed,
+            "chunks": total_chunks,
+            "workers": workers,
+            "wall_s": wall_s,
+            "extract_s": sum(t["extract_s"] for t in timings),
+            "chunk_s": sum(t["chunk_s"] for t in timings),
+            "metadata_s": sum(t["metadata_s"] for t in timings),
+            "cpu_total_s": sum(t["total_s"] for t in timings),
+        }
+        timing = self.last_ingest_timing
+        logger.info(
+            f"⏱️  Ingestion: {timing['files'] - failed}/{timing['files']} Dateien, {timing['chunks']} Chunks "
+            f"in {wall_s:.1f}s (workers={workers}) | extract={timing['extract_s']:.1f}s "
+            f"chunk={timing['chunk_s']:.1f}s metadata={timing['metadata_s']:.1f}s "
+            f"(Summe über Dateien, Speedup ≈ {timing['cpu_total_s'] / wall_s if wall_s > 0 else 0:.1f}x)"
+        )
+
+    def iter_chunks(
+        self,
+        files: List[Path],
+        workers: Optional[int] = None,
+        file_hashes: Optional[Dict[str, str]] = None,
+    ) -> Iterator[Document]:
+        """Generator über alle Chunks der Dateien (Streaming-Variante von process_files)."""
+        for _, chunks in self.iter_processed_files(files, workers=workers, file_hashes=file_hashes):
+            if chunks:
+                yield from chunks
+
+    def process_files(
+        self,
+        files: List[Path],
+        workers: Optional[int] = None,
+        file_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[Document]:
+        """
+        Verarbeitet eine Liste von PDF/DOCX-Dateien zu Chunks (siehe iter_processed_files).
+
+        Args:
+            files: Zu verarbeitende Dateien
+            workers: Anzahl Worker-Prozesse (Default: LAS_INGEST_WORKERS oder 1 = seriell)
+            file_hashes: Optional {file_name: sha256}, spart erneutes Hashen für den Page-Cache
+
+        Returns:
+            Liste von Document-Objekten (Chunks)
+        """
+        return list(self.iter_chunks(files, workers=workers, file_hashes=file_hashes))
     
-    def embed_texts(self, texts: List[str], is_query: bool = False) -> List[List[float]]:
+    def _encode(self, texts: List[str], show_progress_bar: bool = True, profile: str = "ingest") -> np.ndarray:
+        """
+        Kodiert Texte mit dem Embedding-Modell.
+
+        LAS_EMBED_BATCHING=bucketed (Default): längen-sortierte Batches aus einem
+        Token-Budget (siehe embedding_batching.py); fixed: batch_size=32 in
+        Eingabe-Reihenfolge.
+
+        Mit Encode-Pool (encode_processes > 1) werden große Aufrufe auf die
+        Worker-Prozesse verteilt (gleiches Batching, siehe embedding_pool.py);
+        kleine bleiben im Hauptprozess. Die torch-Threads der Worker ergeben
+        sich dann aus Kernen / Prozessen, profile bzw. ThreadSettings gelten
+        nur im Hauptprozess. Mit Embedding-Daemon kodiert der Daemon (gleiches
+        Batching). profile wählt die torch-Threads (ingest|query, siehe
+        thread_tuning.py).
+        """
+        batching = os.environ.get("LAS_EMBED_BATCHING", "bucketed")
+        if isinstance(self.embedding_model, RemoteEmbeddingModel):
+            return self.embedding_model.encode_texts(texts, batching=batching, profile=profile)
+        if self.encode_pool is not None and self.encode_pool.should_use(len(texts)):
+            return self.encode_pool.encode(texts, batching=batching)
+        with self.threads.use(profile):
+            if batching == "fixed":
+                return self.embedding_model.encode(
+                    texts,
+                    show_progress_bar=show_progress_bar,
+                    convert_to_numpy=True,
+                    batch_size=32
+                )
+            return encode_bucketed(self.embedding_model, texts, show_progress_bar=show_progress_bar)
+
+    def close_encode_pool(self) -> None:
+        """Beendet die Worker-Prozesse des Encode-Pools (falls gestartet)."""
+        if self.encode_pool is not None:
+            self.encode_pool.close()
+
+    def embed_texts(
+        self,
+        texts: List[str],
+        is_query: bool = False,
+        show_progress_bar: bool = True,
+    ) -> np.ndarray:
         """
         Erstellt Embeddings für Texte.
         
         Args:
             texts: Liste von Texten
             is_query: True für Queries (nutzt Query-Prefix)
+            show_progress_bar: Fortschrittsbalken von SentenceTransformer anzeigen
             
         Returns:
-            Liste von Embedding-Vektoren
+            C-zusammenhängende Matrix [len(texts), dim] im Dtype self.embedding_dtype
+            (LAS_EMBED_DTYPE, Default float32)
         """
         if is_query:
             # Query-Prefix für bessere Retrieval-Qualität (asymmetrische Suche)
@@ -509,27 +883,37 @@ class LicenseVectorStore:
                 f"Represent this sentence for searching relevant passages: {text}"
                 for text in texts
             ]
+
+        # Dokument-Chunks: Treffer aus dem Embedding-Cache, nur der Rest wird kodiert
+        cache = self.embedding_cache if not is_query else None
+        if cache is not None and texts:
+            keys, found = cache.get_many(texts)
+            out = np.empty((len(texts), cache.dim), dtype=self.embedding_dtype)
+            for i, vector in found.items():
+                out[i] = vector
+            missing = [i for i in range(len(texts)) if i not in found]
+            if missing:
+                encoded = self._encode([texts[i] for i in missing], show_progress_bar=show_progress_bar)
+                cache.put_many([keys[i] for i in missing], encoded)
+                # Wie gespeichert zurückgeben → Ergebnis unabhängig davon, ob der Cache traf
+                out[missing] = encoded.astype(cache.dtype)
+            logger.debug(f"📦 Embedding-Cache: {len(texts) - len(missing)}/{len(texts)} Treffer")
+            return out
         
         # Embeddings erstellen
-        embeddings = self.embedding_model.encode(
-            texts,
-            show_progress_bar=True,
-            convert_to_numpy=True,
-            batch_size=32
+        embeddings = self._encode(
+            texts, show_progress_bar=show_progress_bar, profile="query" if is_query else "ingest"
         )
         
-        return embeddings.tolist()
+        return np.ascontiguousarray(embeddings, dtype=self.embedding_dtype)
     
-    def add_documents(self, documents: List[Document]) -> None:
+    def _prepare_documents(self, documents: List[Document]) -> tuple:
         """
-        Fügt Dokumente zur Vektordatenbank hinzu.
+        Bereitet Chunks für ChromaDB vor: Texte, bereinigte Metadaten, neue IDs.
+
+        Returns:
+            (ids, texts, metadatas)
         """
-        if not documents:
-            logger.warning("Keine Dokumente zum Hinzufügen")
-            return
-        
-        logger.info(f"📄 Füge {len(documents)} Dokumente hinzu...")
-        
         # Texte und Metadaten extrahieren
         texts = [doc.page_content for doc in documents]
         metadatas = []
@@ -560,19 +944,322 @@ class LicenseVectorStore:
         
         # UUID-IDs generieren
         ids = [str(uuid.uuid4()) for _ in range(len(documents))]
-        
-        # Embeddings erstellen
-        embeddings = self.embed_texts(texts, is_query=False)
-        
-        # Zu ChromaDB hinzufügen
+        return ids, texts, metadatas
+
+    def _write_batch(self, ids: List[str], embeddings: np.ndarray, texts: List[str], metadatas: List[dict]) -> None:
+        """
+        Schreibt einen fertig eingebetteten Batch nach ChromaDB (und in die Neben-Indizes).
+
+        Lexikalischer und Metadaten-Index werden nur im Speicher fortgeschrieben;
+        gespeichert wird einmal am Ende des Laufs (_save_indexes).
+        """
         self.collection.add(
             ids=ids,
-            embeddings=embeddings,
+            embeddings=to_chroma_embeddings(embeddings),
             documents=texts,
             metadatas=metadatas
         )
+        if self.candidate_index is not None:
+            self.candidate_index.add(ids, texts, metadatas)
+        if self.numpy_index is not None:
+            self.numpy_index.invalidate()
+        if self.lexical_index is not None:
+            self.lexical_index.add(ids, texts, metadatas)
+        if self.metadata_index is not None:
+            self.metadata_index.add(ids, metadatas)
+
+    def _save_indexes(self) -> None:
+        """Speichert lexikalischen und Metadaten-Index (nur wenn geändert)."""
+        for index in (self.lexical_index, self.metadata_index):
+            if index is not None:
+                index.save()
+
+    def _delete_chunks(self, ids: Optional[List[str]] = None, where: Optional[dict] = None, save: bool = True) -> None:
+        """
+        Entfernt Chunks aus der Collection (und den Neben-Indizes).
+
+        Args:
+            save: False = Neben-Indizes nicht sofort speichern (Aufrufer speichert am Ende)
+        """
+        if ids is None and (self.lexical_index is not None or self.metadata_index is not None):
+            ids = self._filter_subset(where)
+            if ids is None:
+                ids = self.collection.get(where=where, include=[])["ids"]
+            where = None
+            if not ids:
+                return
+        for index in (self.lexical_index, self.metadata_index):
+            if index is not None:
+                index.remove(ids)
+        if save:
+            self._save_indexes()
+        self.collection.delete(ids=ids, where=where)
+        if self.candidate_index is not None:
+            self.candidate_index.delete(ids=ids, where=where)
+        if self.numpy_index is not None:
+            self.numpy_index.invalidate()
+
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """
+        Fügt Dokumente zur Vektordatenbank hinzu.
+
+        Returns:
+            Chunk-IDs in der Reihenfolge von documents
+        """
+        ids = self._add_batch(documents)
+        self._save_indexes()
+        if self.embedding_cache is not None:
+            self.embedding_cache.flush()
+        return ids
+
+    def _add_batch(self, documents: List[Document]) -> List[str]:
+        """add_documents ohne Speichern der Neben-Indizes und des Embedding-Caches (für Batch-Schleifen)."""
+        if not documents:
+            logger.warning("Keine Dokumente zum Hinzufügen")
+            return []
+        
+        logger.info(f"📄 Füge {len(documents)} Dokumente hinzu...")
+        
+        ids, texts, metadatas = self._prepare_documents(documents)
+        
+        # Embeddings erstellen
+        embeddings = self.embed_texts(texts, is_query=False)
+        
+        # Zu ChromaDB hinzufügen
+        self._write_batch(ids, embeddings, texts, metadatas)
         
         logger.info(f"✅ {len(documents)} Dokumente hinzugefügt")
+        return ids
+
+    def add_documents_streaming(
+        self,
+        documents: Iterable[Document],
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Fügt Dokumente aus einem Generator in festen Batches hinzu.
+
+        Pro Batch werden Embeddings erstellt und sofort nach ChromaDB
+        geschrieben; danach wird der Batch verworfen. Der Speicherbedarf hängt
+        damit nur von batch_size ab, nicht von der Korpusgröße.
+
+        Args:
+            documents: Iterable/Generator von Chunks (z.B. iter_chunks)
+            batch_size: Chunks pro Embedding-/Schreib-Batch (Default: LAS_STREAM_BATCH_SIZE oder 256)
+
+        Returns:
+            {file_name: [Chunk-IDs]} in Einfüge-Reihenfolge
+        """
+        if batch_size is None:
+            batch_size = int(os.environ.get("LAS_STREAM_BATCH_SIZE", "256"))
+        batch_size = max(1, batch_size)
+
+        ids_by_file: Dict[str, List[str]] = {}
+        batch: List[Document] = []
+        total = 0
+
+        def _flush() -> None:
+            ids = self._add_batch(batch)
+            for doc, chunk_id in zip(batch, ids):
+                ids_by_file.setdefault(doc.metadata.get("file_name"), []).append(chunk_id)
+
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                _flush()
+                total += len(batch)
+                batch = []
+
+        if batch:
+            _flush()
+            total += len(batch)
+        self._save_indexes()
+        if self.embedding_cache is not None:
+            self.embedding_cache.flush()
+
+        logger.info(f"✅ Streaming: {total} Chunks in Batches à {batch_size} hinzugefügt")
+        return ids_by_file
+
+    def sync_documents(
+        self,
+        data_dir: Path,
+        workers: Optional[int] = None,
+        force: bool = False,
+        streaming: bool = False,
+        pipelined: bool = False,
+        candidates: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Inkrementelles Re-Indexing über das Ingestion-Manifest.
+
+        Nur neue oder geänderte Dateien (SHA-256) werden extrahiert und
+        eingebettet; Chunks geänderter und gelöschter Dateien werden aus der
+        Collection entfernt. Ändern sich Embedding-Modell oder Chunk-
+        Konfiguration, werden alle Dateien neu indexiert.
+
+        Args:
+            data_dir: Verzeichnis mit PDF/DOCX-Dateien
+            workers: Anzahl Worker-Prozesse für die Verarbeitung
+            force: True = alle Dateien neu indexieren
+            streaming: True = Chunks per Generator in festen Batches einbetten und
+                       schreiben (konstanter Speicher, siehe add_documents_streaming)
+            pipelined: True = Extraktion, Embedding und Schreiben überlappend in
+                       drei Stufen mit begrenzten Queues (siehe ingest_pipeline.py)
+            candidates: Optional Dateinamen, die geändert sein können (z.B. aus dem
+                        Watch-Modus). Nur diese werden gehasht; für alle anderen gilt
+                        der Hash aus dem Manifest.
+
+        Returns:
+            Dict mit den Listen added/changed/removed/unchanged und chunks_added
+        """
+        manifest = IngestManifest(self.persist_directory, self.collection_name)
+        chunk_settings = self._chunk_settings()
+
+        if not manifest.is_compatible(self.embedding_model_key, chunk_settings):
+            logger.info("♻️  Embedding-Modell oder Chunk-Konfiguration geändert → vollständiges Re-Indexing")
+            force = True
+
+        files = {path.name: path for path in self._find_documents(data_dir)}
+        if candidates is not None and not force:
+            candidates = set(candidates)
+            file_hashes = {
+                name: (
+                    manifest.documents[name]["sha256"]
+                    if name not in candidates and name in manifest.documents
+                    else compute_file_hash(path)
+                )
+                for name, path in files.items()
+            }
+        else:
+            file_hashes = {name: compute_file_hash(path) for name, path in files.items()}
+        plan = manifest.plan(file_hashes, force=force)
+
+        # Adaptive Chunking: geänderte Empfehlungen aus der Statistik-Tabelle → neu chunken
+        recommended = self.doc_stats.chunk_params(include_auto=True) if self.doc_stats is not None else {}
+        for file_name in manifest.stale_chunk_params(recommended):
+            if file_name in plan["unchanged"]:
+                plan["unchanged"].remove(file_name)
+                plan["changed"].append(file_name)
+
+        logger.info(
+            f"📒 Sync-Plan: {len(plan['added'])} neu, {len(plan['changed'])} geändert, "
+            f"{len(plan['removed'])} gelöscht, {len(plan['unchanged'])} unverändert"
+        )
+
+        # Veraltete Chunks entfernen (geänderte + gelöschte Dateien)
+        for file_name in plan["changed"] + plan["removed"]:
+            stale_ids = manifest.chunk_ids(file_name)
+            if stale_ids:
+                self._delete_chunks(ids=stale_ids, save=False)
+            manifest.remove(file_name)
+
+        # Neue Dateien ohne Manifest-Eintrag: evtl. Altbestand aus Builds ohne Manifest entfernen
+        if plan["added"] and self.collection.count() > 0:
+            for file_name in plan["added"]:
+                self._delete_chunks(where={"file_name": file_name}, save=False)
+
+        # Neue + geänderte Dateien verarbeiten und einbetten
+        to_process = [files[name] for name in plan["added"] + plan["changed"]]
+        params_by_file: Dict[str, tuple] = {}
+
+        def _track_params(chunks: Iterable[Document]) -> Iterator[Document]:
+            for chunk in chunks:
+                params_by_file[chunk.metadata.get("file_name")] = (
+                    chunk.metadata.get("chunk_size"), chunk.metadata.get("overlap")
+                )
+                yield chunk
+
+        ids_by_file: Dict[str, List[str]] = {}
+        if to_process and pipelined:
+            pipeline = StagedIngestPipeline(self)
+            ids_by_file = pipeline.run(
+                _track_params(self.iter_chunks(to_process, workers=workers, file_hashes=file_hashes))
+            )
+            self.last_pipeline_stats = pipeline.stats
+            if self.embedding_cache is not None:
+                self.embedding_cache.flush()
+        elif to_process and streaming:
+            ids_by_file = self.add_documents_streaming(
+                _track_params(self.iter_chunks(to_process, workers=workers, file_hashes=file_hashes))
+            )
+        elif to_process:
+            chunks = list(_track_params(self.process_files(to_process, workers=workers, file_hashes=file_hashes)))
+            ids = self.add_documents(chunks) if chunks else []
+            for chunk, chunk_id in zip(chunks, ids):
+                ids_by_file.setdefault(chunk.metadata.get("file_name"), []).append(chunk_id)
+        chunks_added = sum(len(ids) for ids in ids_by_file.values())
+
+        for path in to_process:
+            if path.name not in ids_by_file:
+                # Fehler oder leeres Dokument: nicht ins Manifest, nächster Sync versucht es erneut
+                logger.warning(f"⚠️  Keine Chunks für {path.name} – nicht im Manifest vermerkt")
+                continue
+            chunk_size, overlap = params_by_file[path.name]
+            manifest.record(
+                file_name=path.name,
+                source=str(path),
+                sha256=file_hashes[path.name],
+                chunk_size=chunk_size,
+                overlap=overlap,
+                embedding_model=self.embedding_model_key,
+                chunk_ids=ids_by_file[path.name],
+            )
+
+        manifest.embedding_model = self.embedding_model_key
+        manifest.chunk_settings = json.loads(json.dumps(chunk_settings))
+        manifest.save()
+
+        # Kandidaten-Index nachziehen (z.B. bestehende Collection, neu konfiguriertes Modell)
+        if self.candidate_index is not None:
+            self.candidate_index.sync(self.collection)
+        if self.lexical_index is not None:
+            self.lexical_index.sync(self.collection)
+        if self.metadata_index is not None:
+            self.metadata_index.sync(self.collection)
+
+        plan["chunks_added"] = chunks_added
+        if self.embedding_cache is not None and chunks_added:
+            cache_stats = self.embedding_cache.stats()
+            logger.info(
+                f"📦 Embedding-Cache: {cache_stats['hits']} Treffer, {cache_stats['misses']} neu kodiert "
+                f"({cache_stats['entries']} Vektoren, {cache_stats['size_mb']} MB)"
+            )
+        logger.info(f"✅ Sync abgeschlossen: {chunks_added} Chunks hinzugefügt ({manifest.path.name})")
+        return plan
+
+    def watch_directory(
+        self,
+        data_dir: Path,
+        interval: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+        **sync_kwargs,
+    ) -> None:
+        """
+        Beobachtet data_dir (Polling) und indexiert neue/geänderte Dateien,
+        sobald sie stabil sind; gelöschte Dateien werden aus der Collection entfernt.
+
+        Args:
+            data_dir: Verzeichnis mit PDF/DOCX-Dateien
+            interval: Sekunden zwischen zwei Scans (Default: LAS_WATCH_INTERVAL oder 10)
+            stop_event: Optionales Event zum Beenden (sonst bis Ctrl+C)
+            **sync_kwargs: Weitere Argumente für sync_documents (workers, streaming, pipelined)
+        """
+        if interval is None:
+            interval = float(os.environ.get("LAS_WATCH_INTERVAL", "10"))
+
+        discovery = FileDiscovery(data_dir, DOCUMENT_EXTENSIONS)
+        try:
+            for changed, removed in discovery.watch(interval=interval, stop_event=stop_event):
+                plan = self.sync_documents(
+                    data_dir, candidates=[path.name for path in changed], **sync_kwargs
+                )
+                logger.info(
+                    f"👀 Watch-Sync: {plan['chunks_added']} Chunks aus "
+                    f"{len(plan['added']) + len(plan['changed'])} Dokumenten, "
+                    f"{len(plan['removed'])} entfernt"
+                )
+        except KeyboardInterrupt:
+            logger.info("👀 Watch beendet")
 
     def _diversify_by_doc(self, results, k: int, max_per_doc: int = 2, per_doc_caps: dict = None):
         """Return up to k results with at most max_per_doc per document.
@@ -604,6 +1291,208 @@ class LicenseVectorStore:
 
         return out
     
+    def _retrieve_dense(self, query: str, n_results: int, filter_metadata: Optional[dict]) -> List[dict]:
+        """Kandidaten über den BGE-large-Index der Collection (bisheriger Pfad)."""
+        return self._retrieve_dense_many([query], n_results, filter_metadata)[0]
+
+    def _retrieve_dense_many(
+        self,
+        queries: List[str],
+        n_results: int,
+        filter_metadata: Optional[dict],
+        query_embeddings: Optional[np.ndarray] = None,
+    ) -> List[List[dict]]:
+        """Wie _retrieve_dense für mehrere Queries: ein Encode-Batch, ein Collection-Query."""
+        # Query-Embeddings erstellen (mit Query-Prefix!)
+        if query_embeddings is None:
+            query_embeddings = self.embed_texts(queries, is_query=True, show_progress_bar=False)
+
+        # Exakte Suche im Speicher (LAS_SEARCH_BACKEND=numpy)
+        if self.numpy_index is not None:
+            return self.numpy_index.query(query_embeddings, n_results, filter_metadata)
+        
+        # ChromaDB-Suche
+        results = self.collection.query(
+            query_embeddings=to_chroma_embeddings(query_embeddings),
+            n_results=n_results,
+            where=filter_metadata
+        )
+        
+        # Ergebnisse formatieren (eine Liste pro Query)
+        formatted = []
+        for q in range(len(queries)):
+            formatted.append([
+                {
+                    "id": results["ids"][q][i],
+                    "text": results["documents"][q][i],
+                    "metadata": results["metadatas"][q][i],
+                    "distance": results["distances"][q][i],
+                }
+                for i in range(len(results["ids"][q]))
+            ])
+        return formatted
+
+    def _retrieve_two_stage(self, query: str, n_results: int, filter_metadata: Optional[dict]) -> List[dict]:
+        """
+        Kandidaten aus dem kleinen Modell, Rescoring mit gespeicherten BGE-large-Vektoren
+        (siehe two_stage_retrieval.py). Distanzen im Raum der Collection.
+        """
+        return self._retrieve_two_stage_many([query], n_results, filter_metadata)[0]
+
+    def _retrieve_two_stage_many(
+        self,
+        queries: List[str],
+        n_results: int,
+        filter_metadata: Optional[dict],
+        query_embeddings: Optional[np.ndarray] = None,
+    ) -> List[List[dict]]:
+        """
+        Wie _retrieve_two_stage für mehrere Queries: Kandidaten in einem Query,
+        BGE-large-Vektoren aller Kandidaten in einem get().
+        """
+        candidate_k = max(n_results, int(os.environ.get("LAS_CANDIDATE_K", str(DEFAULT_CANDIDATE_K))))
+        candidate_ids = self.candidate_index.query_ids_many(queries, candidate_k, where=filter_metadata)
+        union_ids = list(dict.fromkeys(i for ids in candidate_ids for i in ids))
+        if not union_ids:
+            return [[] for _ in queries]
+
+        query_vectors = query_embeddings
+        if query_vectors is None:
+            query_vectors = self.embed_texts(queries, is_query=True, show_progress_bar=False)
+        stored = self.collection.get(ids=union_ids, include=["embeddings", "documents", "metadatas"])
+        matrix = np.asarray(stored["embeddings"], dtype=np.float32)
+        row_of = {chunk_id: row for row, chunk_id in enumerate(stored["ids"])}
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+
+        formatted = []
+        for query_vector, ids in zip(query_vectors, candidate_ids):
+            rows = np.fromiter((row_of[i] for i in ids if i in row_of), dtype=np.intp)
+            distances = vector_distances(query_vector, matrix[rows], space)
+            order = np.argsort(distances, kind="stable")[:n_results]
+            formatted.append([
+                {
+                    "id": stored["ids"][rows[i]],
+                    "text": stored["documents"][rows[i]],
+                    "metadata": stored["metadatas"][rows[i]],
+                    "distance": float(distances[i]),
+                }
+                for i in order
+            ])
+        return formatted
+
+    def _n_results(self, k: int, rerank: bool, rerank_top_n: int) -> int:
+        """Wie viele Kandidaten vor der Nachbearbeitung aus Chroma geholt werden."""
+        internal_k = int(os.environ.get("LAS_INTERNAL_K", "50"))
+
+        # If rerank: need enough candidates for rerank_top_n (and at least internal_k)
+        # If no rerank: still retrieve internal_k so diversification can work
+        if rerank:
+            return max(k, rerank_top_n, internal_k)
+        return max(k, internal_k)
+
+    def _resolve_retrieval(self, retrieval: Optional[str]) -> str:
+        if retrieval is None:
+            retrieval = os.environ.get("LAS_RETRIEVAL", "dense")
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(f"Unbekannter Retrieval-Modus: {retrieval} (erlaubt: {', '.join(RETRIEVAL_MODES)})")
+        if retrieval == "two_stage" and (self.candidate_index is None or self.candidate_index.count() == 0):
+            logger.warning("⚠️  Kein Kandidaten-Index (candidate_model/LAS_CANDIDATE_MODEL) → dense Retrieval")
+            retrieval = "dense"
+        return retrieval
+
+    def _lexical_enabled(self, lexical: Optional[bool]) -> bool:
+        """Routing/Fusion über den lexikalischen Index (aktiv mit LAS_LEXICAL=1, sonst aus)."""
+        if lexical is None:
+            lexical = os.environ.get("LAS_LEXICAL", "0") == "1"
+        if not lexical or self.lexical_index is None:
+            return False
+        # Vor dem Index gebaute Collection: einmalig nachziehen
+        if len(self.lexical_index) != self.collection.count():
+            self.lexical_index.sync(self.collection)
+        return True
+
+    def _filter_subset(self, where: Optional[dict]) -> Optional[List[str]]:
+        """Chunk-IDs zum Filter aus dem Metadaten-Index (None = ohne Filter/nicht auswertbar)."""
+        if not where or self.metadata_index is None:
+            return None
+        # Vor dem Index gebaute Collection: einmalig nachziehen
+        if len(self.metadata_index) != self.collection.count():
+            self.metadata_index.sync(self.collection)
+        return self.metadata_index.resolve(where)
+
+    def _retrieve_subset(
+        self,
+        queries: List[str],
+        ids: List[str],
+        n_results: int,
+        filter_metadata: dict,
+        query_embeddings: np.ndarray,
+    ) -> List[List[dict]]:
+        """
+        Dichte Suche nur über die Chunks eines Filters (ids aus dem Metadaten-Index).
+
+        NumPy-Backend: nur die Zeilen der Teilmenge. Chroma: bis LAS_METADATA_EXACT_MAX
+        Chunks die gespeicherten Vektoren holen und exakt bewerten, darüber die
+        where-Klausel mit auf die Teilmenge begrenztem Pool.
+        """
+        if self.numpy_index is not None:
+            return self.numpy_index.query(query_embeddings, n_results, ids=ids)
+        if len(ids) > int(os.environ.get("LAS_METADATA_EXACT_MAX", "1000")):
+            return self._retrieve_dense_many(queries, n_results, filter_metadata, query_embeddings)
+
+        stored = self.collection.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+        matrix = np.asarray(stored["embeddings"], dtype=np.float32)
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        distances = np.stack([vector_distances(q, matrix, space) for q in query_embeddings])
+        top, top_d = top_k(distances, n_results)
+        return [
+            [
+                {
+                    "id": stored["ids"][i],
+                    "text": stored["documents"][i],
+                    "metadata": stored["metadatas"][i],
+                    "distance": float(d),
+                }
+                for i, d in zip(rows, dists)
+            ]
+            for rows, dists in zip(top, top_d)
+        ]
+
+    def _retrieve_grouped(
+        self,
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        plans: List[tuple],
+        indices: Iterable[int],
+        mode: str,
+        candidates: List[List[dict]],
+    ) -> None:
+        """
+        Ein Retrieval-Aufruf je (Filter, Pool-Größe); schreibt nach candidates[i].
+
+        Mit Filter: Teilmenge aus dem Metadaten-Index, Pool höchstens so groß wie
+        die Teilmenge; leere Teilmenge ohne Suche.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i in indices:
+            groups.setdefault(json.dumps(plans[i], sort_keys=True, default=str), []).append(i)
+        retrieve = self._retrieve_two_stage_many if mode == "two_stage" else self._retrieve_dense_many
+        for members in groups.values():
+            where, pool = plans[members[0]]
+            member_queries = [queries[i] for i in members]
+            subset = self._filter_subset(where)
+            if subset is not None:
+                pool = min(pool, len(subset))
+                logger.debug(f"🏷️  Filter {where}: {len(subset)} Chunks, Pool {pool}")
+            if pool == 0:
+                found = [[] for _ in members]
+            elif subset is not None and mode == "dense":
+                found = self._retrieve_subset(member_queries, subset, pool, where, query_embeddings[members])
+            else:
+                found = retrieve(member_queries, pool, where, query_embeddings[members])
+            for i, results in zip(members, found):
+                candidates[i] = results
+
     def search(
         self,
         query: str,
@@ -613,6 +1502,8 @@ class LicenseVectorStore:
         rerank_top_n: int = 30,
         rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
         rerank_query: Optional[str] = None,
+        retrieval: Optional[str] = None,
+        lexical: Optional[bool] = None,
     ) -> List[dict]:
         """
         Sucht ähnliche Dokumente.
@@ -621,47 +1512,140 @@ class LicenseVectorStore:
             query: Suchanfrage
             k: Anzahl Ergebnisse
             filter_metadata: Optional: Filter für Metadaten (z.B. {"manufacturer": "IBM"})
+            retrieval: "dense" (BGE-large-Index) oder "two_stage" (Kandidaten-Index +
+                       BGE-large-Rescoring; braucht candidate_model)
+                       (Default: LAS_RETRIEVAL oder dense)
+            lexical: Nennt die Query einen Lizenz-Code oder vollen Produktnamen, nur in
+                     dessen Chunks suchen (kleiner Pool, LAS_LEXICAL_TOP_N); lexikalischen
+                     Score mit Distanz/Rerank-Score fusionieren (LAS_LEXICAL_BOOST)
+                     (Default: aktiv mit LAS_LEXICAL=1, sonst aus)
             
         Returns:
             Liste von Ergebnissen mit Text, Metadaten, Score
         """
         logger.info(f"🔍 Suche: '{query}'")
-        
-        # n_results und Timing
+        return self.search_many(
+            [query], k, filter_metadata, rerank, rerank_top_n, rerank_model,
+            rerank_queries=[rerank_query], retrieval=retrieval, lexical=lexical,
+        )[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter_metadata: Optional[dict] = None,
+        rerank: bool = False,
+        rerank_top_n: int = 30,
+        rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        rerank_queries: Optional[List[Optional[str]]] = None,
+        retrieval: Optional[str] = None,
+        lexical: Optional[bool] = None,
+    ) -> List[List[dict]]:
+        """
+        Sucht für mehrere Queries auf einmal (z.B. einen ganzen Fragenkatalog).
+
+        Ergebnis pro Query identisch zu search(), aber pro Stufe nur ein Aufruf:
+        ein Encode-Batch für alle Queries, ein Collection-Query mit allen
+        Embeddings (je Filter, siehe lexical), ein CrossEncoder-predict() über
+        alle Paare. Penalty und Diversifizierung laufen danach pro Query.
+
+        Args:
+            queries: Suchanfragen
+            rerank_queries: Optional Rerank-Text pro Query (None-Einträge = Query selbst)
+            (übrige Argumente wie search())
+
+        Returns:
+            Eine Ergebnisliste pro Query, in Eingabe-Reihenfolge
+        """
+        if not queries:
+            return []
+        if rerank_queries is not None and len(rerank_queries) != len(queries):
+            raise ValueError("rerank_queries muss so lang sein wie queries")
+        if len(queries) > 1:
+            logger.info(f"🔍 Suche: {len(queries)} Queries im Batch")
+
         t0 = time.perf_counter()
+        n_results = self._n_results(k, rerank, rerank_top_n)
+        mode = self._resolve_retrieval(retrieval)
+        query_embeddings = self.embed_texts(queries, is_query=True, show_progress_bar=False)
 
-        # How many candidates to retrieve from Chroma before post-processing
-        internal_k = int(os.environ.get("LAS_INTERNAL_K", "50"))
+        # Lexikalisches Routing: Query nennt Lizenz-Code/vollen Produktnamen → vorgefilterte
+        # Suche in dessen Chunks mit kleinerem Pool (auch weniger Rerank-Paare)
+        if self._lexical_enabled(lexical):
+            entities = [self.lexical_index.analyze(query) for query in queries]
+        else:
+            entities = [None] * len(queries)
+        lexical_top_n = max(k, int(os.environ.get("LAS_LEXICAL_TOP_N", "20")))
+        plans = []
+        for query_entities in entities:
+            if query_entities is not None and query_entities.route_codes:
+                code_filter = {"license_code": {"$in": query_entities.route_codes}}
+                where = {"$and": [filter_metadata, code_filter]} if filter_metadata else code_filter
+                plans.append((where, lexical_top_n))
+            else:
+                plans.append((filter_metadata, n_results))
 
-        # If rerank: need enough candidates for rerank_top_n (and at least internal_k)
-        # If no rerank: still retrieve internal_k so diversification can work
+        candidates: List[List[dict]] = [[] for _ in queries]
+        self._retrieve_grouped(queries, query_embeddings, plans, range(len(queries)), mode, candidates)
+        # Code ohne Chunks im Filter (z.B. Dokument nicht indexiert) → normale Suche
+        fallback = [i for i, (where, _) in enumerate(plans) if where is not filter_metadata and not candidates[i]]
+        if fallback:
+            for i in fallback:
+                logger.info(f"🔤 Keine Chunks für {entities[i].route_codes} → ungefilterte Suche")
+                plans[i] = (filter_metadata, n_results)
+            self._retrieve_grouped(queries, query_embeddings, plans, fallback, mode, candidates)
+
+        for query_entities, results in zip(entities, candidates):
+            if query_entities:
+                self.lexical_index.annotate(results, query_entities)
+
+        rerank_texts = [
+            (rerank_queries[i] if rerank_queries else None) or query for i, query in enumerate(queries)
+        ]
+        scores: List[Optional[list]] = [None] * len(queries)
         if rerank:
-            n_results = max(k, rerank_top_n, internal_k)
-        else:
-            n_results = max(k, internal_k)
+            # Alle (Query, Chunk)-Paare in einem predict(), danach wieder pro Query aufteilen
+            pairs = [(text, r["text"]) for text, results in zip(rerank_texts, candidates) for r in results]
+            if pairs:
+                reranker = self._get_reranker(rerank_model)
+                with self.threads.use("query"):
+                    flat = list(reranker.predict(pairs))
+                offset = 0
+                for i, results in enumerate(candidates):
+                    scores[i] = flat[offset:offset + len(results)]
+                    offset += len(results)
 
-        # Query-Embedding erstellen (mit Query-Prefix!)
-        query_embedding = self.embed_texts([query], is_query=True)[0]
-        
-        # ChromaDB-Suche
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=filter_metadata
-        )
-        
-        # Ergebnisse formatieren
-        formatted_results = []
-        for i in range(len(results["ids"][0])):
-            formatted_results.append(
-                {
-                    "id": results["ids"][0][i],
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i],
-                }
+        out = [
+            self._postprocess_results(
+                results, query, k, plan[1], rerank, rerank_model, rerank_text, t0,
+                rerank_scores=query_scores,
+            )
+            for results, query, rerank_text, query_scores, plan in zip(
+                candidates, queries, rerank_texts, scores, plans
             )
+        ]
+        if len(queries) > 1:
+            logger.info(f"⏱️  Batch-Suche: {len(queries)} Queries in {time.perf_counter() - t0:.3f}s")
+        return out
 
+    def _postprocess_results(
+        self,
+        formatted_results: List[dict],
+        query: str,
+        k: int,
+        n_results: int,
+        rerank: bool,
+        rerank_model: str,
+        rerank_query: Optional[str],
+        t0: float,
+        rerank_scores: Optional[Sequence[float]] = None,
+    ) -> List[dict]:
+        """
+        Bad-Actor-Penalty, optionales Reranking und Diversifizierung auf die Top-k.
+
+        rerank_scores: bereits berechnete CrossEncoder-Scores (search_many),
+        sonst ruft die Methode den Reranker selbst auf.
+        """
         # Bad-actor soft penalty: nudge overview documents down before ranking
         bad_actor_penalty = float(os.environ.get("LAS_BAD_ACTORS_DISTANCE_PENALTY", "0.05"))
         if bad_actor_penalty > 0 and BAD_ACTORS:
@@ -670,6 +1654,13 @@ class LicenseVectorStore:
                 if doc_name in BAD_ACTORS:
                     r["distance"] = r["distance"] + bad_actor_penalty
 
+        # Lexical fusion: boost chunks containing the query's license codes/products/terms
+        lexical_boost = float(os.environ.get("LAS_LEXICAL_BOOST", "0.05"))
+        if lexical_boost > 0:
+            for r in formatted_results:
+                if r.get("lexical_score"):
+                    r["distance"] = r["distance"] - lexical_boost * r["lexical_score"]
+
         # Re-sort by distance after penalty when not reranking
         if not rerank:
             formatted_results.sort(key=lambda x: x["distance"])
@@ -681,9 +1672,11 @@ class LicenseVectorStore:
             rerank_text = rerank_query or query
             logger.info(f"🔁 Rerank query: '{rerank_text}'")
 
-            reranker = self._get_reranker(rerank_model)
-            pairs = [(rerank_text, r["text"]) for r in formatted_results]
-            rerank_scores = reranker.predict(pairs)
+            if rerank_scores is None:
+                reranker = self._get_reranker(rerank_model)
+                pairs = [(rerank_text, r["text"]) for r in formatted_results]
+                with self.threads.use("query"):
+                    rerank_scores = reranker.predict(pairs)
 
             for r, s in zip(formatted_results, rerank_scores):
                 r["rerank_score"] = float(s)
@@ -695,6 +1688,11 @@ class LicenseVectorStore:
                     if doc_name in BAD_ACTORS:
                         r["rerank_score"] = r["rerank_score"] - bad_actor_penalty
 
+            if lexical_boost > 0:
+                for r in formatted_results:
+                    if r.get("lexical_score"):
+                        r["rerank_score"] = r["rerank_score"] + lexical_boost * r["lexical_score"]
+
             # higher rerank_score is better
             formatted_results.sort(key=lambda x: x.get("rerank_score", 0.0), reverse=True)
 
@@ -747,7 +1745,8 @@ class LicenseVectorStore:
             "embedding_model": str(self.embedding_model),
             "embedding_dimensions": self.embedding_model.get_sentence_embedding_dimension(),
             "adaptive_chunking": self.use_adaptive_chunking,
-            "ibm_products_mapped": len(self.ibm_mapping)  # NEU!
+            "ibm_products_mapped": len(self.ibm_mapping),  # NEU!
+            "hnsw": self.hnsw_params,
         }
 
 
@@ -760,6 +1759,28 @@ def main():
     Build-Script: Erstellt Vectorstore mit IBM Mapping.
     Baut standardmäßig die FIXED-Baseline-Collection (IBM_FIXED, use_adaptive_chunking=False).
     Für Adaptive-Experimente: collection_name=IBM_ADAPTIVE, use_adaptive_chunking=True.
+    Parallele Ingestion: LAS_INGEST_WORKERS=<Anzahl Prozesse> (Default: 1 = seriell).
+    Inkrementell über das Ingestion-Manifest; LAS_FULL_REBUILD=1 erzwingt vollständiges Re-Indexing.
+    Streaming mit konstantem Speicher: LAS_STREAMING=1 (Batch-Größe: LAS_STREAM_BATCH_SIZE).
+    Überlappende Stufen (Extraktion/Embedding/Writer): LAS_PIPELINE=1 (Queue: LAS_PIPELINE_QUEUE_SIZE).
+    Watch-Modus nach dem Build: LAS_WATCH=1 (Intervall: LAS_WATCH_INTERVAL Sekunden).
+    Embedding-Backend: LAS_EMBEDDING_BACKEND=torch|torch-int8 (Default: torch).
+    torch-Threads: LAS_INGEST_THREADS / LAS_QUERY_THREADS oder thread_tuning.py autotune.
+    Gewichts-Datentyp: LAS_MODEL_DTYPE=float32|bfloat16|float16 (Default: float32, Fallback ohne CPU-Support).
+    Embedding-Batching: LAS_EMBED_BATCHING=bucketed|fixed (Token-Budget: LAS_EMBED_TOKEN_BUDGET).
+    Embedding-Matrizen bis ChromaDB: LAS_EMBED_DTYPE=float32|float16 (Default: float32).
+    Multi-Prozess-Encoding: LAS_ENCODE_PROCESSES=auto|N|1 (Default beim Build: auto = alle Kerne).
+    Embedding-Daemon (embedding_daemon.py serve) wird automatisch genutzt; LAS_EMBED_DAEMON=0 deaktiviert.
+    Kandidaten-Index für zweistufiges Retrieval: LAS_CANDIDATE_MODEL=BAAI/bge-small-en-v1.5
+    (Suche: LAS_RETRIEVAL=two_stage, Pool: LAS_CANDIDATE_K).
+    Exakte Suche im Speicher statt HNSW: LAS_SEARCH_BACKEND=numpy (Default: chroma).
+    Lexikalischer Index (Lizenz-Codes, Produkte, PVU/RVU/ILMT) wird mitgebaut (LAS_LEXICAL_INDEX=0 deaktiviert);
+    Routing/Fusion in der Suche: LAS_LEXICAL=1 (Pool: LAS_LEXICAL_TOP_N, Bonus: LAS_LEXICAL_BOOST).
+    Metadaten-Index für gefilterte Suche wird mitgebaut (LAS_METADATA_INDEX=0 deaktiviert;
+    exakte Bewertung der Teilmenge bis LAS_METADATA_EXACT_MAX Chunks).
+    HNSW-Parameter neuer Collections: LAS_HNSW_SPACE, LAS_HNSW_M, LAS_HNSW_CONSTRUCTION_EF, LAS_HNSW_SEARCH_EF
+    (Recall/Latenz-Sweep: sweep_index_params.py).
+    Embedding-Cache für unveränderte Chunks: aktiv, LAS_EMBED_CACHE=0 deaktiviert (LAS_EMBED_CACHE_MAX_MB, LAS_EMBED_CACHE_DTYPE).
     """
     from pathlib import Path
     from collection_names import IBM_FIXED
@@ -777,15 +1798,28 @@ def main():
         collection_name=IBM_FIXED,
         embedding_model="BAAI/bge-large-en-v1.5",
         use_adaptive_chunking=False,  # ← True für Adaptive-Experimente
-        ibm_mapping_file="product_mapping.csv"
+        ibm_mapping_file="product_mapping.csv",
+        encode_processes=os.getenv("LAS_ENCODE_PROCESSES", "auto")
     )
     
-    # Dokumente laden und verarbeiten
-    documents = vectorstore.load_and_process_documents(data_dir)
-    logger.info(f"✅ Gesamt: {len(documents)} Chunks aus {len(list(data_dir.glob('*.pdf')) + list(data_dir.glob('*.PDF')) + list(data_dir.glob('*.docx')) + list(data_dir.glob('*.DOCX')))} Dokumenten")
-    
-    # Zu Vectorstore hinzufügen
-    vectorstore.add_documents(documents)
+    # Inkrementell synchronisieren: nur neue/geänderte Dateien verarbeiten
+    force_rebuild = os.getenv("LAS_FULL_REBUILD", "0") == "1"
+    streaming = os.getenv("LAS_STREAMING", "0") == "1"
+    pipelined = os.getenv("LAS_PIPELINE", "0") == "1"
+    plan = vectorstore.sync_documents(
+        data_dir, force=force_rebuild, streaming=streaming, pipelined=pipelined
+    )
+    logger.info(
+        f"✅ Gesamt: {plan['chunks_added']} neue Chunks aus "
+        f"{len(plan['added']) + len(plan['changed'])} Dokumenten "
+        f"({len(plan['unchanged'])} unverändert, {len(plan['removed'])} entfernt)"
+    )
+
+    if os.getenv("LAS_WATCH", "0") == "1":
+        # Blockiert bis Ctrl+C; neue/geänderte Dateien werden laufend indexiert
+        vectorstore.watch_directory(data_dir, streaming=streaming, pipelined=pipelined)
+        return
+    vectorstore.close_encode_pool()
     
     # Stats
     stats = vectorstore.get_stats()